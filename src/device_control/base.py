@@ -1,77 +1,167 @@
-import fcntl
+import itertools
 import logging
+import math
+import threading
+import time
+from collections import deque
 from pathlib import Path
 
-import numpy as np
-import paramiko
-import serial
 import tomli
 import tomli_w
-from swmain.network.pyroclient import connect
 
-from device_control import (
-    conf_dir,
-    logging_config,  # noqa: F401
-)
+from device_control import conf_dir, logging_config
+from device_control.cli import get_proxy
+from device_control.lazy import lazy_import
+from device_control.moves import get_tracker
+from device_control.poller import fresh_snapshot, snapshot_status
+from device_control.scheduler import PortScheduler, get_scheduler
 
-__all__ = ["ConfigurableDevice", "MotionDevice", "SSHDevice"]
+# only needed once a device is created locally, not by the console scripts in remote mode
+np = lazy_import("numpy")
+paramiko = lazy_import("paramiko")
 
-# Interface for hardware devices- all subclasses must
-# implement this!
+logger = logging.getLogger(__name__)
 
+_STATUS_GENERATIONS = itertools.count(1)
 
-class Serial(serial.Serial):
-    def __init__(self, *args, **kwargs):
-        port = None
-        if len(args) >= 1:
-            port = args[0]
-        elif "port" in kwargs:
-            port = kwargs["port"]
-
-        if port:
-            self.flockpath = Path("/tmp") / kwargs["port"].replace("/", "_")
-            self.flockpath.touch()  # If doesn't exist
-            with self.flockpath.open() as lock:
-                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
-                super().__init__(*args, **kwargs)
-                self.close()
-                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
-        else:
-            self.flockpath = None
-            super().__init__(*args, **kwargs)
+__all__ = [
+    "ConfigurationIndex",
+    "ConfigurableDevice",
+    "MotionDevice",
+    "SSHDevice",
+    "SSHShell",
+    "trapezoid_time",
+]
 
-    def __enter__(self):
-        if self.flockpath is None:
-            self.flockpath = Path("/tmp") / self.serial_kwargs["port"].replace("/", "_")
-            Path(self.flockpath).touch()
+# Interface for hardware devices- all subclasses must
+# implement this!
 
-        self._file = self.flockpath.open()  # SIM441
-        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
-        return super().__enter__()
 
-    def __exit__(self, type, value, traceback):
-        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
-        self._file.close()
-        super().__exit__(type, value, traceback)
+def trapezoid_time(distance, velocity, acceleration=None) -> float:
+    """
+    Duration of a move of `distance` at up to `velocity`, accelerating and decelerating at
+    `acceleration` (a trapezoidal velocity profile, or a triangular one for short moves).
+    """
+    if not acceleration or acceleration <= 0:
+        return distance / velocity
+    if distance < velocity**2 / acceleration:
+        # never reaches full speed
+        return 2 * math.sqrt(distance / acceleration)
+    return distance / velocity + velocity / acceleration
+
+
+class ConfigurationIndex:
+    """
+    Lookup tables for a device's saved configurations.
+
+    Rows are indexed by `idx` and by casefolded name, and the configuration values are stacked
+    into a `(n_configurations, n_axes)` array so position matching is a single vectorised
+    computation. Differences on each axis are divided by its `scales` entry and, for axes with a
+    non-zero `periods` entry (e.g. 360 for a rotation stage), taken the short way around. Axes a
+    configuration doesn't define (NaN) match any position, but when several configurations match,
+    the one defining the most axes wins, so a partial configuration never shadows a full one.
+    """
+
+    def __init__(self, configurations, to_vector=None, scales=None, periods=None):
+        configurations = configurations or []
+        if to_vector is None:
+            to_vector = np.atleast_1d
+        # duplicates resolve to the first row, as the linear search over the configurations did
+        self.by_idx = {}
+        self.by_name = {}
+        for row in configurations:
+            self.by_idx.setdefault(row["idx"], row)
+            self.by_name.setdefault(row["name"].casefold(), row)
+        self.rows = list(configurations)
+        if len(self.rows) > 0:
+            self.values = np.array([to_vector(row["value"]) for row in self.rows], dtype=float)
+        else:
+            self.values = np.empty((0, 0))
+        n_axes = self.values.shape[1]
+        self.n_defined = np.sum(~np.isnan(self.values), axis=1)
+        self.scales = np.ones(n_axes) if scales is None else np.asarray(scales, dtype=float)
+        self.periods = np.zeros(n_axes) if periods is None else np.asarray(periods, dtype=float)
+
+    def get_by_idx(self, idx: int):
+        return self.by_idx.get(idx)
+
+    def get_by_name(self, name: str):
+        return self.by_name.get(name.casefold())
+
+    def deltas(self, position):
+        """Absolute per-axis difference between `position` and every configuration"""
+        diff = np.abs(self.values - np.asarray(position, dtype=float))
+        periodic = self.periods > 0
+        if np.any(periodic):
+            wrapped = np.mod(diff, np.where(periodic, self.periods, 1))
+            diff = np.where(periodic, np.minimum(wrapped, self.periods - wrapped), diff)
+        return np.where(np.isnan(self.values), 0, diff)
+
+    def _distances(self, deltas):
+        return np.sqrt(np.sum((deltas / self.scales) ** 2, axis=1))
+
+    def nearest(self, position):
+        """
+        Return the nearest configuration row and its scaled distance from `position`, or
+        `(None, inf)` with no configurations. Ties go to the row defining the most axes, then to the
+        lowest row.
+        """
+        if len(self.rows) == 0:
+            return None, np.inf
+        distances = self._distances(self.deltas(position))
+        # lexsort sorts by the last key first, and is stable
+        best = np.lexsort((-self.n_defined, distances))[0]
+        return self.rows[best], float(distances[best])
+
+    def match(self, position, tol=1e-1):
+        """
+        Return the configuration row within `tol` on every axis which defines the most axes, the
+        nearest one among those, or None
+        """
+        if len(self.rows) == 0:
+            return None
+        deltas = self.deltas(position)
+        within = np.all(deltas <= tol, axis=1)
+        best = np.lexsort((self._distances(deltas), -self.n_defined, ~within))[0]
+        if within[best]:
+            return self.rows[best]
+        return None
 
 
 class ConfigurableDevice:
     CONF = None
     PYRO_KEY = None
+    # latest `StatusSnapshot`, set by the daemon's `StatusPoller`
+    _status_snapshot = None
+    # changed by every `invalidate_status`
+    _status_generation = 0
 
     def __init__(
-        self, name=None, configurations=None, config_file=None, serial_kwargs=None, **kwargs
+        self,
+        name=None,
+        configurations=None,
+        config_file=None,
+        serial_kwargs=None,
+        priority=PortScheduler.NORMAL,
+        **kwargs,
     ):
+        logging_config.configure()
+        self.scheduler = None
         if serial_kwargs is not None:
+            from device_control.ports import get_serial
+
             self.serial_kwargs = {"timeout": 0.5}
             self.serial_kwargs.update(serial_kwargs)
-            self.serial = Serial(**self.serial_kwargs)
+            self.serial = get_serial(**self.serial_kwargs)
+            if "port" in self.serial_kwargs:
+                self.scheduler = get_scheduler(self.serial_kwargs["port"])
         # This will crash with serial.serialutil.SerialException and errno 16 if the port is busy.
-        # Now this could be detected to have calls on the same zaberchain to actually queue up.
-
-        # WARNING - due to the subclassing, this returns a closed port.
+        # Devices on the same port share the pooled `Serial` and the port's `PortScheduler`, which
+        # runs their transactions in order of priority, then arrival.
+        self.priority = priority
 
         self.configurations = configurations
+        self._config_index = None
         self.config_file = config_file
         self.name = name
         self.logger = logging.getLogger(self.name)
@@ -92,7 +182,7 @@ class ConfigurableDevice:
             return __cls__.from_config(filename)
         if pyro_key is None:
             pyro_key = __cls__.PYRO_KEY
-        return connect(pyro_key)
+        return get_proxy(pyro_key)
 
     def save_config(self, filename=None):
         if filename is None:
@@ -104,6 +194,9 @@ class ConfigurableDevice:
             "configurations": self.configurations,
             "serial": self.get_serial_kwargs(),
         }
+        # a runtime scheduling setting, only kept when the file set it to something else
+        if self.priority != PortScheduler.NORMAL:
+            config["priority"] = self.priority
         config.update(self._config_extras())
         with path.open("wb") as fh:
             tomli_w.dump(config, fh)
@@ -118,8 +211,70 @@ class ConfigurableDevice:
     def get_configurations(self):
         return self.configurations
 
+    def get_config_mtime(self) -> float | None:
+        """
+        Modification time of the configuration file, which `save_config` rewrites. The console
+        scripts compare it to decide whether their cached configurations are stale.
+        """
+        if self.config_file is None:
+            return None
+        try:
+            return Path(self.config_file).stat().st_mtime
+        except OSError:
+            return None
+
     def set_configurations(self, value):
         self.configurations = value
+        self._config_index = None
+
+    @classmethod
+    def usage(cls, configurations) -> str:
+        """
+        CLI usage text listing the saved `configurations`. A classmethod, so the console scripts can
+        build it before connecting to the device.
+        """
+        raise NotImplementedError()
+
+    def help_message(self):
+        return self.usage(self.configurations)
+
+    def _config_vector(self, value):
+        return np.atleast_1d(value)
+
+    def _config_scales(self):
+        return None
+
+    def _config_periods(self):
+        return None
+
+    def _lookup_configuration(self, idx_or_name) -> dict:
+        index = self._get_config_index()
+        if isinstance(idx_or_name, int) or idx_or_name.isdigit():
+            row = index.get_by_idx(int(idx_or_name))
+        else:
+            row = index.get_by_name(idx_or_name)
+        if row is None:
+            msg = f"No configuration saved as '{idx_or_name}'"
+            raise ValueError(msg)
+        return row
+
+    def get_config_index_from_name(self, name: str) -> int:
+        row = self._get_config_index().get_by_name(name)
+        if row is None:
+            msg = f"Could not find configuration with name {name}"
+            raise ValueError(msg)
+        return row["idx"]
+
+    def _get_config_index(self) -> ConfigurationIndex:
+        # rebuilt lazily after the configurations change
+        if self._config_index is None:
+            self._config_index = ConfigurationIndex(
+                self.configurations,
+                self._config_vector,
+                scales=self._config_scales(),
+                periods=self._config_periods(),
+            )
+        return self._config_index
 
     def get_name(self):
         return self.name
@@ -127,14 +282,47 @@ class ConfigurableDevice:
     def set_name(self, value: str):
         self.name = value
 
+    def invalidate_status(self):
+        """Drop the polled status snapshot, e.g. after a move, so the next status is read live"""
+        # also discards the snapshot of any poll already in flight, see `fresh_snapshot`
+        self._status_generation = next(_STATUS_GENERATIONS)
+        self._status_snapshot = None
+
+    def _cached_status(self):
+        # the polled status if it is still fresh, else None
+        snapshot = fresh_snapshot(self)
+        if snapshot is not None:
+            return snapshot.status
+        return None
+
+    def poll(self, move_id: str) -> dict:
+        """State of a move started with one of the `*_async` methods, see `MoveTracker.poll`"""
+        return get_tracker().poll(move_id)
+
+    def wait(self, move_id: str, timeout=None) -> dict:
+        """Block until a move started with one of the `*_async` methods is done, then `poll` it"""
+        return get_tracker().wait(move_id, timeout)
+
 
 class MotionDevice(ConfigurableDevice):
     FORMAT_STR = "{0}: {1} {{{2}}}"
-
-    def __init__(self, unit=None, offset=0, **kwargs):
+    # period of the position for rotation stages (e.g. 360 deg), None for linear stages
+    PERIOD = None
+    # default dead-band within which an absolute move is skipped, in device units
+    SETTLE_TOL = 1e-3
+    # number of recent moves kept to calibrate `estimate_move_time`
+    MOVE_HISTORY = 50
+    # (velocity, acceleration) from the controller, queried once, None items if unknown
+    _kinematics = None
+    _move_samples = None
+    # (status generation, raw position) of the last position read or reached
+    _last_raw = None
+
+    def __init__(self, unit=None, offset=0, settle_tol=None, **kwargs):
         super().__init__(**kwargs)
         self.unit = unit
         self.offset = offset
+        self.settle_tol = self.SETTLE_TOL if settle_tol is None else settle_tol
 
     def get_unit(self):
         return self.unit
@@ -147,19 +335,50 @@ class MotionDevice(ConfigurableDevice):
 
     def set_offset(self, value):
         self.offset = value
+        # the snapshot holds positions including the old offset
+        self.invalidate_status()
+
+    def get_settle_tol(self):
+        return self.settle_tol
+
+    def set_settle_tol(self, value):
+        self.settle_tol = value
 
     def _config_extras(self):
-        return {"unit": self.unit, "offset": self.offset}
+        return {"unit": self.unit, "offset": self.offset, "settle_tol": self.settle_tol}
+
+    def _wrap(self, position):
+        # rotation stages may sit several turns away from [0, PERIOD) after shortest-arc moves
+        if self.PERIOD:
+            return position % self.PERIOD
+        return position
 
     def get_position(self):
         raw = self._get_position()
-        pos = raw + self.offset
+        self._last_raw = (self._status_generation, raw)
+        pos = self._wrap(raw + self.offset)
         self.update_keys(pos)
         return pos
 
     def _get_position(self):
         raise NotImplementedError()
 
+    def _known_raw_position(self):
+        """
+        The raw position last read or moved to, without bus traffic, or None if the status was
+        invalidated since (e.g. by a move started elsewhere in this process)
+        """
+        if self._last_raw is None or self._last_raw[0] != self._status_generation:
+            return None
+        return self._last_raw[1]
+
+    def _reached(self, raw):
+        # drivers return the raw position they stopped at, the stage is only read if they don't
+        if raw is None:
+            raw = self._get_position()
+        self._last_raw = (self._status_generation, raw)
+        return self._wrap(raw + self.offset)
+
     def get_target_position(self):
         pos = self._get_target_position() + self.offset
         self.logger.debug(pos)
@@ -170,14 +389,76 @@ class MotionDevice(ConfigurableDevice):
 
     def home(self):
         self.logger.debug("HOMING")
-        pos = self._home()
+        raw = self._home()
+        self.invalidate_status()
+        pos = self._reached(raw)
         self.update_keys(pos)
         return pos
 
     def _home(self):
         raise NotImplementedError()
 
-    def move_absolute(self, value, **kwargs):
+    def _snapshot_position(self):
+        # from the polled status when it is fresh, which costs no bus traffic
+        status = self._cached_status()
+        if isinstance(status, tuple) and len(status) == 2:
+            return status[0]
+        return None
+
+    def _current_position(self):
+        position = self._snapshot_position()
+        if position is None:
+            position = self.get_position()
+        return position
+
+    def _distance(self, value, position):
+        distance = abs(value - position)
+        if self.PERIOD:
+            distance %= self.PERIOD
+            distance = min(distance, self.PERIOD - distance)
+        return distance
+
+    def needs_move(self, value, position=None) -> bool:
+        """
+        Whether `position` (by default the current position) is further than `settle_tol` from
+        `value`, wrapping around the period of rotation stages.
+        """
+        if position is None:
+            position = self._current_position()
+        return self._distance(value, position) > self.settle_tol
+
+    def move_absolute(self, value, force=False, position=None, **kwargs):
+        """
+        Move to `value` and return the position reached. The move is skipped when the stage is
+        already within `settle_tol` of the target, unless `force` is set, and the current position
+        is returned instead. `position` is the current position, if already known; otherwise it
+        comes from the polled status while that is fresh, and from the stage if not. With `force`
+        the stage is not read before the move.
+        """
+        if not force:
+            if position is None:
+                position = self._current_position()
+            if not self.needs_move(value, position):
+                return self._skip_move(value, position)
+        elif position is None and (raw := self._known_raw_position()) is not None:
+            # only needed to record the move
+            position = self._wrap(raw + self.offset)
+        self._log_move(value)
+        start = time.monotonic()
+        raw = self._move_absolute(value - self.offset, **kwargs)
+        duration = time.monotonic() - start
+        self.invalidate_status()
+        end = self._reached(raw)
+        self._moved(value, position, end, duration)
+        return end
+
+    def _skip_move(self, value, position):
+        self.logger.debug("SKIPPING move to=%s, already within %s", value, self.settle_tol)
+        # the position the stage is at, as a real move returns it
+        raw = self._known_raw_position()
+        return position if raw is None else self._wrap(raw + self.offset)
+
+    def _log_move(self, value):
         self.logger.debug(
             "MOVING to=%s unit=%s raw=%s offset=%s",
             value,
@@ -185,22 +466,188 @@ class MotionDevice(ConfigurableDevice):
             value - self.offset,
             self.offset,
         )
-        pos = self._move_absolute(value - self.offset, **kwargs)
-        self.update_keys(pos)
-        return pos
+
+    def _moved(self, value, position, end, duration):
+        # moves refused (e.g. a stage which needs homing) or stopped short are no sample
+        if position is not None and self._distance(value, end) <= self.settle_tol:
+            self._record_move(self._distance(value, position), duration)
+        self.update_keys(end)
 
     def _move_absolute(self, value):
         raise NotImplementedError()
 
     def move_relative(self, value):
         self.logger.debug("MOVING relative=%s unit=%s", value, self.unit)
-        pos = self._move_relative(value)
+        # not recorded, whether the move got there is unknown without reading the start position
+        raw = self._move_relative(value)
+        self.invalidate_status()
+        pos = self._reached(raw)
         self.update_keys(pos)
         return pos
 
     def _move_relative(self, value):
         raise NotImplementedError()
 
+    # async API - one event loop can drive several stages concurrently, e.g.
+    # `await asyncio.gather(stage1.amove_absolute(10), stage2.amove_absolute(2))`. Drivers talking
+    # to the port through `Serial.atransaction` (`CONEXDevice`) override the `_a*` hooks; the
+    # defaults run the blocking implementation in a worker thread.
+    async def aget_position(self):
+        raw = await self._aget_position()
+        self._last_raw = (self._status_generation, raw)
+        pos = self._wrap(raw + self.offset)
+        self.update_keys(pos)
+        return pos
+
+    async def ahome(self):
+        self.logger.debug("HOMING")
+        raw = await self._ahome()
+        self.invalidate_status()
+        if raw is None:
+            raw = await self._aget_position()
+        pos = self._reached(raw)
+        self.update_keys(pos)
+        return pos
+
+    async def amove_absolute(self, value, force=False, position=None, **kwargs):
+        """`move_absolute` without blocking the event loop"""
+        if not force:
+            if position is None:
+                position = self._snapshot_position()
+            if position is None:
+                position = await self.aget_position()
+            if not self.needs_move(value, position):
+                return self._skip_move(value, position)
+        elif position is None and (raw := self._known_raw_position()) is not None:
+            position = self._wrap(raw + self.offset)
+        self._log_move(value)
+        start = time.monotonic()
+        raw = await self._amove_absolute(value - self.offset, **kwargs)
+        duration = time.monotonic() - start
+        self.invalidate_status()
+        if raw is None:
+            raw = await self._aget_position()
+        end = self._reached(raw)
+        self._moved(value, position, end, duration)
+        return end
+
+    async def amove_relative(self, value):
+        """`move_relative` without blocking the event loop"""
+        self.logger.debug("MOVING relative=%s unit=%s", value, self.unit)
+        raw = await self._amove_relative(value)
+        self.invalidate_status()
+        if raw is None:
+            raw = await self._aget_position()
+        pos = self._reached(raw)
+        self.update_keys(pos)
+        return pos
+
+    async def wait_until_settled(self, poll_interval=0.05, timeout=None, start_timeout=0.5):
+        """
+        Wait until the stage stops moving, polling every `poll_interval` seconds.
+
+        Controllers only report MOVING/HOMING a little after the move command, so the motion is
+        first waited for, for up to `start_timeout` seconds. A stage that never starts moving (e.g.
+        it was already on target) counts as settled once that has passed.
+        """
+        import asyncio
+
+        async def poll():
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + start_timeout
+            while not await self._ais_moving():
+                if loop.time() >= deadline:
+                    return
+                await asyncio.sleep(poll_interval)
+            while await self._ais_moving():
+                await asyncio.sleep(poll_interval)
+
+        await asyncio.wait_for(poll(), timeout)
+
+    async def _aget_position(self):
+        import asyncio
+
+        return await asyncio.to_thread(self._get_position)
+
+    async def _ahome(self):
+        import asyncio
+
+        return await asyncio.to_thread(self._home)
+
+    async def _amove_absolute(self, value, **kwargs):
+        import asyncio
+
+        return await asyncio.to_thread(self._move_absolute, value, **kwargs)
+
+    async def _amove_relative(self, value):
+        import asyncio
+
+        return await asyncio.to_thread(self._move_relative, value)
+
+    async def _ais_moving(self) -> bool:
+        raise NotImplementedError()
+
+    def _record_move(self, distance, duration):
+        # moves skipped by the dead-band or in place say nothing about the stage's speed
+        if distance <= self.settle_tol:
+            return
+        self.logger.debug("MOVED distance=%s duration=%.3f", distance, duration)
+        if self._move_samples is None:
+            self._move_samples = deque(maxlen=self.MOVE_HISTORY)
+        self._move_samples.append((distance, duration))
+
+    def _query_kinematics(self):
+        """Device-specific (velocity, acceleration) in device units, None items if unknown"""
+        return None, None
+
+    def get_kinematics(self):
+        """Return the (velocity, acceleration) of the stage, queried once from the controller"""
+        if self._kinematics is None:
+            try:
+                self._kinematics = self._query_kinematics()
+            except Exception:
+                self.logger.warning("could not query the stage kinematics", exc_info=True)
+                self._kinematics = (None, None)
+        return self._kinematics
+
+    def estimate_move_time(self, target, position=None) -> float | None:
+        """
+        Estimate how long moving to `target` takes, in seconds, or None if unknown.
+
+        With the controller's velocity (and acceleration) this is the trapezoidal profile time plus
+        the median overhead of the recent moves; otherwise it is fit from the recent moves alone.
+        Distances are shortest-arc for rotation stages, so moves which the travel limits force
+        the long way round take longer than estimated.
+        """
+        import statistics
+
+        if position is None:
+            position = self._current_position()
+        distance = self._distance(target, position)
+        if distance <= self.settle_tol:
+            return 0.0
+        samples = list(self._move_samples or ())
+        velocity, acceleration = self.get_kinematics()
+        if velocity:
+            overheads = [
+                duration - trapezoid_time(dist, velocity, acceleration)
+                for dist, duration in samples
+            ]
+            overhead = max(statistics.median(overheads), 0) if overheads else 0
+            return trapezoid_time(distance, velocity, acceleration) + overhead
+        distances = [dist for dist, _ in samples]
+        durations = [duration for _, duration in samples]
+        if len(set(distances)) >= 2:
+            slope, intercept = statistics.linear_regression(distances, durations)
+            return max(slope * distance + intercept, 0)
+        if samples:
+            return distance * sum(durations) / sum(distances)
+        return None
+
+    def estimate_configuration_time(self, idx_or_name) -> float | None:
+        """Estimate the duration of `move_configuration(idx_or_name)`, see `estimate_move_time`"""
+        return self.estimate_move_time(self._lookup_configuration(idx_or_name)["value"])
+
     def stop(self):
         raise NotImplementedError()
 
@@ -222,33 +669,57 @@ class MotionDevice(ConfigurableDevice):
         return self.move_configuration_name(idx_or_name, **kwargs)
 
     def move_configuration_idx(self, idx: int, **kwargs):
-        for row in self.configurations:
-            if row["idx"] == idx:
-                return self.move_absolute(row["value"], **kwargs)
-        msg = f"No configuration saved at index {idx}"
-        raise ValueError(msg)
+        row = self._get_config_index().get_by_idx(idx)
+        if row is None:
+            msg = f"No configuration saved at index {idx}"
+            raise ValueError(msg)
+        return self.move_absolute(row["value"], **kwargs)
 
     def move_configuration_name(self, name: str, **kwargs):
-        for row in self.configurations:
-            if row["name"].lower() == name.lower():
-                return self.move_absolute(row["value"], **kwargs)
-        msg = f"No configuration saved with name '{name}'"
-        raise ValueError(msg)
+        row = self._get_config_index().get_by_name(name)
+        if row is None:
+            msg = f"No configuration saved with name '{name}'"
+            raise ValueError(msg)
+        return self.move_absolute(row["value"], **kwargs)
+
+    # non-blocking moves, which return a move ID to `poll` or `wait` on at once
+    def move_absolute_async(self, value, **kwargs) -> str:
+        return get_tracker().start(
+            self.move_absolute, value, description=f"{self.name} move_absolute {value}", **kwargs
+        )
+
+    def move_relative_async(self, value) -> str:
+        return get_tracker().start(
+            self.move_relative, value, description=f"{self.name} move_relative {value}"
+        )
+
+    def move_configuration_async(self, idx_or_name, **kwargs) -> str:
+        return get_tracker().start(
+            self.move_configuration,
+            idx_or_name,
+            description=f"{self.name} move_configuration {idx_or_name}",
+            **kwargs,
+        )
 
     def get_configuration(self, position=None, tol=1e-1):
         if position is None:
             position = self.get_position()
-        for row in self.configurations:
-            if np.abs(position - row["value"]) <= tol:
-                return row["idx"], row["name"]
-        return None, "Unknown"
+        row = self._get_config_index().match(position, tol=tol)
+        if row is None:
+            return None, "Unknown"
+        return row["idx"], row["name"]
 
-    def get_config_index_from_name(self, name: str) -> int:
-        for config in self.configurations:
-            if name.lower() == config["name"].lower():
-                return config["idx"]
-        msg = f"Could not find configuration with name {name}"
-        raise ValueError(msg)
+    def _config_periods(self):
+        return [self.PERIOD or 0]
+
+    def get_nearest_configuration(self, position=None):
+        """Return the index, name and distance of the configuration closest to `position`"""
+        if position is None:
+            position = self.get_position()
+        row, distance = self._get_config_index().nearest(position)
+        if row is None:
+            return None, "Unknown", distance
+        return row["idx"], row["name"], distance
 
     def save_configuration(self, position=None, index=None, name=None, tol=1e-1, **kwargs):
         if position is None:
@@ -263,15 +734,14 @@ class MotionDevice(ConfigurableDevice):
                 name = current_config[1]
 
         # see if existing configuration
-        for row in self.configurations:
-            if row["idx"] == index:
-                if name is not None:
-                    row["name"] = name
-                row["value"] = position
-                self.logger.info(
-                    f"updated configuration {index} '{row['name']}' to value {row['value']}"
-                )
-                break
+        row = self._get_config_index().get_by_idx(index)
+        if row is not None:
+            if name is not None:
+                row["name"] = name
+            row["value"] = position
+            self.logger.info(
+                f"updated configuration {index} '{row['name']}' to value {row['value']}"
+            )
         else:
             if name is None:
                 msg = "Must provide name for new configuration"
@@ -281,11 +751,14 @@ class MotionDevice(ConfigurableDevice):
 
         # sort configurations dictionary in-place by index
         self.configurations.sort(key=lambda d: d["idx"])
+        self._config_index = None
         self.logger.debug("Saving configuration filename=%s", self.config_file)
         # save configurations to file
         self.save_config(**kwargs)
+        self.invalidate_status()
         self.update_keys()
 
+    @snapshot_status
     def get_status(self):
         posn = self.get_position()
         idx, name = self.get_configuration(posn)
@@ -293,11 +766,105 @@ class MotionDevice(ConfigurableDevice):
         return posn, output
 
 
+class SSHShell:
+    """
+    Persistent remote shell over an SSH client.
+
+    Instead of a new exec channel per query, one `/bin/sh` channel is kept open and every command
+    is written to it followed by a sentinel line. Several commands can be written at once and their
+    outputs read back in order, so they cost a single round trip. Each command's stderr is read back
+    separately after its output and logged rather than returned, and a reply that takes longer than
+    `timeout` seconds raises `TimeoutError`. The channel is reopened if it has been closed or timed
+    out.
+    """
+
+    SENTINEL = "__DEVICE_CONTROL_DONE__"
+
+    def __init__(self, client: "paramiko.SSHClient", timeout: float = 10):
+        self.client = client
+        self.timeout = timeout
+        self.channel = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        self.channel = self.client.get_transport().open_session()
+        # the commands' stderr is redirected per command, but an unread stderr stream from the shell
+        # itself would eventually fill its window and stall it
+        self.channel.set_combine_stderr(True)
+        self.channel.settimeout(self.timeout)
+        self.channel.exec_command("/bin/sh")
+        self._stdin = self.channel.makefile_stdin("wb")
+        self._stdout = self.channel.makefile("rb")
+
+    def _script(self, commands: list[str], concurrent: bool) -> str:
+        # every command prints its output then its stderr, each followed by a sentinel
+        stderr = f"cat $d/{{}}.err; echo; echo {self.SENTINEL}"
+        lines = ["d=$(mktemp -d)"]
+        if not concurrent:
+            for i, command in enumerate(commands):
+                # braces rather than a subshell so the command runs in the shell itself
+                lines.append(f"{{ {command}\n}} 2> $d/{i}.err; echo; echo {self.SENTINEL}")
+                lines.append(stderr.format(i))
+        else:
+            # run every command at once in the background, then print the outputs in order
+            lines.extend(
+                f"({command}) > $d/{i} 2> $d/{i}.err &" for i, command in enumerate(commands)
+            )
+            lines.append("wait")
+            for i in range(len(commands)):
+                lines.append(f"cat $d/{i}; echo; echo {self.SENTINEL}")
+                lines.append(stderr.format(i))
+        lines.append("rm -rf $d")
+        return "\n".join(lines) + "\n"
+
+    def ask(self, commands: list[str], concurrent=False) -> list[str]:
+        """
+        Send all `commands` in one write and return their outputs in order. With `concurrent`, the
+        commands run in parallel on the remote host instead of one after another.
+        """
+        with self._lock:
+            if self.channel is None or self.channel.closed or self.channel.exit_status_ready():
+                self._open()
+            script = self._script(commands, concurrent)
+            try:
+                self._stdin.write(script.encode())
+                self._stdin.flush()
+                replies = []
+                for command in commands:
+                    replies.append(self._read_reply())
+                    stderr = self._read_reply()
+                    if stderr:
+                        logger.warning("stderr from %r: %s", command, stderr.rstrip())
+                return replies
+            except TimeoutError as exc:
+                # the rest of the reply may still arrive, so never read from this channel again
+                self.channel.close()
+                msg = f"no reply from the remote shell within {self.timeout} s"
+                raise TimeoutError(msg) from exc
+            except Exception:
+                # reopen the shell on the next query
+                self.channel.close()
+                raise
+
+    def _read_reply(self) -> str:
+        lines = []
+        while True:
+            line = self._stdout.readline().decode()
+            if line == "":
+                msg = "remote shell closed unexpectedly"
+                raise ConnectionError(msg)
+            if line.strip() == self.SENTINEL:
+                # drop the newline from the `echo` which guarantees the sentinel is on its own line
+                return "".join(lines)[:-1]
+            lines.append(line)
+
+
 class SSHDevice:
     CONF = None
     PYRO_KEY = None
 
     def __init__(self, host, user=None, config_file=None):
+        logging_config.configure()
         self.host = host
         self.user = user
         self._prepare_sshclient()
@@ -308,13 +875,14 @@ class SSHDevice:
         self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         self.client.load_system_host_keys()
         self.client.connect(self.host, username=self.user, **kwargs)
+        self.shell = SSHShell(self.client)
 
     def send_command(self, command: str):
+        # fire and forget, don't wait for e.g. a move to complete
         stdin, stdout, stderr = self.client.exec_command(command)
 
     def ask_command(self, command: str):
-        stdin, stdout, stderr = self.client.exec_command(command)
-        return stdout.read().decode()
+        return self.shell.ask([command])[0]
 
     @classmethod
     def from_config(__cls__, filename, **kwargs):
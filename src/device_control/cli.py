@@ -0,0 +1,165 @@
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import tomli
+
+from device_control import conf_dir
+
+__all__ = [
+    "get_help",
+    "get_proxy",
+    "keep_warm",
+    "warm_proxies",
+    "forget_proxies",
+    "load_configurations",
+    "invalidate_cache",
+    "run_move",
+]
+
+CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME", "~/.cache")).expanduser() / "device_control"
+# seconds before cached configurations are fetched again for the help text
+CACHE_TTL = float(os.getenv("DEVICE_CONTROL_CLI_CACHE_TTL", 24 * 3600))
+
+# Pyro proxies and configurations kept in memory between commands by a long-running process (the
+# `devctl` agent). None when every command starts fresh, like the console scripts.
+_proxies: dict | None = None
+_configurations: dict | None = None
+_lock = threading.Lock()
+
+
+def keep_warm():
+    """Keep Pyro proxies and configurations in memory for the rest of the process"""
+    global _proxies, _configurations
+    with _lock:
+        if _proxies is None:
+            _proxies = {}
+            _configurations = {}
+
+
+def forget_proxies():
+    """Drop the kept proxies, e.g. after a communication error when a daemon was restarted"""
+    with _lock:
+        if _proxies is not None:
+            _proxies.clear()
+
+
+def warm_proxies() -> list[str]:
+    """Pyro keys of the kept proxies"""
+    with _lock:
+        return sorted(_proxies or ())
+
+
+def get_proxy(pyro_key: str):
+    """Connect to `pyro_key`, reusing the proxy from a previous command after `keep_warm`"""
+    from swmain.network.pyroclient import connect
+
+    if _proxies is None:
+        return connect(pyro_key)
+    with _lock:
+        if pyro_key not in _proxies:
+            _proxies[pyro_key] = connect(pyro_key)
+        return _proxies[pyro_key]
+
+
+def _cache_path(cls) -> Path:
+    return CACHE_DIR / f"{cls.PYRO_KEY}.json"
+
+
+def _read_cache(cls):
+    try:
+        with _cache_path(cls).open() as fh:
+            cached = json.load(fh)
+        return cached["time"], cached["saved"], cached["configurations"]
+    except (OSError, ValueError, KeyError):
+        return None, None, None
+
+
+def _write_cache(cls, configurations, saved=None):
+    path = _cache_path(cls)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w") as fh:
+        json.dump({"time": time.time(), "saved": saved, "configurations": configurations}, fh)
+    tmp.replace(path)
+
+
+def invalidate_cache(cls):
+    """Forget the cached configurations of `cls`"""
+    if _configurations is not None:
+        _configurations.pop(cls.PYRO_KEY, None)
+    _cache_path(cls).unlink(missing_ok=True)
+
+
+def load_configurations(cls, local=False, refresh=False) -> list:
+    """
+    Return the saved configurations of `cls`. Locally they are read from the configuration file.
+
+    In remote mode they come from the cache while it is younger than `CACHE_TTL`, or are empty
+    without one. With `refresh` the daemon is asked when its configuration file was last saved
+    (`get_config_mtime`), and the configurations are fetched again if that changed since they
+    were cached, or if the cache expired. If the daemon can't be reached, a cache younger than
+    `CACHE_TTL` is used as is.
+    """
+    if local:
+        with (conf_dir / cls.CONF).open("rb") as fh:
+            return tomli.load(fh).get("configurations", [])
+    if _configurations is not None and cls.PYRO_KEY in _configurations:
+        cache_time, saved, configurations = _configurations[cls.PYRO_KEY]
+    else:
+        cache_time, saved, configurations = _read_cache(cls)
+    fresh = cache_time is not None and time.time() - cache_time <= CACHE_TTL
+    if refresh:
+        try:
+            proxy = cls.connect()
+            daemon_saved = proxy.get_config_mtime()
+        except Exception:
+            # e.g. the daemon is down, the help text can still list the cached configurations
+            if not fresh:
+                raise
+            daemon_saved = saved
+        if not fresh or daemon_saved != saved:
+            configurations = proxy.get_configurations() or []
+            cache_time, saved = time.time(), daemon_saved
+            _write_cache(cls, configurations, saved)
+    elif not fresh:
+        return []
+    if _configurations is not None:
+        _configurations[cls.PYRO_KEY] = cache_time, saved, configurations
+    return configurations
+
+
+def _wants_help(argv) -> bool:
+    return len(argv) == 0 or any(arg in ("-h", "--help") for arg in argv)
+
+
+def get_help(cls, local=False, argv=None) -> str:
+    """
+    Build the CLI usage text of `cls` without connecting to the device, so arguments are parsed
+    before any RPC. The configuration list is only fetched from the daemon when the help is going
+    to be shown (no arguments, or `-h`) and the cache is stale.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    return cls.usage(load_configurations(cls, local=local, refresh=_wants_help(argv)))
+
+
+def run_move(device, method: str, *args, wait=True, local=False):
+    """
+    Call the move `method` (e.g. "move_absolute") of `device`. Remotely the move is started with
+    its `_async` variant and waited on by move ID, or left running when `wait` is False
+    (`--no-wait`). Locally it always blocks, since the move would not outlive the process.
+    """
+    if local:
+        return getattr(device, method)(*args)
+    move_id = getattr(device, f"{method}_async")(*args)
+    if not wait:
+        return None
+    result = device.wait(move_id)
+    if result["error"] is not None:
+        msg = f"{result['description']} failed: {result['error']}"
+        raise RuntimeError(msg)
+    return None
@@ -11,12 +11,18 @@ from device_control.first import (
     FIRSTPLInjection,
     FIRSTPLWollaston
 )
+from device_control.daemons.status import DaemonStatus
+from device_control.poller import StatusPoller
+from device_control.pyro_keys import DAEMONS
 
 DEVICE_MAP = {
     "injection": partial(FIRSTPLInjection.connect, local=True),
     "wollaston": partial(FIRSTPLWollaston.connect, local=True)
 }
 
+# status poll period (s) of each device, devices not listed are only queried on demand
+POLL_INTERVALS = {"injection": 2, "wollaston": 2}
+
 parser = argparse.ArgumentParser(
     "first_devices",
     description="Launch the daemon for the devices controlled by the FIRST computer.",
@@ -31,7 +37,8 @@ def main():
     server = PyroServer(bindTo=(IP_KAMUA, 0), nsAddress=(PYRONS3_HOST, PYRONS3_PORT))
     ## create device objects
     click.echo("Initializing devices")
-    available = []
+    poller = StatusPoller()
+    devices = {}
     for key, connect_func in DEVICE_MAP.items():
         try:
             device = connect_func()
@@ -39,13 +46,19 @@ def main():
             click.echo(f" - {key}: {device.PYRO_KEY}")
             globals()[key] = device
             server.add_device(device, device.PYRO_KEY, add_oneway_callables=True)
-            available.append(key)
+            if key in POLL_INTERVALS:
+                poller.add(key, device, interval=POLL_INTERVALS[key])
+            devices[key] = device
 
         except Exception:
             click.secho(f" ! Failed to connect {key.upper()}", bg=(114, 24, 23), fg=(224, 224, 226))
 
     click.echo("\nThe following variables are available in the shell:")
-    click.secho(", ".join(available), bold=True)
+    click.secho(", ".join(devices), bold=True)
+    ## Poll device status in the background
+    poller.start()
+    ## Bulk status endpoint for all the devices of this daemon
+    server.add_device(DaemonStatus(devices, poller), DAEMONS.FIRST, add_oneway_callables=True)
     ## Start server
     server.start()
 
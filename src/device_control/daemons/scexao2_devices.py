@@ -8,6 +8,9 @@ from swmain.infra.badsystemd.aux import auto_register_to_watchers
 from swmain.network.pyroserver_registerable import PyroServer
 
 from device_control.scexao import SCEXAOPolarizer, VisQWP, FIRSTPLPickoff
+from device_control.daemons.status import DaemonStatus
+from device_control.poller import StatusPoller
+from device_control.pyro_keys import DAEMONS
 
 parser = ArgumentParser(
     prog="scexao2_devices",
@@ -21,6 +24,9 @@ DEVICE_MAP = {
     "firstpl_pickoff": partial(FIRSTPLPickoff.connect, local=True),
 }
 
+# status poll period (s) of each device, devices not listed are only queried on demand
+POLL_INTERVALS = {"polarizer": 2, "qwp": 2, "firstpl_pickoff": 2}
+
 
 def main():
     parser.parse_args()
@@ -28,7 +34,8 @@ def main():
     server = PyroServer(bindTo=(IP_SC2, 0), nsAddress=(PYRONS3_HOST, PYRONS3_PORT))
     ## create device objects
     click.echo("Initializing devices")
-    available = []
+    poller = StatusPoller()
+    devices = {}
     for key, connect_func in DEVICE_MAP.items():
         try:
             device = connect_func()
@@ -36,12 +43,18 @@ def main():
             click.echo(f" - {key}: {device.PYRO_KEY}")
             globals()[key] = device
             server.add_device(device, device.PYRO_KEY, add_oneway_callables=True)
-            available.append(key)
+            if key in POLL_INTERVALS:
+                poller.add(key, device, interval=POLL_INTERVALS[key])
+            devices[key] = device
         except Exception:
             click.secho(f" ! Failed to connect {key}", bg=(114, 24, 23), fg=(224, 224, 226))
 
     click.echo("\nThe following variables are available in the shell:")
-    click.secho(", ".join(available), bold=True)
+    click.secho(", ".join(devices), bold=True)
+    ## Poll device status in the background
+    poller.start()
+    ## Bulk status endpoint for all the devices of this daemon
+    server.add_device(DaemonStatus(devices, poller), DAEMONS.SCEXAO2, add_oneway_callables=True)
     ## Start server
     server.start()
 
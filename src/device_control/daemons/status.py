@@ -0,0 +1,101 @@
+import contextlib
+import time
+
+from device_control.multi_device import MultiDevice, run_parallel
+from device_control.poller import StatusPoller, fresh_snapshot
+
+__all__ = ["DaemonStatus"]
+
+
+def _to_builtin(value):
+    # numpy scalars and arrays don't go through the Pyro serializer
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_builtin(v) for k, v in value.items()}
+    return value
+
+
+def _needs_homing(device):
+    if isinstance(device, MultiDevice):
+        return {
+            name: sub.needs_homing()
+            for name, sub in device.devices.items()
+            if hasattr(sub, "needs_homing")
+        }
+    if hasattr(device, "needs_homing"):
+        return device.needs_homing()
+    return None
+
+
+class DaemonStatus:
+    """
+    Bulk status endpoint for one daemon.
+
+    Registered on the daemon's Pyro server next to the devices, so a client gets the position,
+    configuration and health of every device of the host in a single call. Statuses come from the
+    `StatusPoller` snapshots when they are fresh; only devices without one are queried, in
+    parallel.
+    """
+
+    def __init__(self, devices: dict, poller: StatusPoller | None = None):
+        self.devices = devices
+        self.poller = poller
+
+    def get_devices(self) -> dict[str, str]:
+        """Map of device key to Pyro key"""
+        return {key: device.PYRO_KEY for key, device in self.devices.items()}
+
+    def _snapshot(self, key):
+        if self.poller is not None and key in self.poller:
+            snapshot = fresh_snapshot(self.devices[key])
+            if snapshot is None:
+                snapshot = self.poller.poll(key)
+            return snapshot.status, snapshot.error, time.time() - snapshot.time
+        if not hasattr(self.devices[key], "get_status"):
+            return None, None, 0
+        try:
+            return self.devices[key].get_status(), None, 0
+        except Exception as exc:
+            return None, f"{type(exc).__name__}: {exc}", 0
+
+    def _device_status(self, key, homing=False):
+        device = self.devices[key]
+        status, error, age = self._snapshot(key)
+        if isinstance(status, tuple) and len(status) == 2:
+            position, output = status
+        else:
+            position, output = None, status
+        result = {
+            "pyro_key": device.PYRO_KEY,
+            "ok": error is None,
+            "error": error,
+            "age": age,
+            "position": position,
+            "configuration": None,
+            "status": output,
+        }
+        if position is not None and hasattr(device, "get_configuration"):
+            # with a position given this is a lookup in the saved configurations, no I/O
+            with contextlib.suppress(Exception):
+                result["configuration"] = device.get_configuration(position)[1]
+        if homing:
+            try:
+                result["needs_homing"] = _needs_homing(device)
+            except Exception as exc:
+                result["ok"] = False
+                result["error"] = f"{type(exc).__name__}: {exc}"
+        return _to_builtin(result)
+
+    def get_status_all(self, homing=False) -> dict[str, dict]:
+        """
+        Return the status of every device keyed by the daemon's device key. Each entry has the
+        `pyro_key`, `position`, `configuration` name, formatted `status`, `ok`/`error` health and
+        `age` of the reading in seconds. With `homing`, `needs_homing` is queried for every device
+        as well (a dict of sub-devices for multi-axis devices, None if not applicable).
+        """
+        keys = list(self.devices)
+        results = run_parallel(self._device_status, keys, homing=homing)
+        return dict(zip(keys, results, strict=True))
@@ -7,6 +7,9 @@ from scxconf import IP_VAMPIRES, PYRONS3_HOST, PYRONS3_PORT
 from swmain.infra.badsystemd.aux import auto_register_to_watchers
 from swmain.network.pyroserver_registerable import PyroServer
 
+from device_control.daemons.status import DaemonStatus
+from device_control.poller import StatusPoller
+from device_control.pyro_keys import DAEMONS
 from device_control.scexao import VisBlock
 from device_control.vampires import (
     VAMPIRESTC,
@@ -37,6 +40,22 @@ DEVICE_MAP = {
     "block": partial(VisBlock.connect, local=True),
 }
 
+# status poll period (s) of each device, devices not listed are only queried on demand
+POLL_INTERVALS = {
+    "bs": 2,
+    "fieldstop": 2,
+    "diff": 2,
+    "filt": 2,
+    "flc": 2,
+    "focus": 2,
+    "mask": 2,
+    "mbi": 2,
+    "puplens": 2,
+    "tc": 5,
+    "trig": 10,
+    "block": 2,
+}
+
 parser = argparse.ArgumentParser(
     "vampires_devices",
     description="Launch the daemon for the devices controlled by the VAMPIRES computer.",
@@ -51,7 +70,8 @@ def main():
     server = PyroServer(bindTo=(IP_VAMPIRES, 0), nsAddress=(PYRONS3_HOST, PYRONS3_PORT))
     ## create device objects
     click.echo("Initializing devices")
-    available = []
+    poller = StatusPoller()
+    devices = {}
     for key, connect_func in DEVICE_MAP.items():
         try:
             device = connect_func()
@@ -59,13 +79,19 @@ def main():
             click.echo(f" - {key}: {device.PYRO_KEY}")
             globals()[key] = device
             server.add_device(device, device.PYRO_KEY, add_oneway_callables=True)
-            available.append(key)
+            if key in POLL_INTERVALS:
+                poller.add(key, device, interval=POLL_INTERVALS[key])
+            devices[key] = device
 
         except Exception:
             click.secho(f" ! Failed to connect {key.upper()}", bg=(114, 24, 23), fg=(224, 224, 226))
 
     click.echo("\nThe following variables are available in the shell:")
-    click.secho(", ".join(available), bold=True)
+    click.secho(", ".join(devices), bold=True)
+    ## Poll device status in the background
+    poller.start()
+    ## Bulk status endpoint for all the devices of this daemon
+    server.add_device(DaemonStatus(devices, poller), DAEMONS.VAMPIRES, add_oneway_callables=True)
     ## Start server
     server.start()
 
@@ -5,6 +5,9 @@ import click
 from scxconf import IP_AORTS_SUMMIT, PYRONS3_HOST, PYRONS3_PORT
 from swmain.network.pyroserver_registerable import PyroServer
 
+from device_control.daemons.status import DaemonStatus
+from device_control.poller import StatusPoller
+from device_control.pyro_keys import DAEMONS
 from device_control.viswfs import (
     VISWFSHWP,
     VISWFSCamFocus,
@@ -29,6 +32,19 @@ DEVICE_MAP = {
     "hwp": partial(VISWFSHWP.connect, local=True),
 }
 
+# status poll period (s) of each device, devices not listed are only queried on demand
+POLL_INTERVALS = {
+    "pickoff": 2,
+    "camfocus": 2,
+    "trombone1": 2,
+    "trombone2": 2,
+    "rs1": 2,
+    "rs2": 2,
+    "flipmount1": 5,
+    "flipmount2": 5,
+    "hwp": 2,
+}
+
 parser = argparse.ArgumentParser(
     "viswfs_devices",
     description="Launch the daemon for the devices controlled by the AORTS computer.",
@@ -40,7 +56,8 @@ def main():
     server = PyroServer(bindTo=(IP_AORTS_SUMMIT, 0), nsAddress=(PYRONS3_HOST, PYRONS3_PORT))
     ## create device objects
     click.echo("Initializing devices")
-    available = []
+    poller = StatusPoller()
+    devices = {}
     for key, connect_func in DEVICE_MAP.items():
         try:
             device = connect_func()
@@ -48,7 +65,9 @@ def main():
             click.echo(f" - {key}: {device.PYRO_KEY}")
             globals()[key] = device
             server.add_device(device, device.PYRO_KEY, add_oneway_callables=True)
-            available.append(key)
+            if key in POLL_INTERVALS:
+                poller.add(key, device, interval=POLL_INTERVALS[key])
+            devices[key] = device
         except Exception:
             click.secho(
                 f" ! Failed to connect {key} : {device.PYRO_KEY}",
@@ -57,7 +76,11 @@ def main():
             )
 
     click.echo("\nThe following variables are available in the shell:")
-    click.secho(", ".join(available), bold=True)
+    click.secho(", ".join(devices), bold=True)
+    ## Poll device status in the background
+    poller.start()
+    ## Bulk status endpoint for all the devices of this daemon
+    server.add_device(DaemonStatus(devices, poller), DAEMONS.VISWFS, add_oneway_callables=True)
     ## Start server
     server.start()
 
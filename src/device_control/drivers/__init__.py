@@ -1,6 +1,17 @@
-from .conex import ConexAGAPButOnlyOneAxis, CONEXDevice
-from .thorlabs import ThorlabsElliptec, ThorlabsFlipMount, ThorlabsTC, ThorlabsWheel
-from .zaber import ZaberDevice
+from typing import TYPE_CHECKING
+
+from device_control.lazy import lazy_exports
+
+# submodules are only imported when one of their classes is first used
+_EXPORTS = {
+    "CONEXDevice": ".conex",
+    "ConexAGAPButOnlyOneAxis": ".conex",
+    "ZaberDevice": ".zaber",
+    "ThorlabsFlipMount": ".thorlabs",
+    "ThorlabsTC": ".thorlabs",
+    "ThorlabsWheel": ".thorlabs",
+    "ThorlabsElliptec": ".thorlabs",
+}
 
 __all__ = [
     "CONEXDevice",
@@ -11,3 +22,9 @@ __all__ = [
     "ThorlabsWheel",
     "ThorlabsElliptec",
 ]
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .conex import ConexAGAPButOnlyOneAxis, CONEXDevice
+    from .thorlabs import ThorlabsElliptec, ThorlabsFlipMount, ThorlabsTC, ThorlabsWheel
+    from .zaber import ZaberDevice
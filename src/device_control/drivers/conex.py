@@ -1,8 +1,14 @@
-import click
+import math
+import time
+from typing import NamedTuple
 
 from device_control.base import MotionDevice
+from device_control.lazy import lazy_import
+from device_control.scheduler import PortScheduler
 
-__all__ = ["CONEXDevice", "ConexAGAPButOnlyOneAxis"]
+click = lazy_import("click")
+
+__all__ = ["CONEXDevice", "ConexAGAPButOnlyOneAxis", "CONEXStatus"]
 
 # CONEX programmer manual
 # https://www.newport.com/mam/celum/celum_assets/resources/CONEX-AGP_-_Controller_Documentation.pdf
@@ -67,42 +73,252 @@ CONEX_STATES = {
 }
 
 
+class CONEXStatus(NamedTuple):
+    state: CONEXState | None
+    position: float
+    error: str | None
+
+
 class CONEXDevice(MotionDevice):
-    def __init__(self, device_address=1, delay=0.1, **kwargs):
+    # software travel limits (`SL?`, `SR?`) in raw units, queried on the first rotary move
+    _limits: tuple[float, float] | None = None
+
+    def __init__(
+        self,
+        device_address=1,
+        delay=0.1,
+        poll_interval=0.02,
+        max_poll_interval=0.25,
+        publish_interval=0.5,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         if device_address < 1 or device_address > 31:
             msg = f"controller address must be between 1 and 31, got {device_address}"
             raise ValueError(msg)
         self.device_address = device_address
         self.delay = delay
+        # motion-wait cadence, in seconds
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.publish_interval = publish_interval
+
+    def _config_extras(self):
+        extras = super()._config_extras()
+        extras.update(
+            poll_interval=self.poll_interval,
+            max_poll_interval=self.max_poll_interval,
+            publish_interval=self.publish_interval,
+        )
+        return extras
+
+    def _wait_until_ready(self):
+        while not self.is_ready():
+            time.sleep(self.poll_interval)
+
+    def _wait_for_motion(self, busy_state, target=None):
+        """
+        Sleep-poll until the controller leaves `busy_state` (e.g. `Moving` or `Homing`) and return
+        the raw position the stage stopped at, see `_motion_cadence`.
+        """
+        cadence = self._motion_cadence(busy_state, target)
+        next(cadence)
+        try:
+            while True:
+                time.sleep(cadence.send(self.query_status()))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _await_motion(self, busy_state, target=None):
+        """`_wait_for_motion` without blocking the event loop"""
+        import asyncio
+
+        cadence = self._motion_cadence(busy_state, target)
+        next(cadence)
+        try:
+            while True:
+                await asyncio.sleep(cadence.send(await self.aquery_status()))
+        except StopIteration as stop:
+            return stop.value
+
+    def _motion_cadence(self, busy_state, target=None):
+        """
+        Generator pacing the wait for motion: it is sent each `CONEXStatus` and yields the seconds
+        to sleep before the next one, returning the raw position once the state leaves `busy_state`.
+
+        Each tick is a single fused state+position query. The state is polled every
+        `poll_interval` seconds near the target, backing off up to `max_poll_interval` when the
+        remaining distance (estimated from the stage velocity) is large, or geometrically when
+        there is no target (e.g. homing). Keywords are published at most every `publish_interval`
+        seconds.
+        """
+        interval = self.poll_interval
+        last_publish = last_time = last_raw = None
+        status = yield
+        while True:
+            now = time.monotonic()
+            if status.error is not None:
+                self.logger.warning("controller error %s", status.error)
+            if not isinstance(status.state, busy_state):
+                return status.position
+            raw = status.position
+            if last_publish is None or now - last_publish >= self.publish_interval:
+                self.update_keys(self._wrap(raw + self.offset))
+                last_publish = now
+            speed = 0
+            if last_raw is not None and now > last_time:
+                speed = abs(raw - last_raw) / (now - last_time)
+            if target is not None and speed > 0:
+                # wake up well before we expect to arrive
+                interval = 0.5 * abs(target - raw) / speed
+            else:
+                interval = interval * 1.5
+            interval = min(max(interval, self.poll_interval), self.max_poll_interval)
+            last_time, last_raw = now, raw
+            status = yield interval
+
+    def _transact(self, payload: bytes, n_replies: int, retry=False) -> list[bytes]:
+        def transact(serial):
+            serial.write(payload)
+            return [serial.read_until(b"\r\n") for _ in range(n_replies)]
+
+        return self.serial.transaction(transact, retry=retry)
 
     # @autoretry(max_retries=10)
-    def send_command(self, command: str):
+    def send_command(self, command: str, priority=None):
         # pad command with CRLF ending
         cmd = f"{self.device_address}{command}\r\n"
         self.logger.debug("sending command %s", cmd[:-2])
-        with self.serial as serial:
-            # opens
-            serial.write(cmd.encode())
-            serial.read_until(b"\r\n")
-        # closes
+        if priority is None:
+            priority = self.priority
+        self.scheduler.call(self._transact, cmd.encode(), 1, priority=priority)
 
     # @autoretry(max_retries=10)
     def ask_command(self, command: str):
+        return self.ask_commands(command)[0]
+
+    def ask_commands(self, *commands: str) -> list[str]:
+        """Send several queries in one write and parse all the replies in one transaction"""
+        # pad commands with CRLF ending
+        cmd = "".join(f"{self.device_address}{command}\r\n" for command in commands)
+        self.logger.debug("sending command %s", cmd.replace("\r\n", " ").strip())
+        # queries are safe to resend after the port is reopened
+        resps = self.scheduler.call(
+            self._transact, cmd.encode(), len(commands), retry=True, priority=self.priority
+        )
+        return self._parse_replies(commands, resps)
+
+    def _parse_replies(self, commands, resps) -> list[str]:
+        values = []
+        for command, resp in zip(commands, resps, strict=True):
+            retval = resp.strip().decode()
+            self.logger.debug("received %s", retval)
+            # strip command and \r\n from string
+            # Remove echoed command as answer prefix
+            # Warning CONEX AGAP: if axis u/v in command is given in lowercase, the echo is uppercase
+            value = retval.split(command.replace("?", "").replace("u", "U").replace("v", "V"))[-1]
+            self.logger.debug("parsed %s", value)
+            values.append(value)
+        return values
+
+    def _position_command(self) -> str:
+        return "TP"
+
+    def _status_commands(self) -> tuple[str, str, str]:
+        return "MM?", self._position_command(), "TE"
+
+    def _parse_status(self, state, position, error) -> CONEXStatus:
+        return CONEXStatus(
+            state=CONEX_STATES.get(state),
+            position=float(position),
+            error=None if error in ("@", "") else error,
+        )
+
+    def query_status(self) -> CONEXStatus:
+        """
+        Query the controller state, raw position, and last command error in one round trip.
+
+        The error is `None` if the controller reports no error.
+        """
+        return self._parse_status(*self.ask_commands(*self._status_commands()))
+
+    # async API - the commands go straight to the port with `Serial.atransaction`, so waiting on
+    # the controller occupies neither a thread nor the port's scheduler
+    async def asend_command(self, command: str):
         # pad command with CRLF ending
         cmd = f"{self.device_address}{command}\r\n"
         self.logger.debug("sending command %s", cmd[:-2])
-        with self.serial as serial:
-            serial.write(cmd.encode())
-            resp = serial.read_until(b"\r\n")
-        retval = resp.strip().decode()
-        self.logger.debug("received %s", retval[:-2])
-        # strip command and \r\n from string
-        # Remove echoed command as answer prefix
-        # Warning CONEX AGAP: if axis u/v in command is given in lowercase, the echo is uppercase
-        value = retval.split(command.replace("?", "").replace("u", "U").replace("v", "V"))[-1]
-        self.logger.debug("parsed %s", value)
-        return value
+        # set commands have no reply, anything echoed is dropped before the next transaction
+        await self.serial.atransaction(cmd.encode(), 0)
+
+    async def aask_command(self, command: str) -> str:
+        return (await self.aask_commands(command))[0]
+
+    async def aask_commands(self, *commands: str) -> list[str]:
+        """`ask_commands` without blocking the event loop"""
+        # pad commands with CRLF ending
+        cmd = "".join(f"{self.device_address}{command}\r\n" for command in commands)
+        self.logger.debug("sending command %s", cmd.replace("\r\n", " ").strip())
+        resps = await self.serial.atransaction(cmd.encode(), len(commands))
+        return self._parse_replies(commands, resps)
+
+    async def aquery_status(self) -> CONEXStatus:
+        return self._parse_status(*await self.aask_commands(*self._status_commands()))
+
+    async def aget_state(self) -> CONEXState:
+        return CONEX_STATES[await self.aask_command("MM?")]
+
+    async def _ais_moving(self) -> bool:
+        return isinstance(await self.aget_state(), (Moving, Homing))
+
+    async def _aget_position(self) -> float:
+        return float(await self.aask_command(self._position_command()))
+
+    async def _await_ready(self):
+        import asyncio
+
+        while not isinstance(await self.aget_state(), Ready):
+            await asyncio.sleep(self.poll_interval)
+
+    async def _atravel_limits(self) -> tuple[float, float]:
+        if self._limits is None:
+            lower, upper = await self.aask_commands(*self._limit_commands())
+            self._limits = float(lower), float(upper)
+        return self._limits
+
+    async def _ahome(self):
+        await self.asend_command("OR")
+        return await self._await_motion(Homing)
+
+    async def _amove_absolute(self, value: float):
+        # check if we're not referenced
+        if isinstance(await self.aget_state(), NotReferenced):
+            msg = "CONEX device needs to be homed."
+            self.logger.warn(msg)
+            click.secho(msg, bg="red", fg="black")
+            return None
+        await self._await_ready()
+        position = self._known_raw_position()
+        if self.PERIOD:
+            # so the plan never queries the stage synchronously
+            await self._atravel_limits()
+            if position is None:
+                position = await self._aget_position()
+        value = self._plan_absolute(value, position)
+        await self.asend_command(f"PA{value}")
+        return await self._await_motion(Moving, target=value)
+
+    async def _amove_relative(self, value: float):
+        # check if we're not referenced
+        if isinstance(await self.aget_state(), NotReferenced):
+            msg = "CONEX device needs to be homed."
+            self.logger.warn(msg)
+            click.secho(msg, bg="red", fg="black")
+            return None
+        await self._await_ready()
+        await self.asend_command(f"PR{value}")
+        target = float(await self.aask_command(self._target_command()))
+        return await self._await_motion(Moving, target=target)
 
     def get_stage_identifier(self) -> str:
         return self.ask_command("ID?")
@@ -120,14 +336,56 @@ class CONEXDevice(MotionDevice):
         return float(self.ask_command("SL?"))
 
     def lower_limit(self, value: float):
+        self._limits = None
         self.send_command(f"SL{value}")
 
     def get_upper_limit(self) -> float:
         return float(self.ask_command("SR?"))
 
     def set_upper_limit(self, value: float):
+        self._limits = None
         self.send_command(f"SR{value}")
 
+    def _query_kinematics(self):
+        velocity, acceleration = self.ask_commands("VA?", "AC?")
+        return float(velocity), float(acceleration)
+
+    def _limit_commands(self) -> tuple[str, str]:
+        return "SL?", "SR?"
+
+    def _travel_limits(self) -> tuple[float, float]:
+        if self._limits is None:
+            lower, upper = self.ask_commands(*self._limit_commands())
+            self._limits = float(lower), float(upper)
+        return self._limits
+
+    def _plan_absolute(self, value: float, position: float | None = None) -> float:
+        """
+        Pick the raw target for an absolute move to `value` from the raw `position`, which is only
+        read from the stage if it is not known.
+
+        For rotation stages (`PERIOD` set) this is the angle equivalent to `value` modulo the period
+        which is closest to the current position while inside the travel limits, so e.g. a move from
+        359 to 1 deg travels 2 deg instead of a full turn. The stage then moves there directly with
+        `PA`, which takes the same path as the equivalent relative move without accumulating error.
+        Linear stages move to `value`.
+        """
+        if not self.PERIOD:
+            return value
+        lower, upper = self._travel_limits()
+        wrapped = value % self.PERIOD
+        k_min = math.ceil((lower - wrapped) / self.PERIOD)
+        k_max = math.floor((upper - wrapped) / self.PERIOD)
+        if k_min > k_max:
+            # no equivalent angle within the limits, let the controller reject the move
+            return value
+        # the distance is convex in the number of turns, so clipping the unconstrained optimum works
+        if position is None:
+            position = self._get_position()
+        k = round((position - wrapped) / self.PERIOD)
+        k = min(max(k, k_min), k_max)
+        return wrapped + k * self.PERIOD
+
     def get_encoder_increment(self) -> float:
         return float(self.ask_command("SU?"))
 
@@ -169,8 +427,7 @@ class CONEXDevice(MotionDevice):
 
     def _home(self):
         self.send_command("OR")
-        while self.is_homing():
-            self.update_keys()
+        return self._wait_for_motion(Homing)
 
     def _move_absolute(self, value: float):
         # check if we're not referenced
@@ -180,13 +437,13 @@ class CONEXDevice(MotionDevice):
             click.secho(msg, bg="red", fg="black")
             return
         # wait until we're ready to move
-        while not self.is_ready():
-            pass
+        self._wait_until_ready()
+        # the position `move_absolute` has just read, or the snapshot it used
+        value = self._plan_absolute(value, self._known_raw_position())
         # send move command
         self.send_command(f"PA{value}")
         # if blocking, loop while moving
-        while self.is_moving():
-            self.update_keys()
+        return self._wait_for_motion(Moving, target=value)
 
     def _move_relative(self, value: float):
         # check if we're not referenced
@@ -196,13 +453,11 @@ class CONEXDevice(MotionDevice):
             click.secho(msg, bg="red", fg="black")
             return
             # wait until we're ready to move
-        while not self.is_ready():
-            continue
+        self._wait_until_ready()
         # send move command
         self.send_command(f"PR{value}")
         # if blocking, loop while moving
-        while self.is_moving():
-            self.update_keys()
+        return self._wait_for_motion(Moving, target=self._get_target_position())
 
     def reset(self):
         self.logger.debug("RESET")
@@ -212,15 +467,18 @@ class CONEXDevice(MotionDevice):
         self.logger.debug("RESET ADDRESS address=%s", value)
         self.send_command(f"RS{value}")
 
+    def _target_command(self) -> str:
+        return "TH?"
+
     def _get_target_position(self) -> float:
-        return float(self.ask_command("TH?"))
+        return float(self.ask_command(self._target_command()))
 
     def _get_position(self) -> float:
-        return float(self.ask_command("TP"))
+        return float(self.ask_command(self._position_command()))
 
     def stop(self):
         self.logger.debug("STOP")
-        self.send_command("ST")
+        self.send_command("ST", priority=PortScheduler.HIGH)
         self.update_keys()
 
 
@@ -236,16 +494,28 @@ class ConexAGAPButOnlyOneAxis(CONEXDevice):
 
         super().__init__(device_address, delay, **kwargs)
 
+    def _position_command(self) -> str:
+        return f"TP{self.axis}"
+
+    def _limit_commands(self) -> tuple[str, str]:
+        return f"SL{self.axis}?", f"SR{self.axis}?"
+
+    def _query_kinematics(self):
+        # open-loop piezo steps, the move times are learned from the moves instead
+        return None, None
+
     def get_lower_limit(self) -> float:
         return float(self.ask_command(f"SL{self.axis}?"))
 
     def lower_limit(self, value: float):
+        self._limits = None
         self.send_command(f"SL{self.axis}{value}")
 
     def get_upper_limit(self) -> float:
         return float(self.ask_command(f"SR{self.axis}?"))
 
     def set_upper_limit(self, value: float):
+        self._limits = None
         self.send_command(f"SR{self.axis}{value}")
 
     def _move_absolute(self, value: float):
@@ -256,13 +526,13 @@ class ConexAGAPButOnlyOneAxis(CONEXDevice):
             click.secho(msg, bg="red", fg="black")
             return
         # wait until we're ready to move
-        while not self.is_ready():
-            pass
+        self._wait_until_ready()
+        # the position `move_absolute` has just read, or the snapshot it used
+        value = self._plan_absolute(value, self._known_raw_position())
         # send move command
         self.send_command(f"PA{self.axis}{value}")
         # if blocking, loop while moving
-        while self.is_moving():
-            self.update_keys()
+        return self._wait_for_motion(Moving, target=value)
 
     def _move_relative(self, value: float):
         # check if we're not referenced
@@ -272,20 +542,48 @@ class ConexAGAPButOnlyOneAxis(CONEXDevice):
             click.secho(msg, bg="red", fg="black")
             return
             # wait until we're ready to move
-        while not self.is_ready():
-            continue
+        self._wait_until_ready()
         # send move command
         self.send_command(f"PR{self.axis}{value}")
         # if blocking, loop while moving
-        while self.is_moving():
-            self.update_keys()
+        return self._wait_for_motion(Moving, target=self._get_target_position())
+
+    async def _amove_absolute(self, value: float):
+        # check if we're enabled
+        if isinstance(await self.aget_state(), Disable):
+            msg = "CONEX AGAP device is not enabled."
+            self.logger.warn(msg)
+            click.secho(msg, bg="red", fg="black")
+            return None
+        await self._await_ready()
+        position = self._known_raw_position()
+        if self.PERIOD:
+            # so the plan never queries the stage synchronously
+            await self._atravel_limits()
+            if position is None:
+                position = await self._aget_position()
+        value = self._plan_absolute(value, position)
+        await self.asend_command(f"PA{self.axis}{value}")
+        return await self._await_motion(Moving, target=value)
+
+    async def _amove_relative(self, value: float):
+        # check if we're enabled
+        if isinstance(await self.aget_state(), Disable):
+            msg = "CONEX AGAP device is not enabled."
+            self.logger.warn(msg)
+            click.secho(msg, bg="red", fg="black")
+            return None
+        await self._await_ready()
+        await self.asend_command(f"PR{self.axis}{value}")
+        target = float(await self.aask_command(self._target_command()))
+        return await self._await_motion(Moving, target=target)
 
     def stop(self):
-        self.send_command(f"ST{self.axis}")
+        self.send_command(f"ST{self.axis}", priority=PortScheduler.HIGH)
         self.update_keys()
 
-    def _get_target_position(self) -> float:
-        return float(self.ask_command(f"TH{self.axis}"))
+    def _target_command(self) -> str:
+        return f"TH{self.axis}"
 
-    def _get_position(self) -> float:
-        return float(self.ask_command(f"TP{self.axis}"))
+    def _get_target_position(self) -> float:
+        return float(self.ask_command(self._target_command()))
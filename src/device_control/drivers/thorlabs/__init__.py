@@ -1,6 +1,20 @@
-from .elliptec import ThorlabsElliptec
-from .filterwheel import ThorlabsWheel
-from .flipmount import ThorlabsFlipMount
-from .tempcontroller import ThorlabsTC
+from typing import TYPE_CHECKING
+
+from device_control.lazy import lazy_exports
+
+# submodules are only imported when one of their classes is first used
+_EXPORTS = {
+    "ThorlabsWheel": ".filterwheel",
+    "ThorlabsFlipMount": ".flipmount",
+    "ThorlabsTC": ".tempcontroller",
+    "ThorlabsElliptec": ".elliptec",
+}
 
 __all__ = ["ThorlabsWheel", "ThorlabsFlipMount", "ThorlabsTC", "ThorlabsElliptec"]
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .elliptec import ThorlabsElliptec
+    from .filterwheel import ThorlabsWheel
+    from .flipmount import ThorlabsFlipMount
+    from .tempcontroller import ThorlabsTC
@@ -1,8 +1,10 @@
 import time
 
-import elliptec
-
 from device_control.base import ConfigurableDevice
+from device_control.lazy import lazy_import
+from device_control.poller import snapshot_status
+
+elliptec = lazy_import("elliptec")
 
 """
 Please refer to this github repo for the detailed information about the Elliptec package:
@@ -59,6 +61,7 @@ class ThorlabsElliptec(ConfigurableDevice):
         self.logger.debug("MOVING to=%s unit=%s", position, self.unit)
         self.device.set_angle(position - self.offset)
         time.sleep(1)
+        self.invalidate_status()
         self.update_keys()
 
     # @autoretry
@@ -71,6 +74,7 @@ class ThorlabsElliptec(ConfigurableDevice):
     def move_relative(self, value):
         self.logger.debug("MOVING relative=%s unit=%s", value, self.unit)
         self.device.shift_angle(value)
+        self.invalidate_status()
         result = self.device.get_angle() + self.offset
         self.update_keys(result)
         return result
@@ -78,6 +82,7 @@ class ThorlabsElliptec(ConfigurableDevice):
     def home(self):
         self.logger.debug("HOMING")
         self.device.home()
+        self.invalidate_status()
         self.get_position()
 
     def move_configuration(self, idx_or_name, **kwargs):
@@ -108,6 +113,7 @@ class ThorlabsElliptec(ConfigurableDevice):
                 return row["idx"], row["name"]
         return None, "Unknown"
 
+    @snapshot_status
     def get_status(self):
         posn = self.get_position()
         idx, config = self.get_configuration(posn)
@@ -1,4 +1,5 @@
 from device_control.base import MotionDevice
+from device_control.poller import snapshot_status
 
 
 class ThorlabsWheel(MotionDevice):
@@ -20,7 +21,8 @@ class ThorlabsWheel(MotionDevice):
     # @autoretry
     def ask_command(self, cmd: str):
         self.logger.debug("sending command %s", cmd)
-        with self.serial as serial:
+
+        def ask(serial):
             serial.write(f"{cmd}\r".encode())
             cmd_resp = serial.read_until(b"\r")
             self.logger.debug("received %s", cmd_resp)
@@ -28,6 +30,9 @@ class ThorlabsWheel(MotionDevice):
             resp = serial.read_until(b"\r")
             self.logger.debug("response %s", resp)
             serial.read_until(b"> ")
+            return resp
+
+        resp = self.serial.transaction(ask, retry=True)
         value = resp.strip().decode()
         self.logger.debug("parsed %s", value)
         return value
@@ -41,6 +46,7 @@ class ThorlabsWheel(MotionDevice):
             raise ValueError(msg)
         self.send_command(f"pos={value}")
 
+    @snapshot_status
     def get_status(self):
         posn = self.get_position()
         idx, config = self.get_configuration(posn)
@@ -1,6 +1,7 @@
 import time
 
 from device_control.base import ConfigurableDevice
+from device_control.poller import snapshot_status
 
 # Raw byte commands for "MGMSG_MOT_MOVE_JOG"
 COMMANDS = {
@@ -45,16 +46,20 @@ class ThorlabsFlipMount(ConfigurableDevice):
             serial.write(cmd)
             # we know flip is finished after collecting bytes
             serial.read(20)
+        self.invalidate_status()
         self.update_keys()
 
     # @autoretry
     def get_position(self):
         cmd = COMMANDS["status"]
         self.logger.debug("sending command %s", cmd)
-        with self.serial as serial:
+
+        def ask(serial):
             serial.write(cmd)
             time.sleep(0.1)
-            response = serial.read(12)
+            return serial.read(12)
+
+        response = self.serial.transaction(ask, retry=True)
         self.logger.debug("received %s", response)
         if response == STATUSES["down"]:
             result = "down"
@@ -88,6 +93,7 @@ class ThorlabsFlipMount(ConfigurableDevice):
                 return row["idx"], row["name"]
         return None, "Unknown"
 
+    @snapshot_status
     def get_status(self):
         posn = self.get_position()
         idx, config = self.get_configuration(posn)
@@ -1,4 +1,5 @@
 from device_control.base import ConfigurableDevice
+from device_control.poller import snapshot_status
 
 
 def parse_status(bytevalues):
@@ -36,7 +37,8 @@ class ThorlabsTC(ConfigurableDevice):
 
     def ask_command(self, cmd: str):
         self.logger.debug("sending command %s", cmd)
-        with self.serial as serial:
+
+        def ask(serial):
             serial.write(f"{cmd}\r".encode())
             # time.sleep(0.5)
             cmd_resp = serial.read_until(b"\r")
@@ -45,6 +47,9 @@ class ThorlabsTC(ConfigurableDevice):
             resp = serial.read_until(b"\r")
             self.logger.debug("response %s", resp)
             serial.read_until(b"> ")
+            return resp
+
+        resp = self.serial.transaction(ask, retry=True)
         value = resp.strip().decode()
         self.logger.debug("parsed %s", value)
         return value
@@ -55,6 +60,7 @@ class ThorlabsTC(ConfigurableDevice):
 
     def set_target(self, value: float):
         self.send_command(f"tset={value:.01f}")
+        self.invalidate_status()
 
     def get_temp(self):
         result = self.ask_command("tact?")
@@ -83,12 +89,15 @@ class ThorlabsTC(ConfigurableDevice):
         status = self.status()
         if not status["enabled"]:
             self.send_command("ens")
+        self.invalidate_status()
 
     def disable(self):
         status = self.status()
         if status["enabled"]:
             self.send_command("ens")
+        self.invalidate_status()
 
+    @snapshot_status
     def get_status(self):
         stat_dict = self.status()
         enabled_str = "Enabled" if stat_dict["enabled"] else "Disabled"
@@ -1,97 +1,232 @@
 import fcntl
+import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-
-from zaber_motion import Library, Units
-from zaber_motion.binary import BinarySettings, CommandCode, Connection, Device
+from typing import TYPE_CHECKING
 
 from device_control.base import MotionDevice
+from device_control.scheduler import get_scheduler
+
+if TYPE_CHECKING:
+    from zaber_motion.binary import Device
 
-__all__ = ["ZaberDevice"]
+__all__ = ["ZaberDevice", "ZaberPort"]
 
+logger = logging.getLogger(__name__)
+
+# names of the `zaber_motion.Units` members
 ZABER_UNITS = {
-    "step": Units.NATIVE,
-    "mm": Units.LENGTH_MILLIMETRES,
-    "cm": Units.LENGTH_CENTIMETRES,
-    "um": Units.LENGTH_MICROMETRES,
-    "in": Units.LENGTH_INCHES,
-    "deg": Units.ANGLE_DEGREES,
-    "rad": Units.ANGLE_RADIANS,
+    "step": "NATIVE",
+    "mm": "LENGTH_MILLIMETRES",
+    "cm": "LENGTH_CENTIMETRES",
+    "um": "LENGTH_MICROMETRES",
+    "in": "LENGTH_INCHES",
+    "deg": "ANGLE_DEGREES",
+    "rad": "ANGLE_RADIANS",
+}
+
+# names of the `zaber_motion.Units` members for the speed and acceleration of each unit
+ZABER_KINEMATIC_UNITS = {
+    "mm": ("VELOCITY_MILLIMETRES_PER_SECOND", "ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED"),
+    "cm": ("VELOCITY_CENTIMETRES_PER_SECOND", "ACCELERATION_CENTIMETRES_PER_SECOND_SQUARED"),
+    "um": ("VELOCITY_MICROMETRES_PER_SECOND", "ACCELERATION_MICROMETRES_PER_SECOND_SQUARED"),
+    "in": ("VELOCITY_INCHES_PER_SECOND", "ACCELERATION_INCHES_PER_SECOND_SQUARED"),
+    "deg": (
+        "ANGULAR_VELOCITY_DEGREES_PER_SECOND",
+        "ANGULAR_ACCELERATION_DEGREES_PER_SECOND_SQUARED",
+    ),
+    "rad": (
+        "ANGULAR_VELOCITY_RADIANS_PER_SECOND",
+        "ANGULAR_ACCELERATION_RADIANS_PER_SECOND_SQUARED",
+    ),
 }
 
-Library.enable_device_db_store()
+_LIBRARY_READY = False
+
+
+def _init_library():
+    # zaber_motion is slow to import, so it is only loaded once a connection is opened
+    global _LIBRARY_READY
+    if not _LIBRARY_READY:
+        from zaber_motion import Library
+
+        Library.enable_device_db_store()
+        _LIBRARY_READY = True
+
+
+def _reconnect_errors() -> tuple:
+    from zaber_motion import (
+        ConnectionClosedException,
+        ConnectionFailedException,
+        RequestTimeoutException,
+    )
+
+    return (ConnectionClosedException, ConnectionFailedException, RequestTimeoutException)
+
+
+class ZaberPort:
+    """
+    Long-lived `zaber_motion` connection shared by every `ZaberDevice` on one chain.
+
+    Identified `Device` handles are memoized per device number. The `/tmp` flock for the port is
+    held while any transaction from this process is in flight, so other processes are still
+    excluded while devices in this process share the connection (zaber_motion matches replies
+    to devices, so a `stop` can be sent while another device is moving).
+    """
+
+    def __init__(self, port: str):
+        self.port = port
+        self.connection = None
+        self._devices: dict[int, Device] = {}
+        self._lock = threading.Lock()
+        self._holders = 0
+        flockpath = Path("/tmp") / port.replace("/", "_")
+        flockpath.touch()
+        self._lockfile = flockpath.open()  # SIM115
+
+    def get_device(self, device_number: int) -> "Device":
+        with self._lock:
+            if self.connection is None:
+                from zaber_motion.binary import Connection
+
+                _init_library()
+                logger.debug("opening zaber connection port=%s", self.port)
+                self.connection = Connection.open_serial_port(self.port)
+            if device_number not in self._devices:
+                device = self.connection.get_device(device_number)
+                device.identify()
+                self._devices[device_number] = device
+            return self._devices[device_number]
+
+    def reconnect(self):
+        """Drop the connection and identified devices, they are recreated on next use"""
+        with self._lock:
+            if self.connection is not None:
+                try:
+                    self.connection.close()
+                except Exception:
+                    logger.exception("error closing zaber connection port=%s", self.port)
+            self.connection = None
+            self._devices.clear()
+
+    @contextmanager
+    def transaction(self, device_number: int):
+        with self._lock:
+            if self._holders == 0:
+                fcntl.flock(self._lockfile.fileno(), fcntl.LOCK_EX)
+            self._holders += 1
+        try:
+            yield self.get_device(device_number)
+        finally:
+            with self._lock:
+                self._holders -= 1
+                if self._holders == 0:
+                    fcntl.flock(self._lockfile.fileno(), fcntl.LOCK_UN)
+
+
+_ZABER_PORTS: dict[str, ZaberPort] = {}
+_ZABER_PORTS_LOCK = threading.Lock()
+
+
+def get_zaber_port(port: str) -> ZaberPort:
+    with _ZABER_PORTS_LOCK:
+        if port not in _ZABER_PORTS:
+            _ZABER_PORTS[port] = ZaberPort(port)
+        return _ZABER_PORTS[port]
 
 
 class ZaberDevice(MotionDevice):
     def __init__(self, delay=0.1, **kwargs):
-        self.device_number = kwargs["serial_kwargs"].pop("device_number")
+        # zaber_motion opens the port itself, so don't take a pooled serial port for it
+        serial_kwargs = kwargs.pop("serial_kwargs")
+        self.device_number = serial_kwargs.pop("device_number")
         super().__init__(**kwargs)
-        del self.serial
+        self.serial_kwargs = {"timeout": 0.5, **serial_kwargs}
         self.serial = None
-        self.zab_unit = ZABER_UNITS[self.unit]
-        self.delay = delay
+        self.scheduler = get_scheduler(self.serial_kwargs["port"])
+        self.zaber_port = get_zaber_port(self.serial_kwargs["port"])
+        from zaber_motion import Units
 
-        self.flockpath = None
+        self.zab_unit = getattr(Units, ZABER_UNITS[self.unit])
+        self.delay = delay
 
     def get_serial_kwargs(self):
         return {**self.serial_kwargs, "device_number": self.device_number}
 
-    def __enter__(self) -> Device:
-        if self.flockpath is None:
-            self.flockpath = Path("/tmp") / self.serial_kwargs["port"].replace("/", "_")
-            self.flockpath.touch()
-
-        self._lockfile = self.flockpath.open()  # SIM115
-        fcntl.flock(self._lockfile.fileno(), fcntl.LOCK_EX)
-
-        self.connection = Connection.open_serial_port(self.serial_kwargs["port"])
-        device = self.connection.get_device(self.device_number)
-        device.identify()
-        return device
-
-    def __exit__(self, *args):
-        self.connection.close()
-        fcntl.flock(self._lockfile.fileno(), fcntl.LOCK_UN)
-        self._lockfile.close()
+    def _run(self, func, retry=True):
+        """Run `func(device)` on the shared connection, reconnecting once if it has dropped"""
+        try:
+            with self.zaber_port.transaction(self.device_number) as device:
+                return func(device)
+        except _reconnect_errors():
+            if not retry:
+                raise
+            self.logger.warning("zaber connection error, reconnecting", exc_info=True)
+            self.zaber_port.reconnect()
+            return self._run(func, retry=False)
+
+    def _query(self, func):
+        """Short query, queued on the port's scheduler so it interleaves fairly with other devices"""
+        return self.scheduler.call(self._run, func, priority=self.priority)
+
+    def _call(self, method: str, *args):
+        return self._query(lambda device: getattr(device, method)(*args))
 
     def _get_position(self):
-        with self as dev:
-            return dev.get_position(self.zab_unit)
+        return self._call("get_position", self.zab_unit)
 
     def _get_target_position(self):
         return self._position
 
     def send_command(self, index: int, values=0):
+        from zaber_motion.binary import CommandCode
+
         self.logger.debug("sending command index=%d value=%s", index, values)
-        with self as device:
-            message = device.generic_command(CommandCode(index), values)
+        message = self._call("generic_command", CommandCode(index), values)
         return message.data
 
     def get_setting(self, index: int):
-        with self as device:
-            retval = device.settings.get(BinarySettings(index))
-        return retval
+        from zaber_motion.binary import BinarySettings
+
+        return self._query(lambda device: device.settings.get(BinarySettings(index)))
+
+    def _query_kinematics(self):
+        if self.unit not in ZABER_KINEMATIC_UNITS:
+            # native speed units aren't steps per second
+            return None, None
+        from zaber_motion import Units
+        from zaber_motion.binary import BinarySettings
+
+        speed_name, accel_name = ZABER_KINEMATIC_UNITS[self.unit]
+        speed_unit, accel_unit = getattr(Units, speed_name), getattr(Units, accel_name)
+
+        def query(device):
+            return (
+                device.settings.get(BinarySettings.TARGET_SPEED, speed_unit),
+                device.settings.get(BinarySettings.ACCELERATION, accel_unit),
+            )
+
+        return self._query(query)
 
+    # motion commands wait on the reply from the shared connection in the calling thread, so they
+    # don't hold up the scheduler for the rest of the chain. The device replies with the position it
+    # stopped at, which is returned instead of querying it again.
     def _move_absolute(self, value):
-        with self as device:
-            posn = device.move_absolute(value, self.zab_unit)
-            self.update_keys(posn)
+        return self._run(lambda device: device.move_absolute(value, self.zab_unit))
 
     def _move_relative(self, value):
-        with self as device:
-            posn = device.move_relative(value, self.zab_unit)
-            self.update_keys(posn)
+        # don't resend a relative move after a reconnect
+        return self._run(lambda device: device.move_relative(value, self.zab_unit), retry=False)
 
     def reset(self):
         self.logger.debug("RESET")
         self.send_command(0)
 
     def _home(self):
-        with self as device:
-            posn = device.home()
-            self.update_keys(posn)
+        return self._run(lambda device: device.home())
 
     def stop(self):
         self.logger.debug("STOP")
-        with self as device:
-            device.stop()
+        self._run(lambda device: device.stop())
         self.update_keys()
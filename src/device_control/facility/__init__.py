@@ -1,4 +1,13 @@
-from .image_rotator import ImageRotator
-from .wpu import WPU
+from typing import TYPE_CHECKING
+
+from device_control.lazy import lazy_exports
+
+# submodules are only imported when one of their classes is first used
+_EXPORTS = {"ImageRotator": ".image_rotator", "WPU": ".wpu"}
 
 __all__ = ["ImageRotator", "WPU"]
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .image_rotator import ImageRotator
+    from .wpu import WPU
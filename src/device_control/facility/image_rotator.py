@@ -1,16 +1,20 @@
 import logging
 import re
+import threading
+import time
 
 import click
 import rich
 from scxconf.pyrokeys import VCAM1, VCAM2
-from swmain.network.pyroclient import connect
-from swmain.redis import update_keys
 
 from device_control.base import SSHDevice
+from device_control.keywords import update_keys
+from device_control.vampires.cameras import push_camera_keywords
 
 logger = logging.getLogger(__name__)
 
+STATUS_SEP = re.compile(r":\s+")
+
 
 class ImageRotator(SSHDevice):
     CONF = "facility/conf_image_rotator.toml"
@@ -19,44 +23,95 @@ class ImageRotator(SSHDevice):
 
     CAMS_TO_CHECK = (VCAM1, VCAM2)
 
-    def get_status(self):
+    def __init__(self, *args, cache_ttl=1.0, poll_interval=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_ttl = cache_ttl
+        # (monotonic time, status), replaced in a single assignment so readers never see the time
+        # of one refresh with the status of another. Writers also hold the lock.
+        self._cached = (-float("inf"), None)
+        self._status_lock = threading.Lock()
+        self._poller = None
+        self._stop_polling = threading.Event()
+        if poll_interval is not None:
+            self.start_polling(poll_interval)
+
+    def refresh_status(self):
+        """Query the rotator over SSH, update the cache and push the keywords"""
         status = self.ask_command("imr st")
-        lines = status.splitlines()
         status_dict = {}
-        for line in lines:
-            key, value = re.split(":\s+", line)
+        for line in status.splitlines():
+            key, value = STATUS_SEP.split(line, maxsplit=1)
             try:
                 val = float(value)
             except ValueError:
                 val = value
             status_dict[key] = val
+        with self._status_lock:
+            self._cached = (time.monotonic(), status_dict)
         self.update_keys(status_dict)
         return status_dict
 
-    def get_position(self):
-        status = self.get_status()
+    def get_cached_status(self):
+        """Return the last status without touching the network (`None` if never fetched)"""
+        return self._cached[1]
+
+    def get_status(self, max_age=None):
+        """Return the status, refreshing it if the cache is older than `max_age` (default TTL)"""
+        if max_age is None:
+            max_age = self.cache_ttl
+        status_time, status = self._cached
+        if time.monotonic() - status_time > max_age:
+            return self.refresh_status()
+        return status
+
+    def get_position(self, max_age=None):
+        status = self.get_status(max_age=max_age)
         return status["stage angle"]
 
+    def start_polling(self, interval: float):
+        """Keep the status (and D_IMRANG/D_IMRPAD) fresh from a background thread"""
+        if self._poller is not None:
+            return
+        self._stop_polling.clear()
+        self._poller = threading.Thread(
+            target=self._poll, args=(interval,), name="imr-poller", daemon=True
+        )
+        self._poller.start()
+
+    def stop_polling(self):
+        self._stop_polling.set()
+        self._poller = None
+
+    def _poll(self, interval):
+        while not self._stop_polling.is_set():
+            try:
+                self.refresh_status()
+            except Exception:
+                logger.exception("Unable to refresh image rotator status")
+            self._stop_polling.wait(interval)
+
+    def invalidate_status(self):
+        with self._status_lock:
+            self._cached = (-float("inf"), self._cached[1])
+
     def move_absolute(self, value):
         self.send_command(f"imr ma {value}")
+        self.invalidate_status()
 
     def move_relative(self, value: float):
         self.send_command(f"imr mr {value}")
+        self.invalidate_status()
 
     def update_keys(self, status=None):
         if status is None:
-            status = self.get_status()
+            # refresh_status pushes the keywords itself
+            self.refresh_status()
+            return
         # normalize status dict
         hdr_dict = {self.KEY_MAP[k]: v for k, v in status.items() if k in self.KEY_MAP}
         update_keys(**hdr_dict)
         ## update cams
-        for cam in self.CAMS_TO_CHECK:
-            try:
-                cam_pyro = connect(cam)
-                for key, value in hdr_dict.items():
-                    cam_pyro.set_keyword(key, value)
-            except Exception:
-                logger.exception(f"Unable to push keywords to cam {cam}")
+        push_camera_keywords(hdr_dict, cams=self.CAMS_TO_CHECK)
 
 
 @click.group("imr", help="Simple interface for interacting with the image rotator.")
@@ -75,7 +130,7 @@ def posn(obj):
 @main.command("status")
 @click.pass_obj
 def status(obj):
-    rich.print(obj["imr"].get_status())
+    rich.print(obj["imr"].refresh_status())
 
 
 if __name__ == "__main__":
@@ -1,55 +1,119 @@
+import re
+import threading
+import time
+
 import click
-from paramiko import AutoAddPolicy, SSHClient
-from swmain.redis import update_keys
 
-__all__ = ["WPU"]
+from device_control import logging_config
+from device_control.base import SSHShell
+from device_control.keywords import update_keys
+from device_control.lazy import lazy_import
+
+# only needed once a client connects, not to print the usage
+paramiko = lazy_import("paramiko")
+
+__all__ = ["WPU", "WPUStatus"]
+
+
+# every status reply is a list of "<key> <value>" pairs
+STATUS_RE = re.compile(r"(?<!\S)(position|target|mode|pol_angle)\s+(\S+)")
+
+
+class WPUStatus:
+    """Status of one WPU stage; also supports `status["key"]` lookups"""
+
+    __slots__ = ("position", "target", "mode", "pol_angle")
+
+    def __init__(self, position=-1, target=-1, mode="UNKNOWN", pol_angle=-1):
+        self.position = position
+        self.target = target
+        self.mode = mode
+        self.pol_angle = pol_angle
+
+    @classmethod
+    def parse(__cls__, reply: str):
+        status = __cls__()
+        seen = set()
+        for key, value in STATUS_RE.findall(reply):
+            if key in seen:
+                continue
+            seen.add(key)
+            setattr(status, key, value if key == "mode" else float(value))
+        return status
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()})"
+
+
+class WPUShell(SSHShell):
+    """
+    Persistent remote shell used to talk to the WPU daemon.
+
+    Every query is piped to the daemon with `nc` through one long-lived shell channel, so a query
+    costs neither SSH channel setup nor a new exec, and several queries cost one round trip.
+    """
+
+    def __init__(self, client: "paramiko.SSHClient", port: int = 18902):
+        super().__init__(client)
+        self.port = port
+
+    def _script(self, commands: list[str], concurrent: bool) -> str:
+        nc_commands = [f"echo {command} | nc localhost {self.port}" for command in commands]
+        return super()._script(nc_commands, concurrent)
+
+
+def _connect_client() -> "paramiko.SSHClient":
+    logging_config.configure()
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.load_system_host_keys()
+    client.connect(
+        hostname="garde.sum.naoj.org",
+        username="ircs",
+        disabled_algorithms={"pubkeys": ["rsa-sha2-256", "rsa-sha2-512"]},
+    )
+    return client
 
 
 class WPUDevice:
-    def __init__(self, client: SSHClient = None) -> None:
+    NAME = None
+
+    def __init__(self, client: "paramiko.SSHClient" = None, shell: WPUShell = None) -> None:
         if client is None:
-            self.client = SSHClient()
-            self.client.set_missing_host_key_policy(AutoAddPolicy())
-            self.client.connect(
-                hostname="garde.sum.naoj.org",
-                username="ircs",
-                disabled_algorithms={"pubkeys": ["rsa-sha2-256", "rsa-sha2-512"]},
-            )
+            self.client = _connect_client()
         else:
             self.client = client
 
         self.port = 18902
+        if shell is None:
+            shell = WPUShell(self.client, self.port)
+        self.shell = shell
 
     def send_command(self, command: str):
-        cmd = f"echo {command} | nc localhost {self.port}"
-        stdin, stdout, stderr = self.client.exec_command(cmd)
+        # fire and forget like `SSHDevice.send_command`, so a move neither waits for the daemon's
+        # reply nor holds up status queries on the shared shell
+        self.client.exec_command(f"echo {command} | nc localhost {self.port}")
 
     def ask_command(self, command: str):
-        cmd = f"echo {command} | nc localhost {self.port}"
-        stdin, stdout, stderr = self.client.exec_command(cmd)
-        return stdout.read().decode()
+        return self.shell.ask([command])[0]
+
+    def get_status(self):
+        return self.parse_status(self.ask_command(f"{self.NAME} status"))
+
+    def parse_status(self, status: str) -> WPUStatus:
+        result = WPUStatus.parse(status)
+        self.update_keys(result)
+        return result
 
 
 class WPU_SPP(WPUDevice):
-    def get_status(self):
-        status = self.ask_command("spp status")
-        status_dict = {"position": -1, "target": -1, "mode": "UNKNOWN", "pol_angle": -1}
-        if len(status) > 0:
-            tokens = status.split()
-            pos_idx = tokens.index("position") + 1
-            targ_idx = tokens.index("target") + 1
-            mode_idx = tokens.index("mode") + 1
-            polang_idx = tokens.index("pol_angle") + 1
-            status_dict.update(
-                {
-                    "position": float(tokens[pos_idx]),
-                    "target": float(tokens[targ_idx]),
-                    "mode": tokens[mode_idx],
-                    "pol_angle": float(tokens[polang_idx]),
-                }
-            )
-        self.update_keys(status_dict)
-        return status_dict
+    NAME = "spp"
 
     def update_keys(self, status=None):
         # TODO
@@ -67,23 +131,7 @@ class WPU_SPP(WPUDevice):
 
 
 class WPU_SHW(WPUDevice):
-    def get_status(self):
-        status = self.ask_command("shw status")
-        status_dict = {"position": -1, "target": -1, "mode": "UNKNOWN"}
-        if len(status) > 0:
-            tokens = status.split()
-            pos_idx = tokens.index("position") + 1
-            targ_idx = tokens.index("target") + 1
-            mode_idx = tokens.index("mode") + 1
-            status_dict.update(
-                {
-                    "position": float(tokens[pos_idx]),
-                    "target": float(tokens[targ_idx]),
-                    "mode": tokens[mode_idx],
-                }
-            )
-        self.update_keys(status_dict)
-        return status_dict
+    NAME = "shw"
 
     def update_keys(self, status=None):
         pass
@@ -103,23 +151,7 @@ class WPU_SHW(WPUDevice):
 
 
 class WPU_SQW(WPUDevice):
-    def get_status(self):
-        status = self.ask_command("sqw status")
-        status_dict = {"position": -1, "target": -1, "mode": "UNKNOWN"}
-        if len(status) > 0:
-            tokens = status.split()
-            pos_idx = tokens.index("position") + 1
-            targ_idx = tokens.index("target") + 1
-            mode_idx = tokens.index("mode") + 1
-            status_dict.update(
-                {
-                    "position": float(tokens[pos_idx]),
-                    "target": float(tokens[targ_idx]),
-                    "mode": tokens[mode_idx],
-                }
-            )
-        self.update_keys(status_dict)
-        return status_dict
+    NAME = "sqw"
 
     def update_keys(self, status=None):
         pass
@@ -139,25 +171,7 @@ class WPU_SQW(WPUDevice):
 
 
 class WPU_HWP(WPUDevice):
-    def get_status(self):
-        status = self.ask_command("hwp status")
-        status_dict = {"position": -1, "target": -1, "mode": "UNKNOWN", "pol_angle": -1}
-        if len(status) > 0:
-            tokens = status.split()
-            pos_idx = tokens.index("position") + 1
-            targ_idx = tokens.index("target") + 1
-            mode_idx = tokens.index("mode") + 1
-            polang_idx = tokens.index("pol_angle") + 1
-            status_dict.update(
-                {
-                    "position": float(tokens[pos_idx]),
-                    "target": float(tokens[targ_idx]),
-                    "mode": tokens[mode_idx],
-                    "pol_angle": float(tokens[polang_idx]),
-                }
-            )
-        self.update_keys(status_dict)
-        return status_dict
+    NAME = "hwp"
 
     def update_keys(self, status=None):
         if status is None:
@@ -182,25 +196,7 @@ class WPU_HWP(WPUDevice):
 
 
 class WPU_QWP(WPUDevice):
-    def get_status(self):
-        status = self.ask_command("qwp status")
-        status_dict = {"position": -1, "target": -1, "mode": "UNKNOWN", "pol_angle": -1}
-        if len(status) > 0:
-            tokens = status.split()
-            pos_idx = tokens.index("position") + 1
-            targ_idx = tokens.index("target") + 1
-            mode_idx = tokens.index("mode") + 1
-            polang_idx = tokens.index("pol_angle") + 1
-            status_dict.update(
-                {
-                    "position": float(tokens[pos_idx]),
-                    "target": float(tokens[targ_idx]),
-                    "mode": tokens[mode_idx],
-                    "pol_angle": float(tokens[polang_idx]),
-                }
-            )
-        self.update_keys(status_dict)
-        return status_dict
+    NAME = "qwp"
 
     def update_keys(self, status=None):
         if status is None:
@@ -225,32 +221,55 @@ class WPU_QWP(WPUDevice):
 
 
 class WPU:
-    def __init__(self, *args, **kwargs) -> None:
-        self.client = SSHClient()
-        self.client.set_missing_host_key_policy(AutoAddPolicy())
-        self.client.load_system_host_keys()
-        self.client.connect(
-            hostname="garde.sum.naoj.org",
-            username="ircs",
-            disabled_algorithms={"pubkeys": ["rsa-sha2-256", "rsa-sha2-512"]},
-        )
-        self.spp = WPU_SPP(client=self.client)
-        self.shw = WPU_SHW(client=self.client)
-        self.sqw = WPU_SQW(client=self.client)
-        self.hwp = WPU_HWP(client=self.client)
-        self.qwp = WPU_QWP(client=self.client)
+    STAGES = ("spp", "shw", "sqw", "hwp", "qwp")
+
+    def __init__(self, *args, cache_ttl=1.0, **kwargs) -> None:
+        self.client = _connect_client()
+        self.shell = WPUShell(self.client)
+        self.spp = WPU_SPP(client=self.client, shell=self.shell)
+        self.shw = WPU_SHW(client=self.client, shell=self.shell)
+        self.sqw = WPU_SQW(client=self.client, shell=self.shell)
+        self.hwp = WPU_HWP(client=self.client, shell=self.shell)
+        self.qwp = WPU_QWP(client=self.client, shell=self.shell)
+        self.cache_ttl = cache_ttl
+        self._cache = None
+        self._cache_time = -float("inf")
+        self._cache_lock = threading.Lock()
+
+    def get_status_all(self, max_age=None) -> dict[str, WPUStatus]:
+        """
+        Return the status of every WPU stage, keyed by stage name.
+
+        All five queries run concurrently over the shared SSH shell. The result is cached for
+        `cache_ttl` seconds (or `max_age`, if given) so that callers in the same observing sequence
+        share one fetch; concurrent callers wait for the fetch in progress instead of starting
+        another one.
+        """
+        if max_age is None:
+            max_age = self.cache_ttl
+        with self._cache_lock:
+            if time.monotonic() - self._cache_time > max_age:
+                devices = [getattr(self, name) for name in self.STAGES]
+                replies = self.shell.ask([f"{dev.NAME} status" for dev in devices], concurrent=True)
+                self._cache = {
+                    name: dev.parse_status(reply)
+                    for name, dev, reply in zip(self.STAGES, devices, replies, strict=True)
+                }
+                self._cache_time = time.monotonic()
+            return self._cache
 
     def get_status(self):
-        spp_status = self.spp.get_status()
-        shw_status = self.shw.get_status()
-        sqw_status = self.sqw.get_status()
-        hwp_status = self.hwp.get_status()
-        qwp_status = self.qwp.get_status()
-        status = f"""{'Polarizer':9s}: {spp_status['mode']:12s} {{ {spp_status['position']:4.01f} mm }}
-{'HWP stage':9s}: {shw_status['mode']:12s} {{ {shw_status['position']:4.01f} mm }}
-{'QWP stage':9s}: {sqw_status['mode']:12s} {{ {sqw_status['position']:4.01f} mm }}
-{'HWP':9s}: {hwp_status['mode']:12s} {{ pol={hwp_status['pol_angle']:6.02f}° wheel={hwp_status['position']:6.02f}° }}
-{'QWP':9s}: {qwp_status['mode']:12s} {{ pol={qwp_status['pol_angle']:6.02f}° wheel={qwp_status['position']:6.02f}° }}"""
+        statuses = self.get_status_all()
+        spp_status = statuses["spp"]
+        shw_status = statuses["shw"]
+        sqw_status = statuses["sqw"]
+        hwp_status = statuses["hwp"]
+        qwp_status = statuses["qwp"]
+        status = f"""{'Polarizer':9s}: {spp_status.mode:12s} {{ {spp_status.position:4.01f} mm }}
+{'HWP stage':9s}: {shw_status.mode:12s} {{ {shw_status.position:4.01f} mm }}
+{'QWP stage':9s}: {sqw_status.mode:12s} {{ {sqw_status.position:4.01f} mm }}
+{'HWP':9s}: {hwp_status.mode:12s} {{ pol={hwp_status.pol_angle:6.02f}° wheel={hwp_status.position:6.02f}° }}
+{'QWP':9s}: {qwp_status.mode:12s} {{ pol={qwp_status.pol_angle:6.02f}° wheel={qwp_status.position:6.02f}° }}"""
         return status
 
 
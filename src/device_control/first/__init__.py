@@ -1,7 +1,13 @@
-from .firstpl_injection import FIRSTPLInjection
-from .firstpl_wollaston import FIRSTPLWollaston
+from typing import TYPE_CHECKING
 
-__all__ = (
-    "FIRSTPLInjection",
-    "FIRSTPLWollaston",
-)
+from device_control.lazy import lazy_exports
+
+# submodules are only imported when one of their classes is first used
+_EXPORTS = {"FIRSTPLInjection": ".firstpl_injection", "FIRSTPLWollaston": ".firstpl_wollaston"}
+
+__all__ = ["FIRSTPLInjection", "FIRSTPLWollaston"]
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .firstpl_injection import FIRSTPLInjection
+    from .firstpl_wollaston import FIRSTPLWollaston
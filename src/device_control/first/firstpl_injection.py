@@ -3,8 +3,9 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
+from device_control.keywords import update_keys
 from device_control.multi_device import MultiDevice
 
 
@@ -23,10 +24,11 @@ class FIRSTPLInjection(MultiDevice):
         _, name = self.get_configuration(positions=positions)
         update_keys(U_MAX_FIRINJSK=name)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value']['x'], c['value']['y'], c['value']['f'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value']['x'], c['value']['y'], c['value']['f'])}"
+            for c in configurations
         )
         return f"""Usage:
     firstpl_inj [-h | --help]
@@ -60,17 +62,16 @@ Configurations:
 
 # setp 4. action
 def main():
-    firstpl_injection = FIRSTPLInjection.connect(os.getenv("WHICHCOMP") == "K")
-    __doc__ = firstpl_injection.help_message()
+    local = os.getenv("WHICHCOMP") == "K"
+    __doc__ = get_help(FIRSTPLInjection, local=local)
     args = docopt(__doc__, options_first=True)
-    posns = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif len(sys.argv) == 2 and args["status"]:
+    firstpl_injection = FIRSTPLInjection.connect(local=local)
+    if len(sys.argv) == 2 and args["status"]:
         posns, status = firstpl_injection.get_status()
         print(status)
-        firstpl_injection.update_keys(posns)
         return
     elif len(sys.argv) == 2 and args["home"]:
         firstpl_injection.home_all()
@@ -101,7 +102,6 @@ def main():
         firstpl_injection.stop(substage)
     elif args["reset"]:
         substage.reset()
-    firstpl_injection.update_keys(posns)
 
 
 if __name__ == "__main__":
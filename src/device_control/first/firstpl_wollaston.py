@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 # from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import CONEXDevice
+from device_control.keywords import update_keys
 
 
 class FIRSTPLWollaston(CONEXDevice):
@@ -17,10 +18,11 @@ class FIRSTPLWollaston(CONEXDevice):
         _, name = self.get_configuration(position=position)
         update_keys(X_FIRWOL=name.upper(), X_FIRWOF=position)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
             f"    {FIRSTPLWollaston.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            for c in configurations
         )
         return f"""Usage:
     firstpl_wollaston [-h | --help]
@@ -45,12 +47,13 @@ Configurations:
 
 # setp 4. action
 def main():
-    firstpl_wollaston = FIRSTPLWollaston.connect(os.getenv("WHICHCOMP") == "K")
-    __doc__ = firstpl_wollaston.help_message()
+    local = os.getenv("WHICHCOMP") == "K"
+    __doc__ = get_help(FIRSTPLWollaston, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
+        return
+    firstpl_wollaston = FIRSTPLWollaston.connect(local=local)
     if args["status"]:
         posn, status = firstpl_wollaston.get_status()
         print(status)
@@ -71,7 +74,6 @@ def main():
         firstpl_wollaston.reset()
     elif args["<configuration>"]:
         firstpl_wollaston.move_configuration(args["<configuration>"])
-    firstpl_wollaston.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -22,10 +22,11 @@ class GLINTSteeringX(MultiDevice):
         ...
         # update_keys(X_POLARP=posn)
 
-    def help_message(self) -> str:
+    @classmethod
+    def usage(cls, configurations) -> str:
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value']['u'], c['value']['v'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value']['u'], c['value']['v'])}"
+            for c in configurations
         )
         return f"""
 GLINT Conex AGAP control. X = 1 or 2 for either stage.
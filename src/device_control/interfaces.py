@@ -1,15 +1,17 @@
 import abc
+import asyncio
 from dataclasses import dataclass, field
 from numbers import Number
 from pathlib import Path
-from typing import Any, ClassVar, Literal, Optional
+from typing import Any, ClassVar, Literal
 
 import paramiko
 import serial
 import tomli
 from loguru import logger
-from swmain import redis
-from swmain.network.pyroclient import connect
+
+from device_control.keywords import update_keys
+from device_control.ports import AsyncSerialTransport
 
 
 @dataclass
@@ -22,8 +24,8 @@ class DeviceDriver(abc.ABC):
     def set_name(self, name: str):
         self.name = name
 
-    @abc.abstractmethod
     @classmethod
+    @abc.abstractmethod
     def from_dict(__cls__, config: dict[str, Any]):
         """Create this device from a dictionary"""
 
@@ -39,6 +41,7 @@ class SerialDriver(DeviceDriver):
 
     def __post_init__(self):
         self.serial = serial.Serial(self.address, **self.serial_kwargs)
+        self.transport = AsyncSerialTransport(self.serial)
 
     @classmethod
     def from_dict(__cls__, config: dict[str, Any]):
@@ -58,6 +61,28 @@ class SerialDriver(DeviceDriver):
     def ask(self, command: str):
         """Send a command with a reply to the serial device with appropriate logging and checking"""
 
+    def _format_command(self, command: str) -> bytes:
+        """Device-specific framing of `command`, as written to the port"""
+        raise NotImplementedError
+
+    def _parse_reply(self, command: str, reply: bytes):
+        """Device-specific decoding of the reply line to `command`"""
+        raise NotImplementedError
+
+    # async API - commands go through `self.transport`, so no thread is held while waiting on the
+    # device. The transport only serializes coroutines, don't mix it with `send`/`ask` on one port.
+    async def asend(self, command: str):
+        """Non-blocking variant of `send`"""
+        async with self.transport.lock:
+            await self.transport.write(self._format_command(command))
+
+    async def aask(self, command: str):
+        """Non-blocking variant of `ask`"""
+        (reply,) = await self.transport.transact(
+            self._format_command(command), timeout=self.serial.timeout
+        )
+        return self._parse_reply(command, reply)
+
 
 @dataclass
 class SSHDriver(DeviceDriver):
@@ -149,7 +174,64 @@ class MotionDriver(DeviceDriver, abc.ABC):
         self._stop()
         self.update_keys()
 
+    # async API - one event loop can drive several stages concurrently, e.g.
+    # `await asyncio.gather(stage1.amove_absolute(10), stage2.amove_absolute(2))`. Unless the driver
+    # overrides the async hooks below, each call still occupies a worker thread while it runs.
+    async def ahome(self):
+        """Home device without blocking the event loop and update keywords"""
+        pos = await self._ahome()
+        self.update_keys(pos)
+        return pos
+
+    async def amove_absolute(self, value, **kwargs):
+        """Move device to absolute position (including offsets) without blocking the event loop"""
+        pos = await self._amove_absolute(value - self.offset, **kwargs)
+        self.update_keys(pos)
+        return pos
+
+    async def amove_relative(self, value):
+        """Move device by relative value without blocking the event loop"""
+        pos = await self._amove_relative(value)
+        self.update_keys(pos)
+        return pos
+
+    async def wait_until_settled(self, poll_interval=0.05, timeout=None, start_timeout=0.5):
+        """
+        Wait until the device stops moving, polling every `poll_interval` seconds.
+
+        Controllers only report MOVING/HOMING a little after the move command, so the motion is
+        first waited for, for up to `start_timeout` seconds. A device that never starts moving (e.g.
+        it was already on target) counts as settled once that has passed.
+        """
+
+        async def poll():
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + start_timeout
+            while not await self._ais_moving():
+                if loop.time() >= deadline:
+                    return
+                await asyncio.sleep(poll_interval)
+            while await self._ais_moving():
+                await asyncio.sleep(poll_interval)
+
+        await asyncio.wait_for(poll(), timeout)
+
+    # async hooks - default to running the blocking implementation in a worker thread,
+    # drivers with a non-blocking transport should override these
+    async def _ahome(self):
+        return await asyncio.to_thread(self._home)
+
+    async def _amove_absolute(self, value, **kwargs):
+        return await asyncio.to_thread(self._move_absolute, value, **kwargs)
+
+    async def _amove_relative(self, value):
+        return await asyncio.to_thread(self._move_relative, value)
+
     # abstract methods
+    @abc.abstractmethod
+    async def _ais_moving(self) -> bool:
+        """Device-specific, non-blocking check whether the device is moving or homing"""
+
     @abc.abstractmethod
     def _get_position(self):
         """Device-specific method for getting the current position"""
@@ -182,13 +264,15 @@ class PyroMixin:
     pyro_key: ClassVar[str]
 
     def connect_pyro(self):
+        from swmain.network.pyroclient import connect
+
         return connect(self.pyro_key)
 
 
 class RedisMixin:
     def update_redis(self, params: dict[str, Any]):
         """Update the scexao redis"""
-        redis.update_keys(**params)
+        update_keys(**params)
 
     def update_status(self, params: dict[str, Any]):
         super().update_status(params)
@@ -210,7 +294,7 @@ class ConfigurableDevice(abc.ABC):
     name: str
     conf_path: Path
     drivers: dict[str, DeviceDriver] = field(default_factory=dict)
-    computer: Optional[Literal["scexao2", "scexaoV"]] = None
+    computer: Literal["scexao2", "scexaoV"] | None = None
 
     @classmethod
     def from_dict(__cls__, config_dict, **kwargs):
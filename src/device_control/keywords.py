@@ -0,0 +1,92 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+__all__ = ["KeywordPublisher", "update_keys", "flush_keys"]
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class KeywordPublisher:
+    """
+    Coalescing publisher for the scexao redis keywords.
+
+    `update` only buffers the values; a background thread flushes every `interval` seconds,
+    dropping values that haven't changed since they were last published and sending the rest in
+    a single `swmain.redis.update_keys` (pipelined) call. Anything still buffered is flushed when
+    the process exits.
+
+    The record of what was published is forgotten every `republish_interval` seconds and after a
+    redis error, so values lost by redis (e.g. on a restart) are sent again with the next update.
+    """
+
+    def __init__(self, interval: float = 0.2, republish_interval: float = 60):
+        self.interval = interval
+        self.republish_interval = republish_interval
+        self._pending: dict[str, Any] = {}
+        self._published: dict[str, Any] = {}
+        self._published_since = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def update(self, **kwargs):
+        with self._lock:
+            self._pending.update(kwargs)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="keyword-publisher", daemon=True
+                )
+                self._thread.start()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if time.monotonic() - self._published_since > self.republish_interval:
+                self._forget_published()
+            changed = {k: v for k, v in pending.items() if self._published.get(k, _MISSING) != v}
+            if len(changed) == 0:
+                return
+            try:
+                # imported here so scripts which never publish don't pay for the redis client
+                from swmain import redis
+
+                redis.update_keys(**changed)
+            except Exception:
+                logger.exception("failed to publish keywords %s", list(changed))
+                with self._lock:
+                    # retry on the next flush, keeping anything newer that arrived in the meantime
+                    self._pending = {**changed, **self._pending}
+                # redis may have lost the earlier values too
+                self._forget_published()
+                return
+            self._published.update(changed)
+
+    def _forget_published(self):
+        self._published = {}
+        self._published_since = time.monotonic()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+_PUBLISHER = KeywordPublisher(float(os.getenv("DEVICE_CONTROL_KEYWORD_INTERVAL", 0.2)))
+atexit.register(_PUBLISHER.flush)
+
+
+def update_keys(**kwargs):
+    """Drop-in, non-blocking replacement for `swmain.redis.update_keys`"""
+    _PUBLISHER.update(**kwargs)
+
+
+def flush_keys():
+    """Publish any buffered keywords now"""
+    _PUBLISHER.flush()
@@ -0,0 +1,55 @@
+import importlib
+import importlib.util
+import sys
+
+__all__ = ["lazy_import", "lazy_exports"]
+
+
+class _LazyModule:
+    """Stand-in for a module, imported on first attribute access"""
+
+    def __init__(self, name: str):
+        self._lazy_name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            # `import_module` holds the module's import lock, so threads racing on the first access
+            # (e.g. the status poller and the fan-out workers) all wait for one complete import.
+            # importlib's LazyLoader isn't thread-safe before Python 3.12.
+            self._module = importlib.import_module(self._lazy_name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._lazy_name!r}>"
+
+
+def lazy_import(name: str):
+    """
+    Return module `name`, deferring its execution until an attribute is first accessed.
+
+    Used for heavy dependencies (numpy, paramiko, ...) which the console scripts don't need in
+    remote (Pyro) mode. Parent packages of a dotted name are still imported straight away.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if importlib.util.find_spec(name) is None:
+        msg = f"No module named '{name}'"
+        raise ModuleNotFoundError(msg, name=name)
+    return _LazyModule(name)
+
+
+def lazy_exports(package: str, exports: dict[str, str]):
+    """
+    Build a module `__getattr__` for `package` which imports each of `exports` (name -> relative
+    submodule) on first access, so importing one submodule doesn't import all its siblings.
+    """
+
+    def __getattr__(name):
+        if name not in exports:
+            msg = f"module '{package}' has no attribute '{name}'"
+            raise AttributeError(msg)
+        module = importlib.import_module(exports[name], package)
+        return getattr(module, name)
+
+    return __getattr__
@@ -1,8 +1,7 @@
-from logging.config import dictConfig
+import threading
 from pathlib import Path
 
 LOGDIR = Path("~/logs").expanduser()
-LOGDIR.mkdir(exist_ok=True)
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -13,11 +12,14 @@ LOGGING_CONFIG = {
             "datefmt": "%Y-%m-%dT%H:%M:%S",
         }
     },
+    # the daemons' status polls would log every position every few seconds
+    "filters": {"skip_polls": {"()": "device_control.poller.PollFilter"}},
     "handlers": {
         "file_position": {
             "level": "INFO",
             "class": "logging.handlers.TimedRotatingFileHandler",
             "filename": LOGDIR / "devices_status.log",
+            "filters": ["skip_polls"],
             "when": "midnight",
             "utc": True,
             "formatter": "file",
@@ -26,6 +28,7 @@ LOGGING_CONFIG = {
             "level": "DEBUG",
             "class": "logging.handlers.TimedRotatingFileHandler",
             "filename": LOGDIR / "devices_debug.log",
+            "filters": ["skip_polls"],
             "when": "midnight",
             "utc": True,
             "formatter": "file",
@@ -36,4 +39,18 @@ LOGGING_CONFIG = {
     },
 }
 
-dictConfig(LOGGING_CONFIG)
+_configured = False
+_lock = threading.Lock()
+
+
+def configure():
+    """Set up the log files, once per process. Called when the first device is created."""
+    global _configured
+    with _lock:
+        if _configured:
+            return
+        from logging.config import dictConfig
+
+        LOGDIR.mkdir(exist_ok=True)
+        dictConfig(LOGGING_CONFIG)
+        _configured = True
@@ -0,0 +1,128 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+__all__ = ["MoveTracker", "get_tracker", "wait_all"]
+
+logger = logging.getLogger(__name__)
+
+_TRACKER = None
+_TRACKER_LOCK = threading.Lock()
+
+
+class _Move:
+    def __init__(self, move_id, description):
+        self.move_id = move_id
+        self.description = description
+        self.start = time.time()
+        self.end = None
+        self.error = None
+        self.done = threading.Event()
+
+    def as_dict(self) -> dict:
+        end = time.time() if self.end is None else self.end
+        return {
+            "move_id": self.move_id,
+            "description": self.description,
+            "done": self.done.is_set(),
+            "ok": self.done.is_set() and self.error is None,
+            "error": self.error,
+            "elapsed": end - self.start,
+        }
+
+
+class MoveTracker:
+    """
+    Daemon-side tracker of moves started in the background.
+
+    `start` runs a blocking move on its own thread and returns a move ID at once, which clients then
+    `poll` or `wait` on over Pyro. Each move has a dedicated thread rather than a pool slot, so the
+    axes of a configuration change still fan out in parallel (see `run_parallel`) and a long move
+    never queues behind another. The last `history` finished moves are kept for polling.
+    """
+
+    def __init__(self, history=256):
+        self.history = history
+        self._moves: OrderedDict[str, _Move] = OrderedDict()
+        self._lock = threading.Lock()
+        # unique across daemon restarts, so a stale ID is never mistaken for a new move
+        self._prefix = f"{os.getpid():x}{int(time.time()) % 0x10000:04x}"
+        self._counter = itertools.count(1)
+
+    def start(self, func, *args, description=None, **kwargs) -> str:
+        """Call `func(*args, **kwargs)` on a new thread and return the move ID"""
+        move_id = f"{self._prefix}-{next(self._counter)}"
+        if description is None:
+            description = getattr(func, "__qualname__", repr(func))
+        move = _Move(move_id, description)
+        with self._lock:
+            self._moves[move_id] = move
+            self._prune()
+        thread = threading.Thread(
+            target=self._run, args=(move, func, args, kwargs), name=f"move-{move_id}", daemon=True
+        )
+        thread.start()
+        return move_id
+
+    def _run(self, move, func, args, kwargs):
+        try:
+            func(*args, **kwargs)
+        except Exception as exc:
+            logger.exception("move %s (%s) failed", move.move_id, move.description)
+            move.error = f"{type(exc).__name__}: {exc}"
+        finally:
+            move.end = time.time()
+            move.done.set()
+
+    def _prune(self):
+        finished = [key for key, move in self._moves.items() if move.done.is_set()]
+        for key in finished[: max(len(finished) - self.history, 0)]:
+            del self._moves[key]
+
+    def _get(self, move_id: str) -> _Move:
+        with self._lock:
+            move = self._moves.get(move_id)
+        if move is None:
+            msg = f"Unknown move ID '{move_id}'"
+            raise ValueError(msg)
+        return move
+
+    def poll(self, move_id: str) -> dict:
+        """
+        Return the state of a move: `done`, `ok`, `error` (None unless the move raised), `elapsed`
+        seconds and a `description`.
+        """
+        return self._get(move_id).as_dict()
+
+    def wait(self, move_id: str, timeout=None) -> dict:
+        """Block until the move is done or `timeout` seconds have passed, then `poll` it"""
+        move = self._get(move_id)
+        move.done.wait(timeout)
+        return move.as_dict()
+
+
+def get_tracker() -> MoveTracker:
+    """Return the process-wide move tracker shared by every device"""
+    global _TRACKER
+    with _TRACKER_LOCK:
+        if _TRACKER is None:
+            _TRACKER = MoveTracker()
+        return _TRACKER
+
+
+def wait_all(handles, timeout=None) -> list[dict]:
+    """
+    Wait on several moves, e.g. started on different daemons, with one overall `timeout`.
+
+    `handles` are `(device, move_id)` pairs, where `device` is a local device or a Pyro proxy.
+    Returns the final `poll` state of each move, in order.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    results = []
+    for device, move_id in handles:
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        results.append(device.wait(move_id, remaining))
+    return results
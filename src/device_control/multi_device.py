@@ -1,19 +1,88 @@
+import contextvars
+import os
+import threading
 from concurrent import futures
 from pathlib import Path
 
-import numpy as np
 import tomli
 import tomli_w
 
-from device_control.base import ConfigurableDevice
+from device_control.base import ConfigurableDevice, MotionDevice
 from device_control.drivers.conex import ConexAGAPButOnlyOneAxis, CONEXDevice
-from device_control.drivers.zaber import ZaberDevice
-from device_control.drivers.thorlabs import ThorlabsElliptec
+from device_control.lazy import lazy_import
+from device_control.moves import get_tracker
+from device_control.poller import snapshot_status
+from device_control.scheduler import PortScheduler
 
-__all__ = ["MultiDevice"]
+np = lazy_import("numpy")
+
+__all__ = ["MultiDevice", "get_executor", "run_parallel"]
+
+_THREAD_PREFIX = "device_control"
+# fan-outs nested deeper than this run inline
+MAX_NESTING = 3
+_EXECUTORS: dict[int, futures.ThreadPoolExecutor] = {}
+_EXECUTOR_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+def get_executor(level=0) -> futures.ThreadPoolExecutor:
+    """
+    Return the process-wide executor shared by every `MultiDevice` for fan-outs nested `level`
+    deep, e.g. the axes of each device of `DaemonStatus.get_status_all` run on level 1.
+
+    The pool size can be set with the `DEVICE_CONTROL_MAX_WORKERS` environment variable.
+    """
+    with _EXECUTOR_LOCK:
+        if level not in _EXECUTORS:
+            max_workers = int(os.getenv("DEVICE_CONTROL_MAX_WORKERS", 16))
+            _EXECUTORS[level] = futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=f"{_THREAD_PREFIX}-{level}"
+            )
+        return _EXECUTORS[level]
+
+
+def _run_nested(level, func, item, args, kwargs):
+    # fan-outs made from here go to the next level's pool
+    _LOCAL.level = level + 1
+    return func(item, *args, **kwargs)
+
+
+def run_parallel(func, items, *args, **kwargs) -> list:
+    """
+    Call `func(item, *args, **kwargs)` for each item on the shared executor, returning the
+    results in order.
+
+    A fan-out started from a pool thread goes to the pool of the next nesting level, so it runs in
+    parallel as well but never waits on the pool it is running on, which could deadlock when that
+    pool is saturated. Beyond `MAX_NESTING` levels the calls are made inline.
+    """
+    items = list(items)
+    level = getattr(_LOCAL, "level", 0)
+    if len(items) <= 1 or level >= MAX_NESTING:
+        return [func(item, *args, **kwargs) for item in items]
+    executor = get_executor(level)
+    # each call runs in a copy of the caller's context, e.g. so the logs of a status poll's fan-out
+    # are still filtered as part of the poll
+    tasks = [
+        executor.submit(
+            contextvars.copy_context().run, _run_nested, level, func, item, args, kwargs
+        )
+        for item in items
+    ]
+    return [task.result() for task in tasks]
+
+
+def _get_position(device):
+    return device.get_position()
 
 
 class MultiDevice(ConfigurableDevice):
+    # per sub-device divisor applied to position differences when matching configurations
+    AXIS_SCALES: dict = {}
+    # per sub-device period (e.g. 360 deg for rotation stages), defaults to the device's `PERIOD`
+    AXIS_PERIODS: dict = {}
+
     def __init__(self, devices: dict, **kwargs):
         self.devices = devices
         kwargs["serial_kwargs"] = {}
@@ -34,10 +103,9 @@ class MultiDevice(ConfigurableDevice):
         return result
 
     def home_all(self, **kwargs):
-        with futures.ThreadPoolExecutor() as executor:
-            tasks = [executor.submit(self.devices[name].home, **kwargs) for name in self.devices]
-            results = [task.result() for task in tasks]
-        return results
+        result = run_parallel(lambda dev: dev.home(**kwargs), self.devices.values())
+        self.invalidate_status()
+        return result
 
     def move_absolute(self, name, value, **kwargs):
         result = self.devices[name].move_absolute(value, **kwargs)
@@ -49,6 +117,32 @@ class MultiDevice(ConfigurableDevice):
         self.update_keys()
         return result
 
+    # non-blocking moves, which return a move ID to `poll` or `wait` on at once
+    def move_absolute_async(self, name, value, **kwargs) -> str:
+        return get_tracker().start(
+            self.move_absolute,
+            name,
+            value,
+            description=f"{self.name} move_absolute {name} {value}",
+            **kwargs,
+        )
+
+    def move_relative_async(self, name, value, **kwargs) -> str:
+        return get_tracker().start(
+            self.move_relative,
+            name,
+            value,
+            description=f"{self.name} move_relative {name} {value}",
+            **kwargs,
+        )
+
+    def move_configuration_async(self, idx_or_name) -> str:
+        return get_tracker().start(
+            self.move_configuration,
+            idx_or_name,
+            description=f"{self.name} move_configuration {idx_or_name}",
+        )
+
     def stop(self, name=None):
         if name is None:
             for device in self.devices.values():
@@ -57,11 +151,30 @@ class MultiDevice(ConfigurableDevice):
             self.devices[name].stop()
         self.update_keys()
 
-    def stop_all(self, **kwargs):
-        with futures.ThreadPoolExecutor() as executor:
-            tasks = [executor.submit(self.stop, name, **kwargs) for name in self.devices]
-            results = [task.result() for task in tasks]
-        return results
+    def stop_all(self):
+        """
+        Stop every sub-device at once. The stops run on their own threads instead of the shared
+        executor, which the moves being stopped may have saturated.
+        """
+        errors = []
+
+        def stop(device):
+            try:
+                device.stop()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [
+            threading.Thread(target=stop, args=(device,), name=f"stop-{key}", daemon=True)
+            for key, device in self.devices.items()
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.update_keys()
+        if errors:
+            raise errors[0]
 
     @classmethod
     def from_config(__cls__, filename):
@@ -81,8 +194,13 @@ class MultiDevice(ConfigurableDevice):
                     axis=device_config["agapaxis"], config_file=filename, **device_config
                 )
             elif dev_type == "zaber":
+                # zaber_motion and elliptec are slow to import, only load them when used
+                from device_control.drivers.zaber import ZaberDevice
+
                 device = ZaberDevice(config_file=filename, **device_config)
             elif dev_type.startswith("elliptec"):
+                from device_control.drivers.thorlabs import ThorlabsElliptec
+
                 elliptec_type = dev_type.split("-")[-1]
                 device = ThorlabsElliptec(config_file=filename, type=elliptec_type, **device_config)
             else:
@@ -102,6 +220,8 @@ class MultiDevice(ConfigurableDevice):
 
         config = {"name": self.name, "configurations": self.configurations}
         config.update(self._config_extras())
+        from device_control.drivers.zaber import ZaberDevice
+
         config["devices"] = []
         for key, device in self.devices.items():
             if isinstance(device, CONEXDevice):
@@ -110,7 +230,13 @@ class MultiDevice(ConfigurableDevice):
                 type = "conexagap"
             elif isinstance(device, ZaberDevice):
                 type = "zaber"
-            devconf = {"name": key, "type": type, "serial": device.get_serial_kwargs()}
+            devconf = {
+                "name": key,
+                "type": type,
+                "serial": device.get_serial_kwargs(),
+            }
+            if device.priority != PortScheduler.NORMAL:
+                devconf["priority"] = device.priority
             devconf.update(device._config_extras())
             config["devices"].append(devconf)
         with path.open("wb") as fh:
@@ -122,9 +248,9 @@ class MultiDevice(ConfigurableDevice):
 
     def save_configuration(self, positions=None, index=None, name=None, tol=1e-1, **kwargs):
         if positions is None:
-            dev_posns = {k: dev.get_position() for k, dev in self.devices.items()}
+            dev_posns = dict(zip(self.devices, self._get_positions(), strict=True))
         else:
-            dev_posns = {k: pos for k, pos in zip(self.devices.keys(), positions)}
+            dev_posns = dict(zip(self.devices, positions, strict=True))
 
         current_config = self.get_configuration(positions=dev_posns.values(), tol=tol)
         if index is None:
@@ -136,25 +262,23 @@ class MultiDevice(ConfigurableDevice):
                 name = current_config[1]
 
         # see if existing configuration
-        for row in self.configurations:
-            if row["idx"] == index:
-                if name is not None:
-                    row["name"] = name
-                row["value"] = dev_posns
-                self.logger.info(
-                    f"updated configuration {index} '{row['name']}' to value {row['value']}"
-                )
-                break
+        row = self._get_config_index().get_by_idx(index)
+        if row is not None:
+            if name is not None:
+                row["name"] = name
+            row["value"] = dev_posns
+            self.logger.info(
+                f"updated configuration {index} '{row['name']}' to value {row['value']}"
+            )
         else:
             if name is None:
                 msg = "Must provide name for new configuration"
                 raise ValueError(msg)
-            self.configurations.append(dict(idx=index, name=name, values=dev_posns.values()))
-            self.logger.info(
-                f"added new configuration {index} '{name}' with values {dev_posns.values()}"
-            )
+            self.configurations.append(dict(idx=index, name=name, value=dev_posns))
+            self.logger.info(f"added new configuration {index} '{name}' with values {dev_posns}")
         # sort configurations dictionary in-place by index
         self.configurations.sort(key=lambda d: d["idx"])
+        self._config_index = None
         # save configurations to file
         self.save_config(**kwargs)
         self.update_keys()
@@ -166,59 +290,133 @@ class MultiDevice(ConfigurableDevice):
         return self.move_configuration_name(idx_or_name, **kwargs)
 
     def move_configuration_idx(self, idx: int):
-        for row in self.configurations:
-            if row["idx"] == idx:
-                self.current_config = row["value"]
-                break
-        else:
+        row = self._get_config_index().get_by_idx(idx)
+        if row is None:
             msg = f"No configuration saved at index {idx}"
             raise ValueError(msg)
-        with futures.ThreadPoolExecutor() as executor:
-            tasks = []
-            for dev_name, value in self.current_config.items():
-                # TODO async wait
-                tasks.append(executor.submit(self.devices[dev_name].move_absolute, value))
-            [task.result() for task in tasks]
-            self.update_keys()
+        self.current_config = row["value"]
+        self._move_all(self.current_config)
 
     def move_configuration_name(self, name: str):
-        for row in self.configurations:
-            if row["name"].lower() == name.lower():
-                self.current_config = row["value"]
-                break
-        else:
+        row = self._get_config_index().get_by_name(name)
+        if row is None:
             msg = f"No configuration saved with name '{name}'"
             raise ValueError(msg)
-        with futures.ThreadPoolExecutor() as executor:
-            tasks = []
-            for dev_name, value in self.current_config.items():
-                tasks.append(executor.submit(self.devices[dev_name].move_absolute, value))
-            [task.result() for task in tasks]
-            self.update_keys()
+        self.current_config = row["value"]
+        self._move_all(self.current_config)
+
+    def _get_positions(self) -> list:
+        return run_parallel(_get_position, self.devices.values())
+
+    def _plan_moves(self, values: dict, positions: dict) -> dict:
+        """
+        Return the subset of `values` (sub-device -> target) which needs moving from `positions`.
+        Sub-devices already within their `settle_tol` of the target are left alone.
+        """
+        return {
+            key: value
+            for key, value in values.items()
+            if not isinstance(self.devices[key], MotionDevice)
+            or self.devices[key].needs_move(value, positions[key])
+        }
+
+    def _move_device(self, item, positions):
+        key, value = item
+        device = self.devices[key]
+        if isinstance(device, MotionDevice):
+            # already checked against the dead-band by `_plan_moves`
+            return device.move_absolute(value, force=True, position=positions[key])
+        return device.move_absolute(value)
+
+    def _current_positions(self) -> dict:
+        # from the polled status when it is fresh, which costs no bus traffic
+        status = self._cached_status()
+        if isinstance(status, tuple) and len(status) == 2:
+            return dict(zip(self.devices, status[0], strict=True))
+        return dict(zip(self.devices, self._get_positions(), strict=True))
+
+    def _move_all(self, values: dict):
+        # read from the stages, a snapshot could predate a move made since
+        positions = dict(zip(self.devices, self._get_positions(), strict=True))
+        moves = self._plan_moves(values, positions)
+        if len(moves) == 0:
+            self.logger.debug("SKIPPING move, all sub-devices already in position")
+            return
+        # start the slowest axis first
+        estimates = self._estimate_moves(moves, positions)
+        order = sorted(moves.items(), key=lambda item: -(estimates.get(item[0]) or 0))
+        run_parallel(self._move_device, order, positions)
+        self.update_keys()
+
+    def _estimate_moves(self, values: dict, positions: dict) -> dict:
+        estimates = {}
+        for key, value in values.items():
+            device = self.devices[key]
+            if isinstance(device, MotionDevice):
+                estimates[key] = device.estimate_move_time(value, positions[key])
+        return estimates
+
+    def estimate_move_time(self, values: dict) -> float | None:
+        """
+        Estimate the duration of moving the sub-devices to `values` (sub-device -> target) in
+        parallel, i.e. of the slowest axis, in seconds. None if no sub-device can be estimated.
+        """
+        positions = self._current_positions()
+        moves = self._plan_moves(values, positions)
+        if len(moves) == 0:
+            return 0.0
+        estimates = self._estimate_moves(moves, positions).values()
+        return max((t for t in estimates if t is not None), default=None)
+
+    def estimate_configuration_time(self, idx_or_name) -> float | None:
+        """Estimate the duration of `move_configuration(idx_or_name)`, see `estimate_move_time`"""
+        return self.estimate_move_time(self._lookup_configuration(idx_or_name)["value"])
 
     def update_keys(self, positions=None):
+        # called after every move, so this is also where the polled snapshot goes stale
+        self.invalidate_status()
         if positions is None:
-            positions = [dev.get_position() for dev in self.devices.values()]
+            positions = self._get_positions()
         return self._update_keys(positions)
 
     def _update_keys(self, positions):
         pass
 
+    def _config_vector(self, value: dict):
+        # one column per sub-device, NaN for the ones a configuration leaves alone
+        return np.array([value.get(key, np.nan) for key in self.devices], dtype=float)
+
+    def _config_scales(self):
+        return [self.AXIS_SCALES.get(key, 1) for key in self.devices]
+
+    def _config_periods(self):
+        return [
+            self.AXIS_PERIODS.get(key, getattr(device, "PERIOD", None)) or 0
+            for key, device in self.devices.items()
+        ]
+
     def get_configuration(self, positions=None, tol=1e-1):
-        if positions is not None:
-            values = {k: p for k, p in zip(self.devices.keys(), positions)}
-        else:
-            values = {k: dev.get_position() for k, dev in self.devices.items()}
-        for row in self.configurations:
-            match = True
-            for key, val in values.items():
-                match = match and np.abs(row["value"][key] - val) <= tol
-            if match:
-                return row["idx"], row["name"]
-        return None, "Unknown"
+        if positions is None:
+            positions = self._get_positions()
+        row = self._get_config_index().match(list(positions), tol=tol)
+        if row is None:
+            return None, "Unknown"
+        return row["idx"], row["name"]
+
+    def get_nearest_configuration(self, positions=None):
+        """Return the index, name and scaled distance of the configuration closest to `positions`"""
+        if positions is None:
+            positions = self._get_positions()
+        row, distance = self._get_config_index().nearest(list(positions))
+        if row is None:
+            return None, "Unknown", distance
+        return row["idx"], row["name"], distance
 
+    @snapshot_status
     def get_status(self):
-        posns = [dev.get_position() for dev in self.devices.values()]
+        posns = self._get_positions()
+        # the sub-devices publish their positions, publish the configuration name as well
+        self._update_keys(posns)
         idx, name = self.get_configuration(posns)  # This may return (None, 'Unknown')
         output = self.format_str.format(idx, name, *posns)
         return posns, output
@@ -0,0 +1,201 @@
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent import futures
+from typing import Any, NamedTuple
+
+__all__ = [
+    "StatusSnapshot",
+    "StatusPoller",
+    "PollFilter",
+    "fresh_snapshot",
+    "is_polling",
+    "snapshot_status",
+]
+
+logger = logging.getLogger(__name__)
+
+# set while a `StatusPoller` refreshes a snapshot. A context variable rather than a thread-local,
+# so fan-outs of the poll (e.g. `run_parallel` over the axes of a `MultiDevice`) see it as well.
+_REFRESHING = contextvars.ContextVar("refreshing", default=False)
+
+
+class StatusSnapshot(NamedTuple):
+    time: float  # wall-clock time of the poll
+    status: Any  # return value of `get_status`, None if the poll failed
+    error: str | None
+    max_age: float  # seconds after which the snapshot is ignored
+    generation: int = 0  # the device's `_status_generation` when the poll started
+
+    def is_fresh(self) -> bool:
+        return self.error is None and time.time() - self.time <= self.max_age
+
+
+def fresh_snapshot(device) -> StatusSnapshot | None:
+    """
+    Return the device's snapshot if it is fresh, else None. A snapshot whose poll started before
+    the last `invalidate_status` (e.g. a poll in flight during a move) is never fresh.
+    """
+    snapshot = getattr(device, "_status_snapshot", None)
+    if snapshot is None or not snapshot.is_fresh():
+        return None
+    if snapshot.generation != getattr(device, "_status_generation", 0):
+        return None
+    return snapshot
+
+
+def is_polling() -> bool:
+    """Whether the calling context is refreshing a snapshot for a `StatusPoller`"""
+    return _REFRESHING.get()
+
+
+class PollFilter(logging.Filter):
+    """
+    Drop the records below WARNING logged by routine polls, e.g. the positions logged by
+    `update_keys`, which would otherwise fill the logs every few seconds
+    """
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or not is_polling()
+
+
+def snapshot_status(get_status):
+    """
+    Serve `get_status` from the device's latest `StatusSnapshot` while it is fresh.
+
+    Only the no-argument call is served from the snapshot. Without a fresh snapshot (no poller, a
+    failed poll, or a move since the last poll) the device is queried as usual.
+    """
+
+    @functools.wraps(get_status)
+    def wrapper(self, *args, **kwargs):
+        if len(args) == 0 and len(kwargs) == 0 and not is_polling():
+            snapshot = fresh_snapshot(self)
+            if snapshot is not None:
+                return snapshot.status
+        return get_status(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _Entry:
+    def __init__(self, key, device, interval, jitter):
+        self.key = key
+        self.device = device
+        self.interval = interval
+        self.jitter = jitter
+        self.future = None
+
+    def next_delay(self):
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+class StatusPoller:
+    """
+    Daemon-side status poller.
+
+    Every registered device is polled with `get_status()` on its own schedule (`interval` seconds,
+    randomized by +/- `jitter` as a fraction so devices sharing a port don't poll in lockstep) from
+    a small worker pool, and the result is stored on the device as a `StatusSnapshot`. `get_status`
+    methods decorated with `snapshot_status` then return the snapshot without touching the wire, so
+    any number of status clients costs no extra bus traffic. A snapshot expires after `stale_factor`
+    poll intervals, so a stalled poller falls back to live queries.
+    """
+
+    def __init__(self, max_workers=4, stale_factor=3):
+        self.stale_factor = stale_factor
+        self._entries: dict[str, _Entry] = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="status-poller"
+        )
+        self._thread = None
+
+    def add(self, key: str, device, interval=1.0, jitter=0.1):
+        """Poll `device` every `interval` seconds, with the first poll as soon as possible"""
+        entry = _Entry(key, device, interval, jitter)
+        with self._lock:
+            self._entries[key] = entry
+            heapq.heappush(self._heap, (time.monotonic(), next(self._counter), entry))
+        self._wakeup.set()
+
+    def __contains__(self, key: str):
+        return key in self._entries
+
+    def remove(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.device._status_snapshot = None
+
+    def poll(self, key: str) -> StatusSnapshot:
+        """Poll one device now from the calling thread and return the new snapshot"""
+        return self._poll(self._entries[key])
+
+    def snapshot(self, key: str) -> StatusSnapshot | None:
+        return getattr(self._entries[key].device, "_status_snapshot", None)
+
+    def snapshots(self) -> dict[str, StatusSnapshot | None]:
+        with self._lock:
+            entries = list(self._entries.values())
+        return {e.key: getattr(e.device, "_status_snapshot", None) for e in entries}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="status-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _poll(self, entry: _Entry) -> StatusSnapshot:
+        # a move which invalidates the status meanwhile makes this snapshot stale
+        generation = getattr(entry.device, "_status_generation", 0)
+        token = _REFRESHING.set(True)
+        try:
+            status = entry.device.get_status()
+            error = None
+        except Exception as exc:
+            logger.warning("failed to poll %s: %s", entry.key, exc)
+            status, error = None, f"{type(exc).__name__}: {exc}"
+        finally:
+            _REFRESHING.reset(token)
+        snapshot = StatusSnapshot(
+            time.time(), status, error, self.stale_factor * entry.interval, generation
+        )
+        entry.device._status_snapshot = snapshot
+        return snapshot
+
+    def _run(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                if len(self._heap) == 0:
+                    timeout = None
+                else:
+                    due, _, entry = self._heap[0]
+                    timeout = due - time.monotonic()
+                    if timeout <= 0:
+                        heapq.heappop(self._heap)
+                        timeout = 0
+            if timeout is None or timeout > 0:
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+                continue
+            if self._entries.get(entry.key) is not entry:
+                continue  # removed or replaced
+            # a slow device never holds up the others, and never has two polls in flight
+            if entry.future is None or entry.future.done():
+                entry.future = self._executor.submit(self._poll, entry)
+            with self._lock:
+                due = time.monotonic() + entry.next_delay()
+                heapq.heappush(self._heap, (due, next(self._counter), entry))
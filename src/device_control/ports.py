@@ -0,0 +1,247 @@
+import fcntl
+import logging
+import os
+import threading
+from pathlib import Path
+
+import serial
+
+__all__ = ["AsyncSerialTransport", "Serial", "get_serial"]
+
+
+class AsyncSerialTransport:
+    """
+    Non-blocking line transport over an open pyserial port, driven by the running event loop.
+
+    pyserial opens POSIX ports with `O_NONBLOCK`, so reads and writes go straight to the file
+    descriptor and wait on loop readiness callbacks instead of a thread. Transactions on the same
+    port are serialized with an `asyncio.Lock` by `transact`; the pooled `Serial` holds its own locks
+    instead, see `Serial.atransaction`.
+    """
+
+    def __init__(self, port: serial.Serial):
+        import asyncio
+
+        self.port = port
+        self.lock = asyncio.Lock()
+        self._buffer = bytearray()
+
+    def reset_input_buffer(self):
+        """Drop any bytes read past the last reply"""
+        self._buffer.clear()
+
+    async def _wait_fd(self, add, remove, timeout=None):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        fd = self.port.fileno()
+        fut = loop.create_future()
+        add(fd, lambda: fut.done() or fut.set_result(None))
+        try:
+            await asyncio.wait_for(fut, timeout)
+        finally:
+            remove(fd)
+
+    async def write(self, data: bytes):
+        import asyncio
+
+        if not self.port.is_open:
+            self.port.open()
+        loop = asyncio.get_running_loop()
+        view = memoryview(data)
+        while view:
+            try:
+                n = os.write(self.port.fileno(), view)
+            except BlockingIOError:
+                await self._wait_fd(loop.add_writer, loop.remove_writer)
+                continue
+            view = view[n:]
+
+    async def read_until(self, terminator: bytes = b"\r\n", timeout: float | None = None):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while (idx := self._buffer.find(terminator)) < 0:
+            # pyserial sets VMIN=0, so a read on a tty with nothing to read returns no data
+            # instead of failing, wait for readiness first
+            await self._wait_fd(loop.add_reader, loop.remove_reader, timeout)
+            try:
+                chunk = os.read(self.port.fileno(), 4096)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                # ready but empty, as pyserial sees a disconnected device
+                msg = f"serial port {self.port.port} was closed"
+                raise serial.SerialException(msg)
+            self._buffer += chunk
+        end = idx + len(terminator)
+        line = bytes(self._buffer[:end])
+        del self._buffer[:end]
+        return line
+
+    async def transact(self, data: bytes, n_replies=1, terminator=b"\r\n", timeout=None):
+        """Write `data` and read `n_replies` terminated lines, holding the port lock throughout"""
+        async with self.lock:
+            await self.write(data)
+            return [await self.read_until(terminator, timeout) for _ in range(n_replies)]
+
+
+class Serial(serial.Serial):
+    """
+    Serial port which stays open between commands.
+
+    Entering the context takes the in-process lock and the cross-process `/tmp` flock for the port,
+    but the file descriptor is kept open on exit so each command only costs wire time. If a command
+    fails with a serial or OS error (e.g. the USB adapter re-enumerated) the port is closed and will
+    be reopened on the next command. Idempotent queries go through `transaction(..., retry=True)`,
+    which reopens the port and retries once instead of losing the query.
+
+    `async with` holds the port the same way from a coroutine and gives its `AsyncSerialTransport`,
+    see `atransaction`.
+    """
+
+    # seconds between attempts to take a busy port from a coroutine
+    ASYNC_POLL_INTERVAL = 0.005
+
+    def __init__(self, *args, **kwargs):
+        port = None
+        if len(args) >= 1:
+            port = args[0]
+        elif "port" in kwargs:
+            port = kwargs["port"]
+
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._lockfile = None
+        self._transport = None
+        if port:
+            self.flockpath = Path("/tmp") / port.replace("/", "_")
+            self.flockpath.touch()  # If doesn't exist
+            self._lockfile = self.flockpath.open()  # SIM115
+            fcntl.flock(self._lockfile.fileno(), fcntl.LOCK_EX)
+            try:
+                super().__init__(*args, **kwargs)
+            finally:
+                fcntl.flock(self._lockfile.fileno(), fcntl.LOCK_UN)
+        else:
+            self.flockpath = None
+            super().__init__(*args, **kwargs)
+
+    def __enter__(self):
+        self._acquire(blocking=True)
+        return self
+
+    def _acquire(self, blocking=True) -> bool:
+        """Take the locks and open the port, or return False if not `blocking` and it is busy"""
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            flock = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                if self._lockfile is None and self.port is not None:
+                    self.flockpath = Path("/tmp") / self.port.replace("/", "_")
+                    self.flockpath.touch()
+                    self._lockfile = self.flockpath.open()  # SIM115
+                if self._lockfile is not None:
+                    try:
+                        fcntl.flock(self._lockfile.fileno(), flock)
+                    except BlockingIOError:
+                        self._thread_lock.release()
+                        return False
+                if not self.is_open:
+                    self.open()
+                # drop anything left over from a timed-out reply or another process
+                self.reset_input_buffer()
+                if self._transport is not None:
+                    self._transport.reset_input_buffer()
+            except Exception:
+                if self._lockfile is not None:
+                    fcntl.flock(self._lockfile.fileno(), fcntl.LOCK_UN)
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return True
+
+    def __exit__(self, type, value, traceback):
+        self._depth -= 1
+        try:
+            if type is not None and issubclass(type, (serial.SerialException, OSError)):
+                # force a reopen on the next command
+                self.close()
+            if self._depth == 0 and self._lockfile is not None:
+                fcntl.flock(self._lockfile.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+    async def __aenter__(self):
+        import asyncio
+
+        # the locks are polled rather than waited on, so the event loop keeps running. A coroutine
+        # on the same loop may hold the port already, which the re-entrant lock wouldn't stop.
+        while True:
+            if self._acquire(blocking=False):
+                if self._depth == 1:
+                    return self.transport
+                self.__exit__(None, None, None)
+            await asyncio.sleep(self.ASYNC_POLL_INTERVAL)
+
+    async def __aexit__(self, type, value, traceback):
+        self.__exit__(type, value, traceback)
+
+    @property
+    def transport(self) -> "AsyncSerialTransport":
+        if self._transport is None:
+            self._transport = AsyncSerialTransport(self)
+        return self._transport
+
+    def transaction(self, func, retry=False):
+        """
+        Run `func(port)` with the port held and return its result. With `retry` (for idempotent
+        queries only) a serial or OS error reopens the port and runs `func` once more, still holding
+        the locks.
+        """
+        with self as port:
+            try:
+                return func(port)
+            except (serial.SerialException, OSError):
+                if not retry:
+                    raise
+                logging.getLogger(__name__).warning(
+                    "serial error on %s, reopening the port", self.port, exc_info=True
+                )
+                self.close()
+                self.open()
+                self.reset_input_buffer()
+                return func(port)
+
+    async def atransaction(self, payload: bytes, n_replies: int, terminator=b"\r\n") -> list[bytes]:
+        """
+        Write `payload` and read `n_replies` lines ending with `terminator` without blocking the
+        event loop, raising `TimeoutError` if a line takes longer than the port `timeout`.
+
+        The port is held as for `transaction`, so the exchange never interleaves with another
+        thread's or process's, but it doesn't queue on the port's `PortScheduler`.
+        """
+        async with self as transport:
+            await transport.write(payload)
+            return [await transport.read_until(terminator, self.timeout) for _ in range(n_replies)]
+
+
+_SERIAL_POOL: dict[str, Serial] = {}
+_SERIAL_POOL_LOCK = threading.Lock()
+
+
+def get_serial(**serial_kwargs) -> Serial:
+    """
+    Return the shared `Serial` for the given port, creating it on first use.
+
+    Every device on the same port (e.g. daisy-chained CONEX controllers) shares one instance, so
+    the port is opened once for the lifetime of the process. The first caller's settings are used.
+    """
+    port = serial_kwargs.get("port")
+    if port is None:
+        return Serial(**serial_kwargs)
+    with _SERIAL_POOL_LOCK:
+        if port not in _SERIAL_POOL:
+            _SERIAL_POOL[port] = Serial(**serial_kwargs)
+        return _SERIAL_POOL[port]
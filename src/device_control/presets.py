@@ -0,0 +1,226 @@
+import importlib
+import sys
+import time
+from concurrent import futures
+from pathlib import Path
+
+import tomli
+from docopt import docopt
+
+from device_control import conf_dir
+
+__all__ = ["PRESET_DEVICES", "ModePresets", "main"]
+
+# device keys usable in a mode definition, named after their console scripts
+PRESET_DEVICES = {
+    "vampires_bs": ("device_control.vampires", "VAMPIRESBeamsplitter"),
+    "vampires_diff": ("device_control.vampires", "VAMPIRESDiffWheel"),
+    "vampires_fieldstop": ("device_control.vampires", "VAMPIRESFieldstop"),
+    "vampires_filter": ("device_control.vampires", "VAMPIRESFilter"),
+    "vampires_flc": ("device_control.vampires", "VAMPIRESFLCStage"),
+    "vampires_focus": ("device_control.vampires", "VAMPIRESFocus"),
+    "vampires_mask": ("device_control.vampires", "VAMPIRESMaskWheel"),
+    "vampires_mbi": ("device_control.vampires", "VAMPIRESMBIWheel"),
+    "vampires_pupil": ("device_control.vampires", "VAMPIRESPupilLens"),
+    "vis_block": ("device_control.scexao", "VisBlock"),
+    "vis_qwp": ("device_control.scexao", "VisQWP"),
+    "firstpl_pickoff": ("device_control.scexao", "FIRSTPLPickoff"),
+    "firstpl_inj": ("device_control.first", "FIRSTPLInjection"),
+    "firstpl_wollaston": ("device_control.first", "FIRSTPLWollaston"),
+}
+
+
+def _device_class(key: str):
+    if key not in PRESET_DEVICES:
+        msg = f"Unknown device '{key}', must be one of {', '.join(PRESET_DEVICES)}"
+        raise ValueError(msg)
+    package, name = PRESET_DEVICES[key]
+    return getattr(importlib.import_module(package), name)
+
+
+def _move(device, configuration):
+    if isinstance(configuration, int) or configuration.isdigit():
+        return device.move_configuration_idx(int(configuration))
+    return device.move_configuration_name(configuration)
+
+
+class ModePresets:
+    """
+    Observing-mode presets.
+
+    A mode maps device keys (see `PRESET_DEVICES`) to the name or index of one of the device's
+    saved configurations. Applying a mode moves every device at once, each through its own daemon
+    and from its own thread, and returns when all of them have settled, with the time each took.
+    Devices may belong to different daemons (and computers). Their connections are kept, so
+    `estimate` followed by `apply` connects once.
+    """
+
+    CONF = "conf_modes.toml"
+
+    def __init__(self, modes: dict):
+        self.modes = modes
+        self._devices = {}
+        for mode in modes.values():
+            for key in mode:
+                _device_class(key)
+
+    @classmethod
+    def from_config(__cls__, filename=None):
+        if filename is None:
+            filename = conf_dir / __cls__.CONF
+        with Path(filename).open("rb") as fh:
+            parameters = tomli.load(fh)
+        return __cls__(parameters.get("modes", {}))
+
+    def get_modes(self) -> list[str]:
+        return list(self.modes)
+
+    def get_mode(self, name: str) -> dict:
+        for mode_name, mode in self.modes.items():
+            if mode_name.casefold() == name.casefold():
+                return mode
+        msg = f"No mode named '{name}'"
+        raise ValueError(msg)
+
+    @staticmethod
+    def _connect(key):
+        try:
+            return _device_class(key).connect()
+        except Exception as exc:
+            return exc
+
+    @staticmethod
+    def _estimate_one(device, configuration):
+        if isinstance(device, Exception):
+            return None
+        try:
+            return device.estimate_configuration_time(configuration)
+        except Exception:
+            # e.g. flip mounts, which have no kinematics
+            return None
+
+    @staticmethod
+    def _apply_one(device, configuration, estimate):
+        start = time.monotonic()
+        try:
+            if isinstance(device, Exception):
+                raise device
+            _move(device, configuration)
+            error = None
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        return {
+            "configuration": configuration,
+            "ok": error is None,
+            "error": error,
+            "estimate": estimate,
+            "elapsed": time.monotonic() - start,
+        }
+
+    def _connect_all(self, executor, mode) -> dict:
+        missing = [key for key in mode if key not in self._devices]
+        connected = dict(zip(missing, executor.map(self._connect, missing), strict=True))
+        # failed connections are tried again next time
+        self._devices.update(
+            (key, device) for key, device in connected.items() if not isinstance(device, Exception)
+        )
+        return {key: self._devices.get(key, connected.get(key)) for key in mode}
+
+    def _estimates(self, executor, mode, devices) -> dict:
+        tasks = {
+            key: executor.submit(self._estimate_one, devices[key], configuration)
+            for key, configuration in mode.items()
+        }
+        return {key: task.result() for key, task in tasks.items()}
+
+    def estimate(self, name: str) -> dict[str, float | None]:
+        """
+        Estimate how long each device of mode `name` takes to reach its configuration, in seconds
+        (see `MotionDevice.estimate_move_time`). None for devices which can't be estimated.
+        """
+        mode = self.get_mode(name)
+        if len(mode) == 0:
+            return {}
+        with futures.ThreadPoolExecutor(max_workers=len(mode)) as executor:
+            devices = self._connect_all(executor, mode)
+            return self._estimates(executor, mode, devices)
+
+    @staticmethod
+    def eta(estimates: dict) -> float | None:
+        """Expected duration of a mode change from its `estimate`, i.e. of the slowest device"""
+        return max((t for t in estimates.values() if t is not None), default=None)
+
+    def apply(self, name: str, estimates: dict | None = None) -> dict[str, dict]:
+        """
+        Move every device of mode `name` to its configuration concurrently, and return once all have
+        settled. Each device key maps to its `configuration`, `ok`/`error`, `estimate` and `elapsed`
+        seconds. The moves are started slowest first, by `estimates` (queried if not given). A
+        device that fails doesn't stop the others.
+        """
+        mode = self.get_mode(name)
+        if len(mode) == 0:
+            return {}
+        with futures.ThreadPoolExecutor(max_workers=len(mode)) as executor:
+            devices = self._connect_all(executor, mode)
+            if estimates is None:
+                estimates = self._estimates(executor, mode, devices)
+            order = sorted(mode, key=lambda key: -(estimates.get(key) or 0))
+            tasks = {
+                key: executor.submit(self._apply_one, devices[key], mode[key], estimates.get(key))
+                for key in order
+            }
+            return {key: tasks[key].result() for key in mode}
+
+
+__doc__ = """Usage:
+    obs_mode [-h | --help]
+    obs_mode list
+    obs_mode show <mode>
+    obs_mode <mode>
+
+Options:
+    -h, --help      Show this screen
+
+Commands:
+    list            List the observing modes
+    show <mode>     Show the device configurations of a mode
+    <mode>          Move every device of the mode concurrently, slowest first, and report the
+                    ETA and how long each took
+
+Modes are defined in conf_modes.toml in the configuration directory, as tables of device key
+(named after the device scripts, e.g. vampires_bs) to configuration name or index."""
+
+
+def main():
+    args = docopt(__doc__, options_first=True)
+    if len(sys.argv) == 1:
+        print(__doc__)
+        return
+    presets = ModePresets.from_config()
+    if args["list"]:
+        for name, mode in presets.modes.items():
+            print(f"{name}: {', '.join(mode)}")
+    elif args["show"]:
+        for key, configuration in presets.get_mode(args["<mode>"]).items():
+            print(f"{key:20s} {configuration}")
+    elif args["<mode>"]:
+        estimates = presets.estimate(args["<mode>"])
+        eta = presets.eta(estimates)
+        print("ETA unknown" if eta is None else f"ETA {eta:.1f} s")
+        start = time.monotonic()
+        results = presets.apply(args["<mode>"], estimates=estimates)
+        for key, result in results.items():
+            outcome = "ok" if result["ok"] else result["error"]
+            configuration = str(result["configuration"])
+            estimate = "?" if result["estimate"] is None else f"{result['estimate']:.1f}"
+            print(
+                f"{key:20s} {configuration:20s} {result['elapsed']:6.1f} s (est. {estimate} s)  "
+                f"{outcome}"
+            )
+        print(f"Finished in {time.monotonic() - start:.1f} s")
+        if not all(result["ok"] for result in results.values()):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
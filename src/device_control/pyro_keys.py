@@ -1,4 +1,4 @@
-__all__ = ["VAMPIRES", "PYRO_KEYS", "VISWFS"]
+__all__ = ["VAMPIRES", "PYRO_KEYS", "VISWFS", "DAEMONS"]
 
 
 class VAMPIRES:
@@ -30,6 +30,16 @@ class VISWFS:
     HWP: str = "VISWFS_HWP"
 
 
+class DAEMONS:
+    """Bulk status endpoints of the device daemons"""
+
+    VAMPIRES: str = "VAMPIRES_DEVICES"
+    SCEXAO2: str = "SCEXAO2_DEVICES"
+    VISWFS: str = "VISWFS_DEVICES"
+    FIRST: str = "FIRST_DEVICES"
+
+
 class PYRO_KEYS:
     VAMPIRES = VAMPIRES
     VISWFS = VISWFS
+    DAEMONS = DAEMONS
@@ -1,6 +1,20 @@
-from .polarizer import SCEXAOPolarizer
-from .vis_block import VisBlock
-from .vis_qwp import VisQWP
-from .firstpl_pickoff import FIRSTPLPickoff
+from typing import TYPE_CHECKING
 
-__all__ = ("SCEXAOPolarizer", "VisQWP", "VisBlock","FIRSTPLPickoff")
+from device_control.lazy import lazy_exports
+
+# submodules are only imported when one of their classes is first used
+_EXPORTS = {
+    "SCEXAOPolarizer": ".polarizer",
+    "VisQWP": ".vis_qwp",
+    "VisBlock": ".vis_block",
+    "FIRSTPLPickoff": ".firstpl_pickoff",
+}
+
+__all__ = ["SCEXAOPolarizer", "VisQWP", "VisBlock", "FIRSTPLPickoff"]
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .firstpl_pickoff import FIRSTPLPickoff
+    from .polarizer import SCEXAOPolarizer
+    from .vis_block import VisBlock
+    from .vis_qwp import VisQWP
@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 # from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import CONEXDevice
+from device_control.keywords import update_keys
 
 
 class FIRSTPLPickoff(CONEXDevice):
@@ -17,10 +18,11 @@ class FIRSTPLPickoff(CONEXDevice):
         _, name = self.get_configuration(position=position)
         update_keys(X_FIRPKO=name.upper(), X_FIRPKP=position)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
             f"    {FIRSTPLPickoff.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            for c in configurations
         )
         return f"""Usage:
     firstpl_pickoff [-h | --help]
@@ -45,12 +47,13 @@ Configurations:
 
 # setp 4. action
 def main():
-    firstpl_pickoff = FIRSTPLPickoff.connect(os.getenv("WHICHCOMP") == "2")
-    __doc__ = firstpl_pickoff.help_message()
+    local = os.getenv("WHICHCOMP") == "2"
+    __doc__ = get_help(FIRSTPLPickoff, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
+        return
+    firstpl_pickoff = FIRSTPLPickoff.connect(local=local)
     if args["status"]:
         posn, status = firstpl_pickoff.get_status()
         print(status)
@@ -71,7 +74,6 @@ def main():
         firstpl_pickoff.reset()
     elif args["<configuration>"]:
         firstpl_pickoff.move_configuration(args["<configuration>"])
-    firstpl_pickoff.update_keys(posn)
 
 
 if __name__ == "__main__":
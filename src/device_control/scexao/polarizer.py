@@ -3,23 +3,23 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import SCEXAO
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import CONEXDevice
+from device_control.keywords import update_keys
 
 
 class SCEXAOPolarizer(CONEXDevice):
     CONF = "scexao/conf_scexao_polarizer.toml"
     PYRO_KEY = SCEXAO.POL
     format_str = "{0:2d}: {1:6.2f} deg {{th={2:6.2f} deg}}"
+    PERIOD = 360
 
     def _update_keys(self, posn):
         update_keys(X_POLARP=posn)
 
-    def move_absolute(self, value, **kwargs):
-        return super().move_absolute(value % 360, **kwargs)
-
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         return """Usage:
     scexao_polarizer [-h | --help]
     scexao_polarizer (status|position|home|goto|nudge|stop|reset) [<angle>]
@@ -40,13 +40,13 @@ Stage commands:
 
 # setp 4. action
 def main():
-    scexao_pol = SCEXAOPolarizer.connect(os.getenv("WHICHCOMP") == "2")
-    __doc__ = scexao_pol.help_message()
+    local = os.getenv("WHICHCOMP") == "2"
+    __doc__ = get_help(SCEXAOPolarizer, local=local)
     args = docopt(__doc__, options_first=True)
-    posns = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
+    scexao_pol = SCEXAOPolarizer.connect(local=local)
     if args["position"] or args["status"]:
         posn = scexao_pol.get_position()
         print(posn)
@@ -62,7 +62,6 @@ def main():
         scexao_pol.stop()
     elif args["reset"]:
         scexao_pol.reset()
-    scexao_pol.update_keys(posns)
 
 
 if __name__ == "__main__":
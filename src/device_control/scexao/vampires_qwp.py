@@ -3,16 +3,19 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
 from device_control import conf_dir
+from device_control.cli import run_move
 from device_control.drivers import CONEXDevice
-from device_control.vampires.cameras import connect_cameras
+from device_control.keywords import update_keys
+from device_control.poller import snapshot_status
+from device_control.vampires.cameras import push_camera_keywords
 
 
 class VAMPIRESQWP(CONEXDevice):
     CONF = "scexao/conf_vampires_qwp{0:d}.toml"
     format_str = "QWP{0:1d}: {1:6.02f}"
+    PERIOD = 360
 
     def __init__(self, number, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -31,13 +34,7 @@ class VAMPIRESQWP(CONEXDevice):
     def _update_keys(self, theta):
         kwargs = {f"U_QWP{self.number:1d}": theta, f"U_QWP{self.number:1d}TH": theta - self.offset}
         update_keys(**kwargs)
-        for cam in connect_cameras():
-            if cam is not None:
-                cam.set_keyword(f"U_QWP{self.number:1d}", theta)
-                cam.set_keyword(f"U_QWP{self.number:1d}TH", theta - self.offset)
-
-    def _move_absolute(self, value: float):
-        return super()._move_absolute(value % 360)
+        push_camera_keywords(kwargs)
 
     @classmethod
     def connect(__cls__, num: int, local=False):
@@ -51,6 +48,7 @@ class VAMPIRESQWP(CONEXDevice):
             raise ValueError(msg)
         return super().connect(local, filename=filename, pyro_key=pyro_key)
 
+    @snapshot_status
     def get_status(self):
         posn = self.get_position()
         output = self.format_str.format(self.number, posn)
@@ -60,12 +58,13 @@ class VAMPIRESQWP(CONEXDevice):
 __doc__ = """Usage:
     vampires_qwp [-h | --help]
     vampires_qwp status
-    vampires_qwp 1 (status|position|home|goto|nudge|stop|reset) [<pos>]
-    vampires_qwp 2 (status|position|home|goto|nudge|stop|reset) [<pos>]
+    vampires_qwp [-w | --wait | --no-wait] 1 (status|position|home|goto|nudge|stop|reset) [<pos>]
+    vampires_qwp [-w | --wait | --no-wait] 2 (status|position|home|goto|nudge|stop|reset) [<pos>]
 
 Options:
     -h, --help   Show this screen
-    -w, --wait   Block command until position has been reached, for applicable commands
+    -w, --wait   Block command until position has been reached, for applicable commands (default)
+    --no-wait    Return as soon as the move has started
 
 Stage commands:
     status          Returns the current status of the QWP wheel
@@ -91,12 +90,10 @@ def main():
     elif args["status"]:
         for cam in (1, 2):
             qwp = VAMPIRESQWP.connect(cam, local=local)
-            posn = qwp.get_position()
-            qwp.update_keys(posn)
-            print(qwp.format_str.format(cam, posn))
+            _, status = qwp.get_status()
+            print(status)
         return
 
-    posn = None
     if args["status"]:
         posn, status = vampires_qwp.get_status()
         print(status)
@@ -107,15 +104,14 @@ def main():
         vampires_qwp.home()
     elif args["goto"]:
         new_pos = float(args["<pos>"])
-        vampires_qwp.move_absolute(new_pos)
+        run_move(vampires_qwp, "move_absolute", new_pos, wait=not args["--no-wait"], local=local)
     elif args["nudge"]:
         rel_pos = float(args["<pos>"])
-        vampires_qwp.move_relative(rel_pos)
+        run_move(vampires_qwp, "move_relative", rel_pos, wait=not args["--no-wait"], local=local)
     elif args["stop"]:
         vampires_qwp.stop()
     elif args["reset"]:
         vampires_qwp.reset()
-    vampires_qwp.update_keys(posn)
 
 
 if __name__ == "__main__":
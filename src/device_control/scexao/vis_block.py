@@ -2,9 +2,10 @@ import os
 import sys
 
 from docopt import docopt
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ThorlabsFlipMount
+from device_control.keywords import update_keys
 
 
 class VisBlock(ThorlabsFlipMount):
@@ -16,7 +17,8 @@ class VisBlock(ThorlabsFlipMount):
         _, state = self.get_configuration(position)
         update_keys(X_VISBLK=state.upper())
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         return """Usage:
     vis_block [-h | --help]
     vis_block status
@@ -32,19 +34,18 @@ Stage commands:
 
 # setp 4. action
 def main():
-    vis_block = VisBlock.connect(os.getenv("WHICHCOMP") == "V")
-    __doc__ = vis_block.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VisBlock, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif args["status"]:
+    vis_block = VisBlock.connect(local=local)
+    if args["status"]:
         posn, status = vis_block.get_status()
         print(status)
     elif args["<pos>"]:
         vis_block.move_configuration_name(args["<pos>"])
-    vis_block.update_keys(posn)
 
 
 if __name__ == "__main__":
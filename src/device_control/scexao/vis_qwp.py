@@ -2,8 +2,9 @@ import os
 import sys
 
 from docopt import docopt
-from swmain.redis import update_keys
 
+from device_control.cli import get_help, run_move
+from device_control.keywords import update_keys
 from device_control.multi_device import MultiDevice
 
 
@@ -24,21 +25,23 @@ class VisQWP(MultiDevice):
     def _update_keys(self, positions):
         _, name = self.get_configuration(positions=positions)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value']['1'], c['value']['2'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value']['1'], c['value']['2'])}"
+            for c in configurations
         )
         return f"""Usage:
     vis_qwp [-h | --help]
     vis_qwp (status|home|stop)
-    vis_qwp [--save] <configuration>
-    vis_qwp 1 (status|position|home|goto|nudge|stop|reset|cont) [<pos>]
-    vis_qwp 2 (status|position|home|goto|nudge|stop|reset|cont) [<pos>]
+    vis_qwp [-w | --wait | --no-wait] [--save] <configuration>
+    vis_qwp [-w | --wait | --no-wait] 1 (status|position|home|goto|nudge|stop|reset|cont) [<pos>]
+    vis_qwp [-w | --wait | --no-wait] 2 (status|position|home|goto|nudge|stop|reset|cont) [<pos>]
 
 Options:
     -h, --help   Show this screen
-    -w, --wait   Block command until position has been reached, for applicable commands
+    -w, --wait   Block command until position has been reached, for applicable commands (default)
+    --no-wait    Return as soon as the move has started
 
 Stage commands:
     status          Returns the current status of the QWP wheel
@@ -57,17 +60,13 @@ Configurations:
 # setp 4. action
 def main():
     local = os.getenv("WHICHCOMP") == "2"
-    vis_qwp = VisQWP.connect(local=local)
-    __doc__ = vis_qwp.help_message()
+    __doc__ = get_help(VisQWP, local=local)
     args = docopt(__doc__, options_first=True)
-    posns = None
-    if len(sys.argv) == 1:
-        print(__doc__)
-        return
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif len(sys.argv) == 2 and args["status"]:
+    vis_qwp = VisQWP.connect(local=local)
+    if len(sys.argv) == 2 and args["status"]:
         posns, status = vis_qwp.get_status()
         print(status)
         return
@@ -86,25 +85,35 @@ def main():
             try:
                 config_idx = int(args["<configuration>"])
             except ValueError:
+                # resolved by the device, never from the cached configurations
                 config_idx = vis_qwp.get_config_index_from_name(args["<configuration>"])
             vis_qwp.save_configuration(index=config_idx)
         else:
-            vis_qwp.move_configuration(args["<configuration>"])
+            run_move(
+                vis_qwp,
+                "move_configuration",
+                args["<configuration>"],
+                wait=not args["--no-wait"],
+                local=local,
+            )
     if args["status"] or args["position"]:
         print(vis_qwp.get_position(substage))
     elif args["home"]:
         vis_qwp.home(substage)
     elif args["goto"]:
         new_pos = float(args["<pos>"])
-        vis_qwp.move_absolute(substage, new_pos)
+        run_move(
+            vis_qwp, "move_absolute", substage, new_pos, wait=not args["--no-wait"], local=local
+        )
     elif args["nudge"]:
         rel_pos = float(args["<pos>"])
-        vis_qwp.move_relative(substage, rel_pos)
+        run_move(
+            vis_qwp, "move_relative", substage, rel_pos, wait=not args["--no-wait"], local=local
+        )
     elif args["stop"]:
         vis_qwp.stop(substage)
     elif args["reset"]:
         substage.reset()
-    vis_qwp.update_keys(posns)
 
 
 if __name__ == "__main__":
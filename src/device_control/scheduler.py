@@ -0,0 +1,69 @@
+import itertools
+import queue
+import threading
+from concurrent import futures
+
+__all__ = ["PortScheduler", "get_scheduler"]
+
+
+class PortScheduler:
+    """
+    Command scheduler for one physical port.
+
+    A single owner thread executes every transaction for the port, taking requests from a priority
+    queue. Requests with the same priority run in arrival order, so the short queries of one device
+    interleave fairly with the motion polling of another device on the same chain, and a `HIGH`
+    priority request (e.g. `stop`) jumps ahead of anything still waiting.
+    """
+
+    HIGH = 0
+    NORMAL = 10
+    LOW = 20
+
+    def __init__(self, port: str):
+        self.port = port
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._thread = threading.Thread(target=self._run, name=f"port:{port}", daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, priority=NORMAL, **kwargs) -> futures.Future:
+        future = futures.Future()
+        if threading.current_thread() is self._thread:
+            # already on the owner thread (nested transaction), run it straight away
+            self._execute(future, func, args, kwargs)
+        else:
+            self._queue.put((priority, next(self._counter), future, func, args, kwargs))
+        return future
+
+    def call(self, func, *args, priority=NORMAL, timeout=None, **kwargs):
+        """Run `func(*args, **kwargs)` on the owner thread and return its result"""
+        return self.submit(func, *args, priority=priority, **kwargs).result(timeout)
+
+    @staticmethod
+    def _execute(future, func, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _run(self):
+        while True:
+            _, _, future, func, args, kwargs = self._queue.get()
+            self._execute(future, func, args, kwargs)
+
+
+_SCHEDULERS: dict[str, PortScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(port: str) -> PortScheduler:
+    """Return the scheduler owning `port`, starting its thread on first use"""
+    with _SCHEDULERS_LOCK:
+        if port not in _SCHEDULERS:
+            _SCHEDULERS[port] = PortScheduler(port)
+        return _SCHEDULERS[port]
@@ -1,23 +1,25 @@
+import threading
+from concurrent import futures
+
 import click
 from scxconf import pyrokeys as pk
 from swmain.network.pyroclient import connect
 
+from device_control.pyro_keys import DAEMONS
 
-def check_connection(device_name: str):
-    try:
-        print(f"Checking {device_name}")
-        print(f"Checking {device_name}")
-        connect(device_name)
-    except Exception:
-        return False
-    return True
+# seconds allowed for each remote call
+DEFAULT_TIMEOUT = 5
 
 
-def check_needs_homed(device_name: str, sub=None) -> bool:
-    device = connect(device_name)
-    if sub is not None:
-        return device.needs_homing(sub)
-    return device.needs_homing()
+def check_connection(device_name: str, timeout=DEFAULT_TIMEOUT):
+    """Return a proxy for the device, or None if it cannot be reached"""
+    try:
+        device = connect(device_name)
+        device._pyroTimeout = timeout
+        device._pyroBind()
+    except Exception:
+        return None
+    return device
 
 
 ALL_CONEX_DEVICES = [
@@ -36,21 +38,100 @@ ALL_CONEX_DEVICES = [
     # (pk.VISWFS.RS2, None),
 ]
 
+# daemons serving the devices above
+ALL_DAEMONS = [
+    DAEMONS.VAMPIRES,
+    DAEMONS.SCEXAO2,
+    # DAEMONS.VISWFS,
+]
+
+
+def _check_daemon(daemon_key, timeout=DEFAULT_TIMEOUT):
+    """
+    Return the statuses of every device of a daemon keyed by Pyro key, with `needs_homing`, from a
+    single call to its bulk status endpoint. None if the daemon cannot be reached.
+    """
+    daemon = check_connection(daemon_key, timeout=timeout)
+    if daemon is None:
+        return None
+    statuses = daemon.get_status_all(homing=True)
+    return {status["pyro_key"]: status for status in statuses.values()}
+
+
+def _start_check(daemon_key, timeout=DEFAULT_TIMEOUT) -> futures.Future:
+    # on a daemon thread, so a call hung past its deadline can't keep the interpreter alive at exit
+    future = futures.Future()
+
+    def run():
+        try:
+            future.set_result(_check_daemon(daemon_key, timeout=timeout))
+        except Exception as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name=f"check-{daemon_key}", daemon=True).start()
+    return future
+
+
+def _homing_result(status, sub=None) -> str:
+    """Summarize the `get_status_all` entry of a device, or of its sub-device `sub`"""
+    if status is None:
+        return "not connected"
+    if not status["ok"]:
+        return f"error: {status['error'].split(':')[0]}"
+    needs_homing = status["needs_homing"]
+    if isinstance(needs_homing, dict):
+        # multi-axis device, either one axis or any of them
+        if sub is None:
+            needs_homing = any(needs_homing.values())
+        elif sub not in needs_homing:
+            return "error: no such sub-device"
+        else:
+            needs_homing = needs_homing[sub]
+    return "needs homed" if needs_homing else "ok"
+
+
+def run_checks(device_list=ALL_CONEX_DEVICES, daemons=ALL_DAEMONS, timeout=DEFAULT_TIMEOUT) -> list:
+    """
+    Check every device and return `(device_name, result)` rows in the order of `device_list`.
+
+    Each daemon is asked for the status of all its devices in one call, and the daemons are
+    queried concurrently. Devices which no reachable daemon serves are "not connected".
+    """
+    tasks = {key: _start_check(key, timeout=timeout) for key in daemons}
+    statuses = {}
+    timed_out = False
+    for task in tasks.values():
+        # connecting, binding and the bulk call, each bounded by `timeout`
+        try:
+            statuses.update(task.result(timeout * 3) or {})
+        except futures.TimeoutError:
+            timed_out = True
+        except Exception:
+            pass
+    rows = []
+    for pyro_key, sub in device_list:
+        device_name = pyro_key if sub is None else f"{pyro_key}:{sub}"
+        if pyro_key not in statuses and timed_out:
+            rows.append((device_name, "timed out"))
+        else:
+            rows.append((device_name, _homing_result(statuses.get(pyro_key), sub)))
+    return rows
+
+
+RESULT_COLORS = {"ok": "green", "needs homed": "red", "not connected": "blue"}
+
 
 @click.command("check_devices")
-def check_devices(device_list=ALL_CONEX_DEVICES):
-    for device in device_list:
-        is_connected = check_connection(device[0])
-        if not is_connected:
-            click.secho(f"{device[0]} is not connected to PyRO server", bg="blue", fg="black")
-            continue
-        needs_homed = check_needs_homed(*device)
-        if needs_homed:
-            device_name = device[0]
-            if device[1] is not None:
-                device_name += device[1]
-            click.secho(f"{device_name} needs homed!", bg="red", fg="black")
-    click.echo("Finished checking devices")
+@click.option("-t", "--timeout", default=DEFAULT_TIMEOUT, help="Timeout for each remote call (s)")
+def check_devices(timeout=DEFAULT_TIMEOUT, device_list=ALL_CONEX_DEVICES):
+    rows = run_checks(device_list, timeout=timeout)
+    width = max(len(name) for name, _ in rows)
+    click.echo(f"{'DEVICE':<{width}}  STATUS")
+    for device_name, result in rows:
+        click.echo(f"{device_name:<{width}}  ", nl=False)
+        click.secho(result, fg=RESULT_COLORS.get(result, "yellow"))
+    n_ok = sum(result == "ok" for _, result in rows)
+    click.echo(f"Finished checking devices: {n_ok}/{len(rows)} ok")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,258 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from importlib.metadata import entry_points
+from pathlib import Path
+
+from docopt import docopt
+
+from device_control import cli
+
+__all__ = ["COMMANDS", "run_command", "DevctlAgent", "send_request", "main"]
+
+SOCKET_PATH = Path(
+    os.getenv(
+        "DEVCTL_SOCKET", Path(os.getenv("XDG_RUNTIME_DIR", "/tmp")) / f"devctl-{os.getuid()}.sock"
+    )
+)
+# seconds to wait for a freshly started agent to listen
+START_TIMEOUT = 10
+# environment of the client applied while the agent runs its command (local vs remote mode)
+FORWARD_ENV = ("WHICHCOMP",)
+MODULE = "device_control.scripts.devctl"
+
+
+def _load_commands() -> dict:
+    # every console script of the package except the daemons and devctl itself
+    commands = {}
+    for ep in entry_points(group="console_scripts"):
+        if not ep.value.startswith("device_control.") or ep.value.startswith(
+            ("device_control.daemons.", MODULE)
+        ):
+            continue
+        commands[ep.name] = ep
+    return commands
+
+
+COMMANDS = _load_commands()
+
+
+@contextlib.contextmanager
+def _environ(env: dict):
+    old_env = {key: os.environ.get(key) for key in env}
+    os.environ.update({key: value for key, value in env.items() if value is not None})
+    for key in (key for key, value in env.items() if value is None):
+        os.environ.pop(key, None)
+    try:
+        yield
+    finally:
+        for key, value in old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_command(argv: list[str], env: dict | None = None) -> tuple[int, str, str]:
+    """
+    Run the console script `argv[0]` with arguments `argv[1:]` in this process, and return its exit
+    code and captured stdout and stderr. The scripts read `sys.argv` and print, so commands must not
+    run concurrently.
+    """
+    name = argv[0]
+    if name not in COMMANDS:
+        return 1, "", f"devctl: unknown command '{name}'\n"
+    stdout, stderr = io.StringIO(), io.StringIO()
+    old_argv = sys.argv
+    sys.argv = list(argv)
+    code = 0
+    try:
+        with (
+            _environ(env or {}),
+            contextlib.redirect_stdout(stdout),
+            contextlib.redirect_stderr(stderr),
+        ):
+            COMMANDS[name].load()()
+    except SystemExit as exc:
+        # docopt exits with the usage text, click with a code
+        if isinstance(exc.code, str):
+            stderr.write(exc.code + "\n")
+            code = 1
+        else:
+            code = exc.code or 0
+    except Exception as exc:
+        stderr.write(f"{name}: {type(exc).__name__}: {exc}\n")
+        code = 1
+        # most likely a daemon went away; reconnect on the next command
+        cli.forget_proxies()
+    finally:
+        sys.argv = old_argv
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        if request.get("stop", False):
+            response = {"code": 0, "stdout": "devctl agent stopped\n", "stderr": ""}
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif request.get("status", False):
+            response = {"code": 0, "stdout": self.server.status_message(), "stderr": ""}
+        else:
+            with self.server.command_lock:
+                code, stdout, stderr = run_command(request["argv"], env=request.get("env"))
+                self.server.n_commands += 1
+            response = {"code": code, "stdout": stdout, "stderr": stderr}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class DevctlAgent(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Local agent for `devctl`.
+
+    Runs the console scripts inside one long-lived process, listening on a Unix socket, so modules
+    stay imported and Pyro proxies and configurations stay warm between commands (see
+    `cli.keep_warm`). Requests are newline-terminated JSON with the script `argv`.
+
+    Each connection is handled on its own thread, but the commands themselves run one at a time
+    under `command_lock`, since the scripts share `sys.argv` and stdout (see `run_command`). The
+    `status` and `stop` requests don't take the lock, so they are answered even while a long
+    command (e.g. a move) is running.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path=SOCKET_PATH):
+        self.path = Path(path)
+        self.started = time.time()
+        self.n_commands = 0
+        self.command_lock = threading.Lock()
+        # a socket file left over by an agent which didn't shut down cleanly
+        if self.path.exists() and send_request({"status": True}, path=self.path) is None:
+            self.path.unlink()
+        super().__init__(str(self.path), _Handler)
+        self.path.chmod(0o600)
+        cli.keep_warm()
+
+    def status_message(self) -> str:
+        proxies = cli.warm_proxies()
+        return (
+            f"devctl agent pid {os.getpid()} on {self.path}\n"
+            f"up {time.time() - self.started:.0f} s, {self.n_commands} commands served\n"
+            f"proxies: {', '.join(proxies) or 'none'}\n"
+        )
+
+    def server_close(self):
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+
+def send_request(request: dict, path=SOCKET_PATH) -> dict | None:
+    """Send one request to the agent and return its response, or None if no agent is listening"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as fh:
+            line = fh.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def start_agent(path=SOCKET_PATH) -> bool:
+    """Start the agent in the background, and return once it is listening"""
+    if send_request({"status": True}, path=path) is not None:
+        return True
+    env = dict(os.environ, DEVCTL_SOCKET=str(path))
+    subprocess.Popen(
+        [sys.executable, "-m", MODULE, "agent", "serve"],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if send_request({"status": True}, path=path) is not None:
+            return True
+        time.sleep(0.1)
+    return False
+
+
+__doc__ = """Usage:
+    devctl [-h | --help]
+    devctl agent (start|stop|status|serve)
+    devctl list
+    devctl [-l | --local] <command> [<args>...]
+
+Options:
+    -h, --help      Show this screen
+    -l, --local     Run the command in this process, even if the agent is running
+
+Commands:
+    <command>       Any of the device console scripts (see `devctl list`), e.g.
+                    `devctl vampires_filter Open`. Runs in the agent when it is running.
+    agent start     Start the agent in the background
+    agent stop      Stop the agent
+    agent status    Show the agent status and the proxies it holds
+    agent serve     Run the agent in the foreground
+    list            List the available commands
+
+The agent keeps modules imported and Pyro proxies and configurations warm, so scripted
+sequences of many device commands don't pay for interpreter startup and name server lookups
+on every command. Its socket is $DEVCTL_SOCKET (default $XDG_RUNTIME_DIR/devctl-<uid>.sock)."""
+
+
+def main():
+    args = docopt(__doc__, options_first=True)
+    if len(sys.argv) == 1:
+        print(__doc__)
+        return
+    if args["list"]:
+        print("\n".join(sorted(COMMANDS)))
+        return
+    if args["agent"]:
+        if args["serve"]:
+            with DevctlAgent() as agent:
+                agent.serve_forever()
+        elif args["start"]:
+            if not start_agent():
+                print(f"devctl agent did not start listening on {SOCKET_PATH}", file=sys.stderr)
+                sys.exit(1)
+        elif args["stop"]:
+            if send_request({"stop": True}) is None:
+                print("devctl agent is not running")
+        elif args["status"]:
+            response = send_request({"status": True})
+            print("devctl agent is not running" if response is None else response["stdout"], end="")
+        return
+    argv = [args["<command>"], *args["<args>"]]
+    response = None
+    if not args["--local"]:
+        env = {key: os.getenv(key) for key in FORWARD_ENV}
+        response = send_request({"argv": argv, "env": env})
+    if response is None:
+        code, stdout, stderr = run_command(argv)
+    else:
+        code, stdout, stderr = response["code"], response["stdout"], response["stderr"]
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
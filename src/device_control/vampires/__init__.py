@@ -1,16 +1,23 @@
-from .vampires_beamsplitter import VAMPIRESBeamsplitter
-from .vampires_diffwheel import VAMPIRESDiffWheel
-from .vampires_fieldstop import VAMPIRESFieldstop
-from .vampires_filter import VAMPIRESFilter
-from .vampires_flc import VAMPIRESFLCStage
-from .vampires_focus import VAMPIRESFocus
-from .vampires_mask import VAMPIRESMaskWheel
-from .vampires_mbi import VAMPIRESMBIWheel
-from .vampires_pupil import VAMPIRESPupilLens
-from .vampires_tc import VAMPIRESTC
-from .vampires_trigger import VAMPIRESTrigger
+from typing import TYPE_CHECKING
 
-__all__ = (
+from device_control.lazy import lazy_exports
+
+# submodules are only imported when one of their classes is first used
+_EXPORTS = {
+    "VAMPIRESBeamsplitter": ".vampires_beamsplitter",
+    "VAMPIRESDiffWheel": ".vampires_diffwheel",
+    "VAMPIRESFieldstop": ".vampires_fieldstop",
+    "VAMPIRESFilter": ".vampires_filter",
+    "VAMPIRESFLCStage": ".vampires_flc",
+    "VAMPIRESFocus": ".vampires_focus",
+    "VAMPIRESMaskWheel": ".vampires_mask",
+    "VAMPIRESMBIWheel": ".vampires_mbi",
+    "VAMPIRESPupilLens": ".vampires_pupil",
+    "VAMPIRESTC": ".vampires_tc",
+    "VAMPIRESTrigger": ".vampires_trigger",
+}
+
+__all__ = [
     "VAMPIRESBeamsplitter",
     "VAMPIRESDiffWheel",
     "VAMPIRESFieldstop",
@@ -22,4 +29,18 @@ __all__ = (
     "VAMPIRESPupilLens",
     "VAMPIRESTC",
     "VAMPIRESTrigger",
-)
+]
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .vampires_beamsplitter import VAMPIRESBeamsplitter
+    from .vampires_diffwheel import VAMPIRESDiffWheel
+    from .vampires_fieldstop import VAMPIRESFieldstop
+    from .vampires_filter import VAMPIRESFilter
+    from .vampires_flc import VAMPIRESFLCStage
+    from .vampires_focus import VAMPIRESFocus
+    from .vampires_mask import VAMPIRESMaskWheel
+    from .vampires_mbi import VAMPIRESMBIWheel
+    from .vampires_pupil import VAMPIRESPupilLens
+    from .vampires_tc import VAMPIRESTC
+    from .vampires_trigger import VAMPIRESTrigger
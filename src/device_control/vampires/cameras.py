@@ -1,7 +1,18 @@
-from swmain.network.pyroclient import connect
+import atexit
+import logging
+import threading
+import time
+
+__all__ = ["connect_cameras", "CameraKeywordPusher", "push_camera_keywords"]
+
+logger = logging.getLogger(__name__)
+
+CAMERA_KEYS = ("VCAM1", "VCAM2")
 
 
 def connect_cameras():
+    from swmain.network.pyroclient import connect
+
     try:
         vcam1 = connect("VCAM1")
         vcam1.get_tint()
@@ -13,3 +24,95 @@ def connect_cameras():
     except Exception:
         vcam2 = None
     return vcam1, vcam2
+
+
+class CameraKeywordPusher:
+    """
+    Pushes FITS keywords to the VAMPIRES cameras from a background thread.
+
+    `push` only queues the keywords (the latest value per camera and keyword wins) so callers,
+    e.g. a motion loop, never wait on camera RPCs. The pusher keeps one cached Pyro proxy
+    per camera, re-checks its health with `get_tint()` every `health_interval` seconds and drops it
+    on any failure, and waits `retry_interval` seconds before reconnecting an unreachable camera.
+    """
+
+    def __init__(self, cam_keys=CAMERA_KEYS, health_interval=30, retry_interval=10):
+        self.cam_keys = cam_keys
+        self.health_interval = health_interval
+        self.retry_interval = retry_interval
+        # proxies are only ever touched while holding the push lock
+        self._proxies = {}
+        self._checked = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._push_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def push(self, keywords: dict, cams=None):
+        """Queue keywords for the given camera keys (default all cameras)"""
+        if cams is None:
+            cams = self.cam_keys
+        with self._lock:
+            for cam in cams:
+                self._pending.setdefault(cam, {}).update(keywords)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="camera-keywords", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def _get_proxy(self, cam):
+        now = time.monotonic()
+        proxy = self._proxies.get(cam)
+        if now - self._checked.get(cam, -float("inf")) < (
+            self.health_interval if proxy is not None else self.retry_interval
+        ):
+            return proxy
+        self._checked[cam] = now
+        try:
+            if proxy is None:
+                from swmain.network.pyroclient import connect
+
+                proxy = connect(cam)
+            proxy.get_tint()
+        except Exception:
+            logger.debug("camera %s is not available", cam)
+            proxy = None
+        self._proxies[cam] = proxy
+        return proxy
+
+    def flush(self):
+        """Push everything queued so far from the calling thread"""
+        with self._push_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for cam, keywords in pending.items():
+                proxy = self._get_proxy(cam)
+                if proxy is None:
+                    continue
+                try:
+                    for key, value in keywords.items():
+                        proxy.set_keyword(key, value)
+                except Exception:
+                    logger.exception(f"Unable to push keywords to cam {cam}")
+                    # force a reconnect on the next push
+                    self._proxies[cam] = None
+                    self._checked.pop(cam, None)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.flush()
+
+
+_PUSHER = CameraKeywordPusher()
+# short-lived CLI processes shouldn't lose their last keywords
+atexit.register(_PUSHER.flush)
+
+
+def push_camera_keywords(keywords: dict, cams=None):
+    """Queue FITS keywords for the VAMPIRES cameras without waiting on them"""
+    _PUSHER.push(keywords, cams=cams)
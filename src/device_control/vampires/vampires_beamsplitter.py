@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import CONEXDevice
+from device_control.keywords import update_keys
 
 
 class VAMPIRESBeamsplitter(CONEXDevice):
@@ -22,19 +23,16 @@ class VAMPIRESBeamsplitter(CONEXDevice):
     CONF = "vampires/conf_vampires_beamsplitter.toml"
     PYRO_KEY = VAMPIRES.BS
     format_str = "{0}: {1:15s} {{{2:5.01f} deg}}"
+    PERIOD = 360
 
     def _update_keys(self, theta):
         _, name = self.get_configuration(position=theta)
         update_keys(U_BS=name, U_BSTH=theta)
 
-    def _move_absolute(self, value: float):
-        # make sure to mod360 the input value
-        return super()._move_absolute(value % 360)
-
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     vampires_beamsplitter [-h | --help]
@@ -58,13 +56,13 @@ Configurations:
 
 
 def main():
-    beamsplitter = VAMPIRESBeamsplitter.connect(local=os.getenv("WHICHCOMP") == "V")
-    __doc__ = beamsplitter.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESBeamsplitter, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
+    beamsplitter = VAMPIRESBeamsplitter.connect(local=local)
     if args["status"]:
         posn, status = beamsplitter.get_status()
         print(status)
@@ -85,7 +83,6 @@ def main():
         beamsplitter.reset()
     elif args["<configuration>"]:
         beamsplitter.move_configuration(args["<configuration>"])
-    beamsplitter.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -4,21 +4,20 @@ import sys
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
 
-# Requires scxconf and will fetch the IP addresses there.
-from swmain.redis import update_keys
-
+from device_control.cli import get_help
 from device_control.drivers import CONEXDevice
-from device_control.vampires.cameras import connect_cameras
+from device_control.keywords import update_keys
+from device_control.vampires.cameras import push_camera_keywords
 
 
 class VAMPIRESDiffWheel(CONEXDevice):
     CONF = "vampires/conf_vampires_diffwheel.toml"
     PYRO_KEY = VAMPIRES.DIFF
     format_str = "{0}: {1:22s} {{{2:5.01f} deg}}"
+    PERIOD = 360
 
     def __init__(self, device_address=1, delay=0.1, **kwargs):
         super().__init__(device_address, delay, **kwargs)
-        self.cams = connect_cameras()
 
     def _update_keys(self, theta):
         _, status = self.get_configuration(position=theta)
@@ -27,17 +26,13 @@ class VAMPIRESDiffWheel(CONEXDevice):
         else:
             state1, state2 = status.split(" / ")
         update_keys(U_DIFFL1=state1, U_DIFFL2=state2, U_DIFFTH=theta)
-        for cam, state in zip(self.cams, (state1, state2)):
-            if cam is not None:
-                cam.set_keyword("FILTER02", state)
-
-    def _move_absolute(self, value: float):
-        return super()._move_absolute(value % 360)
+        push_camera_keywords({"FILTER02": state1}, cams=("VCAM1",))
+        push_camera_keywords({"FILTER02": state2}, cams=("VCAM2",))
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     vampires_diff [-h | --help]
@@ -62,12 +57,13 @@ Configurations (cam1 / cam2):
 
 # setp 4. action
 def main():
-    vampires_diffwheel = VAMPIRESDiffWheel.connect(os.getenv("WHICHCOMP") == "V")
-    __doc__ = vampires_diffwheel.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESDiffWheel, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
+        return
+    vampires_diffwheel = VAMPIRESDiffWheel.connect(local=local)
     if args["status"]:
         posn, status = vampires_diffwheel.get_status()
         print(status)
@@ -87,7 +83,6 @@ def main():
         vampires_diffwheel.reset()
     elif args["<configuration>"]:
         vampires_diffwheel.move_configuration(args["<configuration>"])
-    vampires_diffwheel.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -3,8 +3,9 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
+from device_control.keywords import update_keys
 from device_control.multi_device import MultiDevice
 
 __all__ = ["VAMPIRESFieldstop"]
@@ -26,10 +27,11 @@ class VAMPIRESFieldstop(MultiDevice):
         _, name = self.get_configuration(positions=positions)
         update_keys(U_FLDSTP=name, X_VAMFST=name)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value']['x'], c['value']['y'], c['value']['f'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value']['x'], c['value']['y'], c['value']['f'])}"
+            for c in configurations
         )
         return f"""Usage:
     vampires_fieldstop [-h | --help]
@@ -62,17 +64,16 @@ Configurations:
 
 # setp 4. action
 def main():
-    vampires_fieldstop = VAMPIRESFieldstop.connect(local=os.getenv("WHICHCOMP", None) == "V")
-    __doc__ = vampires_fieldstop.help_message()
+    local = os.getenv("WHICHCOMP", None) == "V"
+    __doc__ = get_help(VAMPIRESFieldstop, local=local)
     args = docopt(__doc__, options_first=True)
-    posns = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif len(sys.argv) == 2 and args["status"]:
+    vampires_fieldstop = VAMPIRESFieldstop.connect(local=local)
+    if len(sys.argv) == 2 and args["status"]:
         posns, status = vampires_fieldstop.get_status()
         print(status)
-        vampires_fieldstop.update_keys(posns)
         return
     elif len(sys.argv) == 2 and args["home"]:
         vampires_fieldstop.home_all()
@@ -104,7 +105,6 @@ def main():
         vampires_fieldstop.stop(substage)
     elif args["reset"]:
         vampires_fieldstop.reset(substage)
-    vampires_fieldstop.update_keys(posns)
 
 
 if __name__ == "__main__":
@@ -3,10 +3,11 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ThorlabsWheel
-from device_control.vampires.cameras import connect_cameras
+from device_control.keywords import update_keys
+from device_control.vampires.cameras import push_camera_keywords
 
 
 class VAMPIRESFilter(ThorlabsWheel):
@@ -16,19 +17,16 @@ class VAMPIRESFilter(ThorlabsWheel):
 
     def __init__(self, serial_kwargs, **kwargs):
         super().__init__(serial_kwargs, **kwargs)
-        self.cams = connect_cameras()
 
     def _update_keys(self, position):
         pos, name = self.get_configuration(position=position)
         update_keys(U_FILTER=name, U_FILTTH=pos)
-        for cam in self.cams:
-            if cam is not None:
-                cam.set_keyword("FILTER01", name)
+        push_camera_keywords({"FILTER01": name})
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     vampires_filter [-h | --help]
@@ -49,14 +47,14 @@ Configurations:
 
 # setp 4. action
 def main():
-    vampires_filter = VAMPIRESFilter.connect(os.getenv("WHICHCOMP") == "V")
-    __doc__ = vampires_filter.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESFilter, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif args["status"]:
+    vampires_filter = VAMPIRESFilter.connect(local=local)
+    if args["status"]:
         posn, status = vampires_filter.get_status()
         print(status)
     elif args["position"]:
@@ -64,7 +62,6 @@ def main():
         print(posn)
     elif args["<slot>"]:
         vampires_filter.move_configuration(args["<slot>"])
-    vampires_filter.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ZaberDevice
+from device_control.keywords import update_keys
 
 
 class VAMPIRESFLCStage(ZaberDevice):
@@ -17,10 +18,11 @@ class VAMPIRESFLCStage(ZaberDevice):
         _, name = self.get_configuration(position=position)
         update_keys(U_FLCST=name.upper(), U_FLCSTP=position)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
             f"    {VAMPIRESFLCStage.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            for c in configurations
         )
         return f"""Usage:
     vampires_focus [-h | --help]
@@ -45,12 +47,13 @@ Configurations:
 
 # setp 4. action
 def main():
-    vampires_flc = VAMPIRESFLCStage.connect(os.getenv("WHICHCOMP") == "V")
-    __doc__ = vampires_flc.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESFLCStage, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
+        return
+    vampires_flc = VAMPIRESFLCStage.connect(local=local)
     if args["status"]:
         posn, status = vampires_flc.get_status()
         print(status)
@@ -71,7 +74,6 @@ def main():
         vampires_flc.reset()
     elif args["<configuration>"]:
         vampires_flc.move_configuration(args["<configuration>"])
-    vampires_flc.update_keys(posn)
 
 
 if __name__ == "__main__":
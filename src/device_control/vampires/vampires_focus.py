@@ -3,8 +3,9 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
+from device_control.keywords import update_keys
 from device_control.multi_device import MultiDevice
 
 
@@ -22,10 +23,11 @@ class VAMPIRESFocus(MultiDevice):
         _, name = self.get_configuration(positions=positions)
         update_keys(U_FCS=name, U_CAMFCS=name)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value']['lens'], c['value']['cam'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value']['lens'], c['value']['cam'])}"
+            for c in configurations
         )
         return f"""Usage:
     vampires_focus [-h | --help]
@@ -59,14 +61,14 @@ Configurations:
 
 # setp 4. action
 def main():
-    vampires_focus = VAMPIRESFocus.connect(os.getenv("WHICHCOMP") == "V")
-    __doc__ = vampires_focus.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESFocus, local=local)
     args = docopt(__doc__, options_first=True)
-    posns = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif len(sys.argv) == 2 and args["status"]:
+    vampires_focus = VAMPIRESFocus.connect(local=local)
+    if len(sys.argv) == 2 and args["status"]:
         posns, status = vampires_focus.get_status()
         print(status)
         return
@@ -85,6 +87,7 @@ def main():
             try:
                 config_idx = int(args["<configuration>"])
             except ValueError:
+                # resolved by the device, never from the cached configurations
                 config_idx = vampires_focus.get_config_index_from_name(args["<configuration>"])
             vampires_focus.save_configuration(index=config_idx)
         else:
@@ -103,7 +106,6 @@ def main():
         vampires_focus.stop(substage)
     elif args["reset"]:
         substage.reset()
-    vampires_focus.update_keys(posns)
 
 
 if __name__ == "__main__":
@@ -3,8 +3,9 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
+from device_control.keywords import update_keys
 from device_control.multi_device import MultiDevice
 
 
@@ -15,6 +16,8 @@ class VAMPIRESMaskWheel(MultiDevice):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # plan shortest-arc moves and wrap the reported angle of the rotation stage
+        self.devices["theta"].PERIOD = 360
         self.devices["x"]._update_keys = lambda p: update_keys(U_MASKX=p)
         self.devices["y"]._update_keys = lambda p: update_keys(U_MASKY=p)
         self.devices["theta"]._update_keys = lambda p: update_keys(U_MASKTH=p)
@@ -23,15 +26,11 @@ class VAMPIRESMaskWheel(MultiDevice):
         _, name = self.get_configuration(positions=positions)
         update_keys(U_MASK=name)
 
-    def move_absolute(self, name, value, **kwargs):
-        if name == "theta":
-            value %= 360
-        return super().move_absolute(name, value, **kwargs)
-
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value']['x'], c['value']['y'], c['value']['theta'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value']['x'], c['value']['y'], c['value']['theta'])}"
+            for c in configurations
         )
         return f"""Usage:
     vampires_mask [-h | --help]
@@ -65,17 +64,16 @@ Configurations:
 
 # setp 4. action
 def main():
-    vampires_mask = VAMPIRESMaskWheel.connect(os.getenv("WHICHCOMP") == "V")
-    __doc__ = vampires_mask.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESMaskWheel, local=local)
     args = docopt(__doc__, options_first=True)
-    posns = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif len(sys.argv) == 2 and args["status"]:
+    vampires_mask = VAMPIRESMaskWheel.connect(local=local)
+    if len(sys.argv) == 2 and args["status"]:
         posns, status = vampires_mask.get_status()
         print(status)
-        vampires_mask.update_keys(posns)
         return
     elif len(sys.argv) == 2 and args["home"]:
         vampires_mask.home_all()
@@ -106,7 +104,6 @@ def main():
         vampires_mask.stop(substage)
     elif args["reset"]:
         substage.reset()
-    vampires_mask.update_keys(posns)
 
 
 if __name__ == "__main__":
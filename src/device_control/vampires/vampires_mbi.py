@@ -3,27 +3,26 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import CONEXDevice
+from device_control.keywords import update_keys
 
 
 class VAMPIRESMBIWheel(CONEXDevice):
     CONF = "vampires/conf_vampires_mbi.toml"
     PYRO_KEY = VAMPIRES.MBI
     format_str = "{0}: {1:15s} {{{2:6.02f} deg}}"
+    PERIOD = 360
 
     def _update_keys(self, theta):
         _, name = self.get_configuration(position=theta)
         update_keys(U_MBI=name, U_MBITH=theta)
 
-    def _move_absolute(self, value: float):
-        return super()._move_absolute(value % 360)
-
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     vampires_mbi [-h | --help]
@@ -47,13 +46,13 @@ Configurations:
 
 
 def main():
-    vampires_mbi = VAMPIRESMBIWheel.connect(os.getenv("WHICHCOMP") == "V")
-    __doc__ = vampires_mbi.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESMBIWheel, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
+    vampires_mbi = VAMPIRESMBIWheel.connect(local=local)
     if args["status"]:
         posn, status = vampires_mbi.get_status()
         print(status)
@@ -74,7 +73,6 @@ def main():
         vampires_mbi.reset()
     elif args["<configuration>"]:
         vampires_mbi.move_configuration(args["<configuration>"])
-    vampires_mbi.update_keys(posn)
 
 
 if __name__ == "__main__":
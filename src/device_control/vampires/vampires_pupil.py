@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ThorlabsFlipMount
+from device_control.keywords import update_keys
 
 
 class VAMPIRESPupilLens(ThorlabsFlipMount):
@@ -17,7 +18,8 @@ class VAMPIRESPupilLens(ThorlabsFlipMount):
         _, state = self.get_configuration(position)
         update_keys(U_PUPST=state.upper())
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         return """Usage:
     vampires_pupil [-h | --help]
     vampires_pupil status
@@ -33,19 +35,18 @@ Stage commands:
 
 # setp 4. action
 def main():
-    vampires_pupil = VAMPIRESPupilLens.connect(os.getenv("WHICHCOMP") == "V")
-    __doc__ = vampires_pupil.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESPupilLens, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif args["status"]:
+    vampires_pupil = VAMPIRESPupilLens.connect(local=local)
+    if args["status"]:
         posn, status = vampires_pupil.get_status()
         print(status)
     elif args["<pos>"]:
         vampires_pupil.move_configuration_name(args["<pos>"])
-    vampires_pupil.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ThorlabsTC
+from device_control.keywords import update_keys
 
 
 class VAMPIRESTC(ThorlabsTC):
@@ -19,7 +20,8 @@ class VAMPIRESTC(ThorlabsTC):
         self.logger.info("%f unit=degC target=%s", temperature, self.get_target())
         update_keys(U_FLCTMP=temperature)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         return """Usage:
     vampires_tc [-h | --help]
     vampires_tc (status|temp|enable|disable)
@@ -38,13 +40,14 @@ Stage commands:
 
 # setp 4. action
 def main():
-    vampires_tc = VAMPIRESTC.connect(local=os.getenv("WHICHCOMP") == "V")
-    __doc__ = vampires_tc.help_message()
+    local = os.getenv("WHICHCOMP") == "V"
+    __doc__ = get_help(VAMPIRESTC, local=local)
     args = docopt(__doc__, options_first=True)
-    temperature = None
     if len(sys.argv) == 1:
         print(__doc__)
-    elif args["status"]:
+        return
+    vampires_tc = VAMPIRESTC.connect(local=local)
+    if args["status"]:
         temperature, status = vampires_tc.get_status()
         print(status)
     elif args["temp"]:
@@ -55,7 +58,6 @@ def main():
         vampires_tc.disable()
     elif args["<setpoint>"]:
         vampires_tc.set_target(float(args["<setpoint>"]))
-    vampires_tc.update_keys(temperature)
 
 
 if __name__ == "__main__":
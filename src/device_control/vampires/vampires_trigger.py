@@ -2,14 +2,22 @@ import os
 import subprocess
 import time
 
-import astropy.units as u
 import click
-import usb.core
-import usb.util
 from scxconf.pyrokeys import VAMPIRES
-from swmain.redis import update_keys
 
 from device_control.base import ConfigurableDevice
+from device_control.keywords import update_keys
+from device_control.poller import snapshot_status
+
+
+def _microseconds(value) -> int:
+    """Convert an astropy `Quantity` or a plain number of microseconds to an int"""
+    if hasattr(value, "unit"):
+        # astropy is slow to import, only load it when a quantity is actually given
+        import astropy.units as u
+
+        return int(value.to(u.us).value)
+    return int(value)
 
 
 class ArduinoError(RuntimeError):
@@ -38,13 +46,9 @@ class VAMPIRESTrigger(ConfigurableDevice):
         super().__init__(serial_kwargs=def_serial_kwargs, **kwargs)
         self.reset_switch = VAMPIRESInlineUSBReset(serial="YKD6404")
 
-        if isinstance(pulse_width, u.Quantity):
-            self.pulse_width = int(pulse_width.to(u.us).value)
-        if isinstance(flc_offset, u.Quantity):
-            self.flc_offset = int(flc_offset.to(u.us).value)
         self.enabled = False
-        self.pulse_width = int(pulse_width)
-        self.flc_offset = int(flc_offset)
+        self.pulse_width = _microseconds(pulse_width)
+        self.flc_offset = _microseconds(flc_offset)
         self.flc_enabled = flc_enabled
         self.sweep_mode = sweep_mode
 
@@ -59,42 +63,35 @@ class VAMPIRESTrigger(ConfigurableDevice):
                 raise ArduinoError(response.decode().strip())
 
     def ask_command(self, command):
-        with self.serial as serial:
+        def ask(serial):
             serial.write(f"{command}\n".encode())
-            response = serial.readline().decode().strip()
-            if len(response) == 0:
-                msg = 'Arduino did not respond within timeout, which suggests it is locked up waiting for a "ready" response from the cameras. Try resetting the trigger.'
-                raise ArduinoTimeoutError(msg)
-            return response
+            return serial.readline().decode().strip()
+
+        response = self.serial.transaction(ask, retry=True)
+        if len(response) == 0:
+            msg = 'Arduino did not respond within timeout, which suggests it is locked up waiting for a "ready" response from the cameras. Try resetting the trigger.'
+            raise ArduinoTimeoutError(msg)
+        return response
 
     def get_jitter_half_width(self) -> int:
         return self.jitter_half_width
 
     def set_jitter_half_width(self, value):
-        if isinstance(value, u.Quantity):
-            self.jitter_half_width = int(self.jitter_half_width.to(u.us).value)
-        else:
-            self.jitter_half_width = int(value)
+        self.jitter_half_width = _microseconds(value)
         self.set_parameters()
 
     def get_pulse_width(self) -> int:
         return self.pulse_width
 
     def set_pulse_width(self, value):
-        if isinstance(value, u.Quantity):
-            self.pulse_width = int(self.pulse_width.to(u.us).value)
-        else:
-            self.pulse_width = int(value)
+        self.pulse_width = _microseconds(value)
         self.set_parameters()
 
     def get_flc_offset(self) -> int:
         return self.flc_offset
 
     def set_flc_offset(self, value):
-        if isinstance(value, u.Quantity):
-            self.flc_offset = int(self.flc_offset.to(u.us).value)
-        else:
-            self.flc_offset = int(value)
+        self.flc_offset = _microseconds(value)
         self.set_parameters()
 
     def is_flc_enabled(self) -> bool:
@@ -153,6 +150,7 @@ class VAMPIRESTrigger(ConfigurableDevice):
         trigger_mode = int(flc_enabled) + (int(sweep_mode) << 1)
         cmd = f"1 {pulse_width:d} {flc_offset:d} {jitter_half_width:d} {trigger_mode:d}"
         self.send_command(cmd)
+        self.invalidate_status()
         params = dict(
             enabled=self.enabled,
             pulse_width=pulse_width,
@@ -165,12 +163,14 @@ class VAMPIRESTrigger(ConfigurableDevice):
     def disable(self):
         self.send_command(2)
         self.enabled = False
+        self.invalidate_status()
         self.update_keys(self.enabled)
 
     def enable(self):
         self.enabled = True
         self.update_keys(self.enabled)
         self.send_command(3)
+        self.invalidate_status()
 
     def reset(self):
         # toggle power using inline switch
@@ -178,6 +178,7 @@ class VAMPIRESTrigger(ConfigurableDevice):
         time.sleep(0.1)
         self.reset_switch.enable()
         self.enabled = False
+        self.invalidate_status()
         update_keys(U_TRIGEN=str(False))
 
     def update_keys(self, enabled=None, params=None):
@@ -200,6 +201,7 @@ class VAMPIRESTrigger(ConfigurableDevice):
     def _config_extras(self):
         return {"delay": self.delay, "pulse_width": self.pulse_width, "flc_offset": self.flc_offset}
 
+    @snapshot_status
     def get_status(self):
         switch_status = self.reset_switch.status()
         if switch_status != "ON":
@@ -209,11 +211,19 @@ class VAMPIRESTrigger(ConfigurableDevice):
 
 
 class VAMPIRESInlineUSBReset:
+    # seconds `status` is served without running `ykushcmd`. The switch only changes through
+    # `enable`/`disable`, which update it, or by hand.
+    STATUS_TTL = 60
+
     def __init__(self, serial=None):
         self.serial = serial
+        self._status = None
+        self._status_time = -float("inf")
         self.outaddr = 0x1
         self.inaddr = 0x81
         self.bufsize = 64
+        import usb.core
+
         self.device = usb.core.find(idVendor=0x04D8, idProduct=0xF0CD)
 
     def __enter__(self):
@@ -225,6 +235,8 @@ class VAMPIRESInlineUSBReset:
         return self.device
 
     def __exit__(self, *args):
+        import usb.util
+
         usb.util.dispose_resources(self.device)
         if self._reattach:
             self.device.attach_kernel_driver(0)
@@ -241,6 +253,7 @@ class VAMPIRESInlineUSBReset:
 
     def enable(self):
         subprocess.run([f"ykushcmd ykushxs -s {self.serial} -u"], shell=True, check=True)
+        self._set_status("ON")
 
         # subprocess.run(command, shell=True, check=True)
         # reply = self.ask_command(0x11)
@@ -248,20 +261,29 @@ class VAMPIRESInlineUSBReset:
 
     def disable(self):
         subprocess.run([f"ykushcmd ykushxs -s {self.serial} -d"], shell=True, check=True)
+        self._set_status("OFF")
         # reply = self.ask_command(0x01)
         # assert reply[0] == 0x1
 
-    def status(self):
+    def _set_status(self, status):
+        self._status = status
+        self._status_time = time.monotonic()
+
+    def status(self, refresh=False):
+        # the daemon polls the trigger every few seconds, don't start a process each time
+        if not refresh and time.monotonic() - self._status_time < self.STATUS_TTL:
+            return self._status
         result = subprocess.run(
             [f"ykushcmd ykushxs -s {self.serial} -g"], shell=True, capture_output=True
         )
         retval = result.stdout.decode().strip()
         if "ON" in retval:
-            return "ON"
+            self._set_status("ON")
         elif "OFF" in retval:
-            return "OFF"
+            self._set_status("OFF")
         else:
             return "Unknown"
+        return self._status
         # reply = self.ask_command(0x21)
         # assert reply[0] == 0x1
         # if reply[1] == 0x01:
@@ -1,12 +1,19 @@
-from .viswfs_camfocus import VISWFSCamFocus
-from .viswfs_flipmount1 import VISWFSFlipMount1
-from .viswfs_flipmount2 import VISWFSFlipMount2
-from .viswfs_hwp import VISWFSHWP
-from .viswfs_pickoffBS import VISWFSPickoffBS
-from .viswfs_rs1 import VISWFSRotStage1
-from .viswfs_rs2 import VISWFSRotStage2
-from .viswfs_trombone1 import VISWFSTrombone1
-from .viswfs_trombone2 import VISWFSTrombone2
+from typing import TYPE_CHECKING
+
+from device_control.lazy import lazy_exports
+
+# submodules are only imported when one of their classes is first used
+_EXPORTS = {
+    "VISWFSPickoffBS": ".viswfs_pickoffBS",
+    "VISWFSCamFocus": ".viswfs_camfocus",
+    "VISWFSTrombone1": ".viswfs_trombone1",
+    "VISWFSTrombone2": ".viswfs_trombone2",
+    "VISWFSRotStage1": ".viswfs_rs1",
+    "VISWFSRotStage2": ".viswfs_rs2",
+    "VISWFSFlipMount1": ".viswfs_flipmount1",
+    "VISWFSFlipMount2": ".viswfs_flipmount2",
+    "VISWFSHWP": ".viswfs_hwp",
+}
 
 __all__ = [
     "VISWFSPickoffBS",
@@ -19,3 +26,15 @@ __all__ = [
     "VISWFSFlipMount2",
     "VISWFSHWP",
 ]
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .viswfs_camfocus import VISWFSCamFocus
+    from .viswfs_flipmount1 import VISWFSFlipMount1
+    from .viswfs_flipmount2 import VISWFSFlipMount2
+    from .viswfs_hwp import VISWFSHWP
+    from .viswfs_pickoffBS import VISWFSPickoffBS
+    from .viswfs_rs1 import VISWFSRotStage1
+    from .viswfs_rs2 import VISWFSRotStage2
+    from .viswfs_trombone1 import VISWFSTrombone1
+    from .viswfs_trombone2 import VISWFSTrombone2
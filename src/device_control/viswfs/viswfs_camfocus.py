@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VISWFS
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ZaberDevice
+from device_control.keywords import update_keys
 
 
 class VISWFSCamFocus(ZaberDevice):
@@ -17,10 +18,10 @@ class VISWFSCamFocus(ZaberDevice):
         _, name = self.get_configuration(position=position)
         update_keys(U_CAMFCS=name, U_CAMFCF=position)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     viswfs_camfocus [-h | --help]
@@ -45,12 +46,13 @@ Configurations:
 
 # setp 4. action
 def main():
-    viswfs_camfocus = VISWFSCamFocus.connect(os.getenv("WHICHCOMP", "") == "AORTS")
-    __doc__ = viswfs_camfocus.help_message()
+    local = os.getenv("WHICHCOMP", "") == "AORTS"
+    __doc__ = get_help(VISWFSCamFocus, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
+        return
+    viswfs_camfocus = VISWFSCamFocus.connect(local=local)
     if args["status"]:
         posn, status = viswfs_camfocus.get_status()
         print(status)
@@ -71,7 +73,6 @@ def main():
         viswfs_camfocus.reset()
     elif args["<configuration>"]:
         viswfs_camfocus.move_configuration(args["<configuration>"])
-    viswfs_camfocus.update_keys(posn)
 
 
 if __name__ == "__main__":
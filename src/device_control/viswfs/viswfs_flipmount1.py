@@ -4,9 +4,10 @@ import time
 
 from docopt import docopt
 from scxconf.pyrokeys import VISWFS
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ThorlabsFlipMount
+from device_control.keywords import update_keys
 
 
 class VISWFSFlipMount1(ThorlabsFlipMount):
@@ -18,7 +19,8 @@ class VISWFSFlipMount1(ThorlabsFlipMount):
         _, state = self.get_configuration(position)
         update_keys(U_FM1ST=state.upper())
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         return """Usage:
     viswfs_flipmount1 [-h | --help]
     viswfs_flipmount1 status
@@ -34,20 +36,19 @@ Stage commands:
 
 # setp 4. action
 def main():
-    viswfs_flip = VISWFSFlipMount1.connect(os.getenv("WHICHCOMP", "") == "AORTS")
-    __doc__ = viswfs_flip.help_message()
+    local = os.getenv("WHICHCOMP", "") == "AORTS"
+    __doc__ = get_help(VISWFSFlipMount1, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif args["status"]:
+    viswfs_flip = VISWFSFlipMount1.connect(local=local)
+    if args["status"]:
         posn, status = viswfs_flip.get_status()
         print(status)
     elif args["<pos>"]:
         viswfs_flip.move_configuration_name(args["<pos>"])
         time.sleep(0.1)
-    viswfs_flip.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -4,9 +4,10 @@ import time
 
 from docopt import docopt
 from scxconf.pyrokeys import VISWFS
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ThorlabsElliptec
+from device_control.keywords import update_keys
 
 
 class VISWFSHWP(ThorlabsElliptec):
@@ -17,10 +18,11 @@ class VISWFSHWP(ThorlabsElliptec):
         _, state = self.get_configuration(position)
         update_keys(U_HWPST=state.upper())
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.FORMAT_STR.format(c['idx'], c['name'], c['value'], self.unit)}"
-            for c in self.configurations
+            f"    {cls.FORMAT_STR.format(c['idx'], c['name'], c['value'], 'deg')}"
+            for c in configurations
         )
         return f"""Usage:
     viswfs_hwp [-h | --help]
@@ -45,14 +47,14 @@ Configurations:
 
 # setp 4. action
 def main():
-    viswfs_hwp = VISWFSHWP.connect(os.getenv("WHICHCOMP", "") == "AORTS")
-    __doc__ = viswfs_hwp.help_message()
+    local = os.getenv("WHICHCOMP", "") == "AORTS"
+    __doc__ = get_help(VISWFSHWP, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
-    elif args["status"]:
+    viswfs_hwp = VISWFSHWP.connect(local=local)
+    if args["status"]:
         posn, status = viswfs_hwp.get_status()
         print(status)
     elif args["position"]:
@@ -69,7 +71,6 @@ def main():
     elif args["<configuration>"]:
         viswfs_hwp.move_configuration(args["<configuration>"])
         time.sleep(0.1)
-    viswfs_hwp.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VISWFS
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ZaberDevice
+from device_control.keywords import update_keys
 
 
 class VISWFSPickoffBS(ZaberDevice):
@@ -17,10 +18,10 @@ class VISWFSPickoffBS(ZaberDevice):
         _, name = self.get_configuration(position=position)
         update_keys(U_PICKOFF=name, U_PICKOFFCF=position)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     viswfs_pickoffBS [-h | --help]
@@ -45,12 +46,13 @@ Configurations:
 
 # setp 4. action
 def main():
-    viswfs_pickoff = VISWFSPickoffBS.connect(os.getenv("WHICHCOMP", "") == "AORTS")
-    __doc__ = viswfs_pickoff.help_message()
+    local = os.getenv("WHICHCOMP", "") == "AORTS"
+    __doc__ = get_help(VISWFSPickoffBS, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
+        return
+    viswfs_pickoff = VISWFSPickoffBS.connect(local=local)
     if args["status"]:
         posn, status = viswfs_pickoff.get_status()
         print(status)
@@ -71,7 +73,6 @@ def main():
         viswfs_pickoff.reset()
     elif args["<configuration>"]:
         viswfs_pickoff.move_configuration(args["<configuration>"])
-    viswfs_pickoff.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VISWFS
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import CONEXDevice
+from device_control.keywords import update_keys
 
 
 class VISWFSRotStage1(CONEXDevice):
@@ -26,19 +27,16 @@ class VISWFSRotStage1(CONEXDevice):
     CONF = "viswfs/conf_viswfs_rs1.toml"
     PYRO_KEY = VISWFS.RS1
     format_str = "{0}: {1:15s} {{{2:5.01f} deg}}"
+    PERIOD = 360
 
     def _update_keys(self, theta):
         _, name = self.get_configuration(position=theta)
         update_keys(U_RS1=name, U_RS1TH=theta)
 
-    def _move_absolute(self, value: float):
-        # make sure to mod360 the input value
-        return super()._move_absolute(value % 360)
-
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     viswfs_rs1 [-h | --help]
@@ -62,13 +60,13 @@ Configurations:
 
 
 def main():
-    rotation_stage = VISWFSRotStage1.connect(local=os.getenv("WHICHCOMP", "") == "AORTS")
-    __doc__ = rotation_stage.help_message()
+    local = os.getenv("WHICHCOMP", "") == "AORTS"
+    __doc__ = get_help(VISWFSRotStage1, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
+    rotation_stage = VISWFSRotStage1.connect(local=local)
     if args["status"]:
         posn, status = rotation_stage.get_status()
         print(status)
@@ -89,7 +87,6 @@ def main():
         rotation_stage.reset()
     elif args["<configuration>"]:
         rotation_stage.move_configuration(args["<configuration>"])
-    rotation_stage.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VISWFS
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import CONEXDevice
+from device_control.keywords import update_keys
 
 
 class VISWFSRotStage2(CONEXDevice):
@@ -21,19 +22,16 @@ class VISWFSRotStage2(CONEXDevice):
     CONF = "viswfs/conf_viswfs_rs2.toml"
     PYRO_KEY = VISWFS.RS2
     format_str = "{0}: {1:15s} {{{2:5.01f} deg}}"
+    PERIOD = 360
 
     def _update_keys(self, theta):
         _, name = self.get_configuration(position=theta)
         update_keys(U_RS2=name, U_RS2TH=theta)
 
-    def _move_absolute(self, value: float):
-        # make sure to mod360 the input value
-        return super()._move_absolute(value % 360)
-
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     viswfs_rs2 [-h | --help]
@@ -57,13 +55,13 @@ Configurations:
 
 
 def main():
-    rotation_stage = VISWFSRotStage2.connect(local=os.getenv("WHICHCOMP", "") == "AORTS")
-    __doc__ = rotation_stage.help_message()
+    local = os.getenv("WHICHCOMP", "") == "AORTS"
+    __doc__ = get_help(VISWFSRotStage2, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
         return
+    rotation_stage = VISWFSRotStage2.connect(local=local)
     if args["status"]:
         posn, status = rotation_stage.get_status()
         print(status)
@@ -84,7 +82,6 @@ def main():
         rotation_stage.reset()
     elif args["<configuration>"]:
         rotation_stage.move_configuration(args["<configuration>"])
-    rotation_stage.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,10 @@ import sys
 
 from docopt import docopt
 from scxconf.pyrokeys import VISWFS
-from swmain.redis import update_keys
 
+from device_control.cli import get_help
 from device_control.drivers import ZaberDevice
+from device_control.keywords import update_keys
 
 
 class VISWFSTrombone2(ZaberDevice):
@@ -17,10 +18,10 @@ class VISWFSTrombone2(ZaberDevice):
         _, name = self.get_configuration(position=position)
         update_keys(U_TB2=name, U_TB2CF=position)
 
-    def help_message(self):
+    @classmethod
+    def usage(cls, configurations):
         configurations = "\n".join(
-            f"    {self.format_str.format(c['idx'], c['name'], c['value'])}"
-            for c in self.configurations
+            f"    {cls.format_str.format(c['idx'], c['name'], c['value'])}" for c in configurations
         )
         return f"""Usage:
     viswfs_trombone2 [-h | --help]
@@ -45,12 +46,13 @@ Configurations:
 
 # setp 4. action
 def main():
-    viswfs_trombone2 = VISWFSTrombone2.connect(os.getenv("WHICHCOMP", "") == "AORTS")
-    __doc__ = viswfs_trombone2.help_message()
+    local = os.getenv("WHICHCOMP", "") == "AORTS"
+    __doc__ = get_help(VISWFSTrombone2, local=local)
     args = docopt(__doc__, options_first=True)
-    posn = None
     if len(sys.argv) == 1:
         print(__doc__)
+        return
+    viswfs_trombone2 = VISWFSTrombone2.connect(local=local)
     if args["status"]:
         posn, status = viswfs_trombone2.get_status()
         print(status)
@@ -78,7 +80,6 @@ def main():
         viswfs_trombone2.reset()
     elif args["<configuration>"]:
         viswfs_trombone2.move_configuration(args["<configuration>"])
-    viswfs_trombone2.update_keys(posn)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+import subprocess
+import time
+
+from device_control.base import MotionDevice
+from device_control.multi_device import MultiDevice
+
+
+class FakeStage(MotionDevice):
+    """
+    Stage moving at `speed` units per second after a fixed `overhead`, recording its absolute moves
+    in `moves`. `kinematics` is the `(speed, acceleration)` reported by the controller.
+    """
+
+    def __init__(self, speed=100.0, overhead=0.01, kinematics=(None, None), **kwargs):
+        super().__init__(unit="mm", **kwargs)
+        self.speed = speed
+        self.overhead = overhead
+        self.kinematics = kinematics
+        self.position = 0.0
+        self.moves = []
+
+    def _query_kinematics(self):
+        return self.kinematics
+
+    def _get_position(self):
+        return self.position
+
+    def _move_absolute(self, value):
+        time.sleep(self.overhead + abs(value - self.position) / self.speed)
+        self.moves.append(value)
+        self.position = value
+        return value
+
+    def _move_relative(self, value):
+        return self._move_absolute(self.position + value)
+
+    def stop(self):
+        pass
+
+
+class FakeMulti(MultiDevice):
+    format_str = "{0}: {1} {{{2}, {3}}}"
+
+
+class FakeChannel:
+    """SSH channel running its exec command in a local subprocess"""
+
+    def __init__(self):
+        self.process = None
+
+    def set_combine_stderr(self, combine):
+        pass
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+
+    def makefile_stdin(self, mode):
+        return self.process.stdin
+
+    def makefile(self, mode):
+        return self.process.stdout
+
+    @property
+    def closed(self):
+        return self.process.returncode is not None
+
+    def exit_status_ready(self):
+        return self.process.poll() is not None
+
+    def close(self):
+        self.process.kill()
+        self.process.wait()
+
+
+class FakeSSHClient:
+    """SSH client whose sessions are local shells; `channels` records every session opened"""
+
+    def __init__(self):
+        self.channels = []
+
+    def get_transport(self):
+        return self
+
+    def open_session(self):
+        channel = FakeChannel()
+        self.channels.append(channel)
+        return channel
+
+    def close(self):
+        for channel in self.channels:
+            if not channel.closed:
+                channel.close()
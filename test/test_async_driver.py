@@ -0,0 +1,310 @@
+import asyncio
+import os
+import pty
+import threading
+import time
+import tty
+
+import pytest
+
+from device_control.drivers.conex import CONEXDevice, Ready
+from device_control.interfaces import MotionDriver, SerialDriver
+from device_control.ports import AsyncSerialTransport, Serial
+
+
+class FakePort:
+    """The slave end of a pty, standing in for an open pyserial port"""
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.port = os.ttyname(fd)
+        self.is_open = True
+
+    def fileno(self):
+        return self.fd
+
+
+@pytest.fixture
+def pty_pair():
+    controller, device = pty.openpty()
+    # raw mode, so lines pass through unchanged
+    tty.setraw(device)
+    os.set_blocking(device, False)
+    yield controller, device
+    os.close(controller)
+    os.close(device)
+
+
+def test_transport_transact(pty_pair):
+    controller, device = pty_pair
+    transport = AsyncSerialTransport(FakePort(device))
+
+    async def reply():
+        loop = asyncio.get_running_loop()
+        request = await loop.run_in_executor(None, os.read, controller, 64)
+        assert request == b"1TP\r\n"
+        os.write(controller, b"1TP12.5\r\n1TS000033")
+        await asyncio.sleep(0.05)
+        os.write(controller, b"\r\n")
+
+    async def run():
+        return await asyncio.gather(transport.transact(b"1TP\r\n", n_replies=2, timeout=1), reply())
+
+    replies, _ = asyncio.run(run())
+    assert replies == [b"1TP12.5\r\n", b"1TS000033\r\n"]
+
+
+def test_transport_read_timeout(pty_pair):
+    _, device = pty_pair
+    transport = AsyncSerialTransport(FakePort(device))
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(transport.read_until(b"\r\n", timeout=0.05))
+
+
+class EchoDriver(SerialDriver):
+    """Serial device replying `<command><value>` to each line"""
+
+    def _format_command(self, command):
+        return f"{command}\r\n".encode()
+
+    def _parse_reply(self, command, reply):
+        return reply.strip().decode().removeprefix(command)
+
+    def send(self, command):
+        pytest.fail("blocking send")
+
+    def ask(self, command):
+        pytest.fail("blocking ask")
+
+
+def test_serial_driver_aask(pty_pair, monkeypatch):
+    monkeypatch.setattr(asyncio, "to_thread", lambda *args: pytest.fail("ran in a worker thread"))
+    controller, device = pty_pair
+    driver = EchoDriver(name="echo", address=os.ttyname(device), serial_kwargs={"timeout": 1})
+
+    async def reply():
+        loop = asyncio.get_running_loop()
+        request = await loop.run_in_executor(None, os.read, controller, 64)
+        assert request == b"TP\r\n"
+        os.write(controller, b"TP12.5\r\n")
+
+    async def run():
+        await driver.asend("OR")
+        assert os.read(controller, 64) == b"OR\r\n"
+        value, _ = await asyncio.gather(driver.aask("TP"), reply())
+        return value
+
+    try:
+        assert asyncio.run(run()) == "12.5"
+    finally:
+        driver.serial.close()
+
+
+class FakeStage(MotionDriver):
+    """Stage which only reports motion `latency` seconds after a move, then moves for `duration`"""
+
+    def __init__(self, latency=0.1, duration=0.2):
+        self.name = "fake"
+        self.unit = "mm"
+        self.offset = 0
+        self.latency = latency
+        self.duration = duration
+        self.position = 0.0
+        self.keys = []
+        self._started = None
+
+    def update_keys(self, pos=None):
+        self.keys.append(pos)
+
+    @classmethod
+    def from_dict(__cls__, config):
+        return __cls__(**config)
+
+    def to_dict(self):
+        return {"latency": self.latency, "duration": self.duration}
+
+    async def _ais_moving(self):
+        elapsed = time.monotonic() - self._started
+        return self.latency <= elapsed < self.latency + self.duration
+
+    async def _amove_absolute(self, value):
+        self._started = time.monotonic()
+        await self.wait_until_settled(poll_interval=0.01)
+        self.position = value
+        return value
+
+    def _get_position(self):
+        return self.position
+
+    def _get_target_position(self):
+        return self.position
+
+    def _home(self):
+        return self._move_absolute(0)
+
+    def _move_absolute(self, value):
+        self.position = value
+        return value
+
+    def _move_relative(self, value):
+        return self._move_absolute(self.position + value)
+
+    def _stop(self):
+        pass
+
+
+def test_wait_until_settled_waits_for_motion():
+    stage = FakeStage(latency=0.1, duration=0.2)
+    start = time.monotonic()
+    assert asyncio.run(stage.amove_absolute(5)) == 5
+    # returning before the controller reported MOVING would take ~0 s
+    assert time.monotonic() - start >= 0.3
+    assert stage.keys == [5]
+
+
+def test_wait_until_settled_never_moving():
+    stage = FakeStage(latency=10, duration=0)
+    start = time.monotonic()
+    asyncio.run(stage.amove_absolute(1))
+    assert 0.5 <= time.monotonic() - start < 1
+
+
+def test_wait_until_settled_timeout():
+    stage = FakeStage(latency=0, duration=10)
+    stage._started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(stage.wait_until_settled(poll_interval=0.01, timeout=0.1))
+
+
+def test_concurrent_moves():
+    stages = [FakeStage(latency=0.05, duration=0.2) for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(*(s.amove_absolute(i) for i, s in enumerate(stages)))
+
+    start = time.monotonic()
+    assert asyncio.run(run()) == [0, 1, 2]
+    assert time.monotonic() - start < 0.5
+
+
+class FakeCONEXPort:
+    """CONEX-AGP controller simulated behind `Serial.atransaction`, moving for `duration` seconds"""
+
+    timeout = 1
+
+    def __init__(self, duration=0.1):
+        self.duration = duration
+        self.position = 0.0
+        self.sent = []
+        self._moved = None
+
+    def _state(self):
+        if self._moved is not None and time.monotonic() - self._moved < self.duration:
+            return "28"
+        return "33"
+
+    async def atransaction(self, payload: bytes, n_replies: int) -> list[bytes]:
+        replies = []
+        for command in payload.decode().split("\r\n")[:-1]:
+            self.sent.append(command)
+            if command.startswith("1PA"):
+                self.position = float(command[3:])
+                self._moved = time.monotonic()
+            elif command == "1MM?":
+                replies.append(f"1MM{self._state()}")
+            elif command == "1TP":
+                replies.append(f"1TP{self.position}")
+            elif command == "1TE":
+                replies.append("1TE@")
+        assert len(replies) == n_replies
+        return [f"{reply}\r\n".encode() for reply in replies]
+
+
+def conex_device(duration=0.1):
+    device = CONEXDevice(name="conex", unit="mm")
+    device.serial = FakeCONEXPort(duration)
+    return device
+
+
+@pytest.fixture
+def no_threads(monkeypatch):
+    def to_thread(func, *args, **kwargs):
+        pytest.fail(f"{func.__name__} ran in a worker thread")
+
+    monkeypatch.setattr(asyncio, "to_thread", to_thread)
+
+
+def test_conex_aask(no_threads):
+    device = conex_device()
+    device.serial.position = 3.25
+    assert asyncio.run(device.aask_command("TP")) == "3.25"
+    assert asyncio.run(device.aget_state()).__class__ is Ready
+    assert asyncio.run(device.aget_position()) == 3.25
+
+
+def test_conex_amove_absolute(no_threads):
+    device = conex_device(duration=0.1)
+    start = time.monotonic()
+    assert asyncio.run(device.amove_absolute(12.5)) == 12.5
+    assert time.monotonic() - start >= 0.1
+    assert "1PA12.5" in device.serial.sent
+    # polled until the controller went back to READY, then no extra position query
+    assert device.serial.sent[-3:] == ["1MM?", "1TP", "1TE"]
+    # already there
+    assert asyncio.run(device.amove_absolute(12.5)) == 12.5
+
+
+def test_conex_concurrent_moves(no_threads):
+    devices = [conex_device(duration=0.2) for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(*(d.amove_absolute(i + 1) for i, d in enumerate(devices)))
+
+    start = time.monotonic()
+    assert asyncio.run(run()) == [1, 2, 3]
+    assert time.monotonic() - start < 0.5
+
+
+def test_serial_atransaction(pty_pair):
+    controller, device = pty_pair
+    port = Serial(port=os.ttyname(device), timeout=1)
+    ticks = []
+
+    def hold():
+        # a synchronous transaction from another thread holds the port for a while
+        with port:
+            time.sleep(0.2)
+
+    async def ticker():
+        for _ in range(10):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def reply():
+        loop = asyncio.get_running_loop()
+        request = await loop.run_in_executor(None, os.read, controller, 64)
+        assert request == b"1TP\r\n"
+        os.write(controller, b"1TP12.5\r\n")
+
+    async def run():
+        holder = threading.Thread(target=hold)
+        holder.start()
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        replies, _, _ = await asyncio.gather(port.atransaction(b"1TP\r\n", 1), reply(), ticker())
+        holder.join()
+        return replies, time.monotonic() - start
+
+    try:
+        replies, elapsed = asyncio.run(run())
+    finally:
+        port.close()
+    assert replies == [b"1TP12.5\r\n"]
+    # waited for the other thread, while the event loop kept running
+    assert elapsed >= 0.1
+    assert len(ticks) == 10
+
+
+def test_ais_moving_is_required():
+    # a default could only guess, and a wrong guess makes `wait_until_settled` return mid-move
+    assert "_ais_moving" in MotionDriver.__abstractmethods__
@@ -0,0 +1,90 @@
+import sys
+import types
+
+import pytest
+
+from device_control.vampires.cameras import CameraKeywordPusher
+
+
+class FakeCamera:
+    def __init__(self):
+        self.keywords = []
+        self.health_checks = 0
+        self.broken = False
+
+    def get_tint(self):
+        self.health_checks += 1
+        return 0.001
+
+    def set_keyword(self, key, value):
+        if self.broken:
+            msg = "camera went away"
+            raise ConnectionError(msg)
+        self.keywords.append((key, value))
+
+
+@pytest.fixture
+def cameras(monkeypatch):
+    cameras = {}
+
+    def connect(name):
+        if name not in cameras:
+            msg = f"{name} is not registered"
+            raise ConnectionError(msg)
+        cameras[name].connections = getattr(cameras[name], "connections", 0) + 1
+        return cameras[name]
+
+    pyroclient = types.SimpleNamespace(connect=connect)
+    monkeypatch.setitem(sys.modules, "swmain.network.pyroclient", pyroclient)
+    return cameras
+
+
+def test_pushes_are_coalesced(cameras):
+    cameras["VCAM1"] = FakeCamera()
+    pusher = CameraKeywordPusher(cam_keys=("VCAM1",))
+    # the worker thread waits while we push, then sends everything at once
+    with pusher._push_lock:
+        pusher.push({"U_QWP1": 10.0, "U_FILTER": "Open"})
+        pusher.push({"U_QWP1": 12.0})
+    pusher.flush()
+    assert cameras["VCAM1"].keywords == [("U_QWP1", 12.0), ("U_FILTER", "Open")]
+
+
+def test_proxy_is_cached(cameras):
+    cameras["VCAM1"] = camera = FakeCamera()
+    pusher = CameraKeywordPusher(cam_keys=("VCAM1",))
+    for value in range(3):
+        pusher.push({"U_QWP1": value})
+        pusher.flush()
+    assert camera.keywords == [("U_QWP1", 0), ("U_QWP1", 1), ("U_QWP1", 2)]
+    # connected and health-checked once within `health_interval`
+    assert camera.connections == 1
+    assert camera.health_checks == 1
+
+
+def test_failed_camera_is_reconnected(cameras):
+    cameras["VCAM1"] = camera = FakeCamera()
+    pusher = CameraKeywordPusher(cam_keys=("VCAM1",))
+    camera.broken = True
+    pusher.push({"U_QWP1": 1.0})
+    pusher.flush()
+    camera.broken = False
+    pusher.push({"U_QWP1": 2.0})
+    pusher.flush()
+    assert camera.keywords == [("U_QWP1", 2.0)]
+    assert camera.connections == 2
+
+
+def test_unreachable_camera_is_retried_later(cameras):
+    pusher = CameraKeywordPusher(cam_keys=("VCAM2",), retry_interval=60)
+    pusher.push({"U_QWP1": 1.0})
+    pusher.flush()
+    # came up, but the last attempt is too recent
+    cameras["VCAM2"] = camera = FakeCamera()
+    pusher.push({"U_QWP1": 2.0})
+    pusher.flush()
+    assert camera.keywords == []
+    pusher.retry_interval = 0
+    pusher.push({"U_QWP1": 3.0})
+    pusher.flush()
+    assert camera.keywords == [("U_QWP1", 3.0)]
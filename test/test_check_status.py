@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+pytest.importorskip("scxconf")
+
+from device_control.scripts import check_status  # noqa: E402
+
+
+def status(pyro_key, needs_homing=False, error=None):
+    return {"pyro_key": pyro_key, "ok": error is None, "error": error, "needs_homing": needs_homing}
+
+
+class FakeDaemon:
+    def __init__(self, statuses, delay=0):
+        self.statuses = statuses
+        self.delay = delay
+        self.calls = 0
+
+    def _pyroBind(self):
+        pass
+
+    def get_status_all(self, homing=False):
+        assert homing
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.statuses
+
+
+@pytest.fixture
+def daemons(monkeypatch):
+    daemons = {}
+
+    def connect(key):
+        if key not in daemons:
+            msg = f"unknown name {key}"
+            raise ConnectionError(msg)
+        return daemons[key]
+
+    monkeypatch.setattr(check_status, "connect", connect)
+    return daemons
+
+
+def test_one_call_per_daemon(daemons):
+    daemons["BENCH"] = FakeDaemon(
+        {
+            "bs": status("BS", needs_homing=True),
+            "stop": status("STOP", needs_homing={"x": False, "y": True}),
+        }
+    )
+    daemons["TABLE"] = FakeDaemon({"pol": status("POL", error="TimeoutError: no reply")})
+    # QWP is served by the offline daemon
+    devices = [
+        ("BS", None),
+        ("STOP", "x"),
+        ("STOP", "y"),
+        ("STOP", None),
+        ("POL", None),
+        ("QWP", None),
+    ]
+    rows = check_status.run_checks(devices, daemons=["BENCH", "TABLE", "OFFLINE"])
+    assert rows == [
+        ("BS", "needs homed"),
+        ("STOP:x", "ok"),
+        ("STOP:y", "needs homed"),
+        ("STOP", "needs homed"),
+        ("POL", "error: TimeoutError"),
+        ("QWP", "not connected"),
+    ]
+    assert daemons["BENCH"].calls == 1
+
+
+def test_daemons_are_checked_concurrently(daemons):
+    daemons["BENCH"] = FakeDaemon({"bs": status("BS")}, delay=0.2)
+    daemons["TABLE"] = FakeDaemon({"pol": status("POL")}, delay=0.2)
+    start = time.perf_counter()
+    rows = check_status.run_checks([("BS", None), ("POL", None)], daemons=["BENCH", "TABLE"])
+    assert time.perf_counter() - start < 0.35
+    assert rows == [("BS", "ok"), ("POL", "ok")]
+
+
+def test_hung_daemon_times_out(daemons):
+    daemons["BENCH"] = FakeDaemon({"bs": status("BS")}, delay=1)
+    daemons["TABLE"] = FakeDaemon({"pol": status("POL")})
+    devices = [("BS", None), ("POL", None)]
+    rows = check_status.run_checks(devices, daemons=["BENCH", "TABLE"], timeout=0.05)
+    assert rows == [("BS", "timed out"), ("POL", "ok")]
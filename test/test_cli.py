@@ -0,0 +1,116 @@
+import importlib
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("scxconf")
+
+from docopt import printable_usage  # noqa: E402
+
+from device_control import cli  # noqa: E402
+from device_control.base import ConfigurableDevice  # noqa: E402
+
+CONF_DIR = Path(__file__).parents[1] / "conf"
+
+# the console scripts whose usage text is built by `cli.get_help`
+CLIS = [
+    ("device_control.first.firstpl_injection", "FIRSTPLInjection"),
+    ("device_control.first.firstpl_wollaston", "FIRSTPLWollaston"),
+    ("device_control.scexao.firstpl_pickoff", "FIRSTPLPickoff"),
+    ("device_control.scexao.polarizer", "SCEXAOPolarizer"),
+    ("device_control.scexao.vis_block", "VisBlock"),
+    ("device_control.scexao.vis_qwp", "VisQWP"),
+    ("device_control.vampires.vampires_beamsplitter", "VAMPIRESBeamsplitter"),
+    ("device_control.vampires.vampires_diffwheel", "VAMPIRESDiffWheel"),
+    ("device_control.vampires.vampires_fieldstop", "VAMPIRESFieldstop"),
+    ("device_control.vampires.vampires_filter", "VAMPIRESFilter"),
+    ("device_control.vampires.vampires_flc", "VAMPIRESFLCStage"),
+    ("device_control.vampires.vampires_focus", "VAMPIRESFocus"),
+    ("device_control.vampires.vampires_mask", "VAMPIRESMaskWheel"),
+    ("device_control.vampires.vampires_mbi", "VAMPIRESMBIWheel"),
+    ("device_control.vampires.vampires_pupil", "VAMPIRESPupilLens"),
+    ("device_control.vampires.vampires_tc", "VAMPIRESTC"),
+    ("device_control.viswfs.viswfs_camfocus", "VISWFSCamFocus"),
+    ("device_control.viswfs.viswfs_flipmount1", "VISWFSFlipMount1"),
+    ("device_control.viswfs.viswfs_flipmount2", "VISWFSFlipMount2"),
+    ("device_control.viswfs.viswfs_hwp", "VISWFSHWP"),
+    ("device_control.viswfs.viswfs_pickoffBS", "VISWFSPickoffBS"),
+    ("device_control.viswfs.viswfs_rs1", "VISWFSRotStage1"),
+    ("device_control.viswfs.viswfs_rs2", "VISWFSRotStage2"),
+    ("device_control.viswfs.viswfs_trombone1", "VISWFSTrombone1"),
+    ("device_control.viswfs.viswfs_trombone2", "VISWFSTrombone2"),
+]
+
+
+@pytest.fixture(autouse=True)
+def no_daemons(monkeypatch, tmp_path):
+    monkeypatch.setattr(cli, "conf_dir", CONF_DIR)
+    monkeypatch.setattr(cli, "CACHE_DIR", tmp_path)
+
+    def connect(cls, *args, **kwargs):
+        msg = f"no daemon in the tests ({cls.PYRO_KEY})"
+        raise ConnectionError(msg)
+
+    monkeypatch.setattr(ConfigurableDevice, "connect", classmethod(connect))
+
+
+@pytest.mark.parametrize(("module", "name"), CLIS)
+def test_help_local(module, name):
+    cls = getattr(importlib.import_module(module), name)
+    text = cli.get_help(cls, local=True, argv=["-h"])
+    assert printable_usage(text)
+    if "Configurations:" in text:
+        for row in cli.load_configurations(cls, local=True):
+            assert row["name"] in text
+
+
+@pytest.mark.parametrize(("module", "name"), CLIS)
+def test_help_from_cache(module, name):
+    cls = getattr(importlib.import_module(module), name)
+    configurations = cli.load_configurations(cls, local=True)
+    cli._write_cache(cls, configurations)
+    text = cli.get_help(cls, argv=["-h"])
+    assert printable_usage(text)
+    # parsing the arguments alone never needs the configurations
+    assert printable_usage(cli.get_help(cls, argv=["status"]))
+
+
+def test_expired_cache_is_not_used(monkeypatch):
+    cls = importlib.import_module("device_control.vampires.vampires_focus").VAMPIRESFocus
+    configurations = [{"idx": 0, "name": "stale", "value": 1.0}]
+    cli._write_cache(cls, configurations)
+    assert cli.load_configurations(cls) == configurations
+    monkeypatch.setattr(cli, "CACHE_TTL", -1)
+    assert cli.load_configurations(cls) == []
+
+
+class FakeDaemon:
+    """Daemon side of a device, counting the configuration fetches"""
+
+    def __init__(self, configurations, saved):
+        self.configurations = configurations
+        self.saved = saved
+        self.fetches = 0
+
+    def get_config_mtime(self):
+        return self.saved
+
+    def get_configurations(self):
+        self.fetches += 1
+        return self.configurations
+
+
+def test_saved_configuration_invalidates_cache(monkeypatch):
+    cls = importlib.import_module("device_control.vampires.vampires_focus").VAMPIRESFocus
+    daemon = FakeDaemon([{"idx": 0, "name": "A", "value": 1.0}], saved=100.0)
+    monkeypatch.setattr(cls, "connect", classmethod(lambda cls: daemon))
+    assert cli.load_configurations(cls, refresh=True) == daemon.configurations
+    # unchanged on the daemon, served from the cache
+    assert cli.load_configurations(cls, refresh=True) == daemon.configurations
+    assert daemon.fetches == 1
+    # the daemon saved a configuration, on whichever host
+    daemon.configurations = [{"idx": 0, "name": "B", "value": 2.0}]
+    daemon.saved = 200.0
+    assert cli.load_configurations(cls) == [{"idx": 0, "name": "A", "value": 1.0}]
+    assert cli.load_configurations(cls, refresh=True) == daemon.configurations
+    assert daemon.fetches == 2
@@ -74,26 +74,29 @@ class CONEXDriver(MotionDriver, SerialDriver):
             raise ValueError(msg)
         self.device_address = device_address
 
-    def send(self, command: str):
+    def _format_command(self, command: str) -> bytes:
         # pad command with CRLF ending
         cmd = f"{self.device_address}{command}\r\n"
         logger.debug(f"sending command: {cmd[:-2]}")
+        return cmd.encode()
+
+    def _parse_reply(self, command: str, reply: bytes):
+        retval = reply.strip().decode()
+        logger.debug(f"received: {retval}")
+        # strip command and \r\n from string
+        value = retval.split(command.replace("?", ""))[-1]
+        return value
+
+    def send(self, command: str):
         with self.serial as serial:
-            serial.write(cmd.encode())
+            serial.write(self._format_command(command))
             serial.read_until(b"\r\n")
 
     def ask(self, command: str):
-        # pad command with CRLF ending
-        cmd = f"{self.device_address}{command}\r\n"
-        logger.debug(f"sending command: {cmd[:-2]}")
         with self.serial as serial:
-            serial.write(cmd.encode())
+            serial.write(self._format_command(command))
             resp = serial.read_until(b"\r\n")
-        retval = resp.strip().decode()
-        logger.debug(f"received: {retval[:-2]}")
-        # strip command and \r\n from string
-        value = retval.split(command.replace("?", ""))[-1]
-        return value
+        return self._parse_reply(command, resp)
 
     def get_stage_identifier(self) -> str:
         return self.ask("ID?")
@@ -195,6 +198,9 @@ class CONEXDriver(MotionDriver, SerialDriver):
         while self.is_moving():
             self.update_keys()
 
+    async def _ais_moving(self) -> bool:
+        return isinstance(CONEX_STATES[await self.aask("MM?")], (Moving, Homing))
+
     def _get_target_position(self) -> float:
         return float(self.ask("TH?"))
 
@@ -203,3 +209,8 @@ class CONEXDriver(MotionDriver, SerialDriver):
 
     def _stop(self):
         self.send("ST")
+
+
+def test_driver_is_concrete():
+    # every abstract hook of `MotionDriver`, including `_ais_moving`, is implemented
+    assert not CONEXDriver.__abstractmethods__
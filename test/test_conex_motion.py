@@ -0,0 +1,116 @@
+import logging
+
+import pytest
+
+from device_control.drivers import conex
+from device_control.drivers.conex import CONEXDevice, CONEXStatus, Homing, Moving, Ready
+from device_control.scheduler import get_scheduler
+
+
+class Clock:
+    """Stands in for the `time` module, `sleep` advances the clock instead of waiting"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeController:
+    """Serial port of a CONEX controller answering from `replies`, recording each transaction"""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.transactions = []
+        self._pending = []
+
+    def transaction(self, func, retry=False):
+        self.transactions.append((retry, []))
+        return func(self)
+
+    def write(self, payload):
+        self.transactions[-1][1].append(payload)
+        for command in payload.decode().split("\r\n")[:-1]:
+            # queries are echoed without their "?"
+            echo = command.replace("?", "")
+            self._pending.append(f"{echo}{self.replies[command[1:]]}\r\n".encode())
+
+    def read_until(self, terminator):
+        return self._pending.pop(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(conex, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def stage():
+    stage = CONEXDevice(name="stage", unit="mm")
+    stage.published = []
+    stage.update_keys = stage.published.append
+    return stage
+
+
+def test_cadence_follows_the_remaining_distance(stage, clock):
+    # 10 mm at 10 mm/s
+    def query_status():
+        if clock.now < 1:
+            return CONEXStatus(Moving(), 10 * clock.now, None)
+        return CONEXStatus(Ready(Moving()), 10.0, None)
+
+    stage.query_status = query_status
+    assert stage._wait_for_motion(Moving, target=10) == 10.0
+    # backs off while far from the target, then tightens as it gets close
+    assert max(clock.sleeps) == stage.max_poll_interval
+    assert clock.sleeps[-1] < clock.sleeps[1]
+    assert min(clock.sleeps) >= stage.poll_interval
+    # far fewer polls than at a fixed `poll_interval`
+    assert len(clock.sleeps) < 1 / stage.poll_interval / 3
+    # keywords at most every `publish_interval`
+    assert len(stage.published) <= 1 / stage.publish_interval + 1
+    assert stage.published[0] == 0.0
+
+
+def test_cadence_backs_off_without_target(stage, clock):
+    def query_status():
+        state = Homing() if clock.now < 2 else Ready(Homing())
+        return CONEXStatus(state, 0.0, None)
+
+    stage.query_status = query_status
+    assert stage._wait_for_motion(Homing) == 0.0
+    assert clock.sleeps[:3] == pytest.approx([0.03, 0.045, 0.0675])
+    assert clock.sleeps[-1] == stage.max_poll_interval
+
+
+def test_cadence_logs_controller_errors(stage, clock, caplog):
+    replies = iter([CONEXStatus(Moving(), 1.0, "C"), CONEXStatus(Ready(Moving()), 2.0, None)])
+    stage.query_status = lambda: next(replies)
+    with caplog.at_level(logging.WARNING, logger="stage"):
+        assert stage._wait_for_motion(Moving, target=2) == 2.0
+    assert [record.getMessage() for record in caplog.records] == ["controller error C"]
+
+
+def test_status_is_one_round_trip(stage):
+    controller = FakeController({"MM?": "28", "TP": "12.5", "TE": "@"})
+    stage.serial = controller
+    stage.scheduler = get_scheduler("conex-test")
+    status = stage.query_status()
+    assert isinstance(status.state, Moving)
+    assert status.position == 12.5
+    assert status.error is None
+    # one write, resent once if the port had to be reopened
+    assert controller.transactions == [(True, [b"1MM?\r\n1TP\r\n1TE\r\n"])]
+
+    controller.replies.update({"MM?": "33", "TE": "C"})
+    status = stage.query_status()
+    assert isinstance(status.state, Ready)
+    assert status.error == "C"
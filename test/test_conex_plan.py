@@ -0,0 +1,68 @@
+import pytest
+
+from device_control.drivers.conex import CONEXDevice
+
+
+class FakeRotator(CONEXDevice):
+    """Rotation stage whose controller only answers the travel limit queries"""
+
+    PERIOD = 360
+
+    def __init__(self, lower=-1000.0, upper=1000.0, **kwargs):
+        super().__init__(name="rotator", unit="deg", **kwargs)
+        self.limits = lower, upper
+        self.asked = []
+
+    def ask_commands(self, *commands):
+        self.asked.append(commands)
+        assert commands == ("SL?", "SR?")
+        return [str(limit) for limit in self.limits]
+
+    def _get_position(self):
+        pytest.fail("read the stage although the position was known")
+
+
+def test_wraps_around():
+    stage = FakeRotator()
+    # +2 deg, not -358
+    assert stage._plan_absolute(1, 359) == 361
+    assert stage._plan_absolute(359, 1) == -1
+    # several turns away from [0, 360)
+    assert stage._plan_absolute(10, 725) == 730
+    # the limits are only queried once
+    assert stage.asked == [("SL?", "SR?")]
+
+
+def test_limits_force_the_long_way():
+    stage = FakeRotator(lower=0, upper=360)
+    # 361 is past the upper limit, so the stage goes back 358 deg
+    assert stage._plan_absolute(1, 359) == 1
+    assert stage._plan_absolute(359, 1) == 359
+
+
+def test_turns_are_clipped_to_the_limits():
+    stage = FakeRotator(lower=-10, upper=370)
+    # the closest equivalents (1090 and -1070) are outside the limits
+    assert stage._plan_absolute(10, 1000) == 370
+    assert stage._plan_absolute(10, -1000) == 10
+
+
+def test_no_equivalent_within_the_limits():
+    stage = FakeRotator(lower=100, upper=200)
+    # left for the controller to reject
+    assert stage._plan_absolute(50, 150) == 50
+
+
+def test_within_dead_band():
+    stage = FakeRotator(settle_tol=0.1)
+    assert stage._plan_absolute(0, 359.95) == 360
+    # skipped altogether, without querying the controller
+    stage.send_command = lambda command, priority=None: pytest.fail(f"sent {command}")
+    assert stage.move_absolute(0, position=359.95) == 359.95
+    assert stage.asked == [("SL?", "SR?")]
+
+
+def test_reads_unknown_position():
+    stage = FakeRotator()
+    stage._get_position = lambda: 359.0
+    assert stage._plan_absolute(1) == 361
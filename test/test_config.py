@@ -0,0 +1,35 @@
+import tomli
+
+from device_control.base import ConfigurableDevice
+from device_control.scheduler import PortScheduler
+
+
+def test_save_config_keeps_priority(tmp_path):
+    filename = tmp_path / "conf_fake.toml"
+    device = ConfigurableDevice(name="fake", configurations=[], priority=PortScheduler.HIGH)
+    device.serial_kwargs = {"port": "/dev/null"}
+    device.save_config(filename)
+    with filename.open("rb") as fh:
+        assert tomli.load(fh)["priority"] == PortScheduler.HIGH
+    loaded = ConfigurableDevice.from_config(filename, serial=None)
+    assert loaded.priority == PortScheduler.HIGH
+
+
+def test_save_config_omits_default_priority(tmp_path):
+    filename = tmp_path / "conf_fake.toml"
+    device = ConfigurableDevice(name="fake", configurations=[])
+    device.serial_kwargs = {"port": "/dev/null"}
+    device.save_config(filename)
+    with filename.open("rb") as fh:
+        assert "priority" not in tomli.load(fh)
+    loaded = ConfigurableDevice.from_config(filename, serial=None)
+    assert loaded.priority == PortScheduler.NORMAL
+
+
+def test_config_mtime_follows_saves(tmp_path):
+    filename = tmp_path / "conf_fake.toml"
+    device = ConfigurableDevice(name="fake", configurations=[], config_file=filename)
+    device.serial_kwargs = {"port": "/dev/null"}
+    assert device.get_config_mtime() is None
+    device.save_config()
+    assert device.get_config_mtime() == filename.stat().st_mtime
@@ -0,0 +1,49 @@
+from device_control.base import ConfigurationIndex
+
+BEAMSPLITTER = [
+    {"idx": 1, "name": "Open", "value": 0.0},
+    {"idx": 2, "name": "PBS", "value": 25.0},
+    {"idx": 3, "name": "open", "value": 50.0},
+]
+
+
+def test_duplicate_names_resolve_to_first():
+    index = ConfigurationIndex(BEAMSPLITTER)
+    assert index.get_by_name("Open")["idx"] == 1
+    assert index.get_by_name("OPEN")["idx"] == 1
+    assert index.get_by_idx(2)["name"] == "PBS"
+
+
+def test_duplicate_indices_resolve_to_first():
+    configurations = [*BEAMSPLITTER, {"idx": 2, "name": "NPBS", "value": 75.0}]
+    index = ConfigurationIndex(configurations)
+    assert index.get_by_idx(2)["name"] == "PBS"
+
+
+def test_match_within_tol():
+    index = ConfigurationIndex(BEAMSPLITTER)
+    assert index.match(25.05)["idx"] == 2
+    assert index.match(24.8) is None
+    assert index.match(24.8, tol=0.5)["idx"] == 2
+
+
+def test_match_wraps_periodic_axes():
+    configurations = [{"idx": 1, "name": "0 deg", "value": 0.0}]
+    index = ConfigurationIndex(configurations, periods=[360])
+    assert index.match(359.95)["idx"] == 1
+
+
+def test_full_configuration_beats_partial():
+    nan = float("nan")
+    configurations = [
+        {"idx": 0, "name": "partial", "value": [1.0, 2.0, nan]},
+        {"idx": 1, "name": "full", "value": [1.0, 2.0, 10.0]},
+    ]
+    index = ConfigurationIndex(configurations)
+    assert index.match([1, 2, 10.05])["name"] == "full"
+    assert index.nearest([1, 2, 10])[0]["name"] == "full"
+    # the partial configuration still matches wherever its defined axes do
+    assert index.match([1, 2, 30])["name"] == "partial"
+    row, distance = index.nearest([1, 2, 30])
+    assert row["name"] == "partial"
+    assert distance == 0
@@ -0,0 +1,63 @@
+import time
+
+from conftest import FakeStage
+
+from device_control.daemons.status import DaemonStatus
+from device_control.poller import StatusPoller
+
+
+class HomingStage(FakeStage):
+    PYRO_KEY = "STAGE"
+    format_str = "{0}: {1} {{{2:.2f} mm}}"
+
+    def __init__(self, delay=0, **kwargs):
+        super().__init__(configurations=[dict(idx=1, name="Open", value=0.0)], **kwargs)
+        self.delay = delay
+        self.queries = 0
+
+    def _get_position(self):
+        self.queries += 1
+        time.sleep(self.delay)
+        return super()._get_position()
+
+    def needs_homing(self):
+        return self.position is None
+
+
+class BrokenStage(HomingStage):
+    def _get_position(self):
+        msg = "no reply"
+        raise TimeoutError(msg)
+
+
+def test_status_of_every_device():
+    stage = HomingStage(name="stage")
+    endpoint = DaemonStatus({"stage": stage, "broken": BrokenStage(name="broken")})
+    statuses = endpoint.get_status_all(homing=True)
+    assert statuses["stage"]["ok"]
+    assert statuses["stage"]["position"] == 0.0
+    assert statuses["stage"]["configuration"] == "Open"
+    assert statuses["stage"]["status"] == "1: Open {0.00 mm}"
+    assert statuses["stage"]["needs_homing"] is False
+    assert statuses["broken"]["ok"] is False
+    assert statuses["broken"]["error"] == "TimeoutError: no reply"
+    assert endpoint.get_devices() == {"stage": "STAGE", "broken": "STAGE"}
+
+
+def test_fresh_snapshots_are_reused():
+    stage = HomingStage(name="stage")
+    poller = StatusPoller()
+    poller.add("stage", stage, interval=10)
+    poller.poll("stage")
+    endpoint = DaemonStatus({"stage": stage}, poller)
+    for _ in range(3):
+        assert endpoint.get_status_all()["stage"]["position"] == 0.0
+    assert stage.queries == 1
+
+
+def test_devices_are_queried_in_parallel():
+    devices = {f"stage{i}": HomingStage(name=f"stage{i}", delay=0.2) for i in range(4)}
+    start = time.perf_counter()
+    statuses = DaemonStatus(devices).get_status_all()
+    assert time.perf_counter() - start < 0.6
+    assert all(status["ok"] for status in statuses.values())
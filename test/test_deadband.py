@@ -0,0 +1,62 @@
+import time
+
+import pytest
+from conftest import FakeMulti, FakeStage
+
+from device_control.poller import StatusSnapshot
+
+
+def snapshot(device, status):
+    # a poll of the current status, within its max age
+    device._status_snapshot = StatusSnapshot(
+        time.time(), status, None, 60, device._status_generation
+    )
+
+
+def stale_snapshot(device, status):
+    # a poll which ran before the last move but is still within its max age
+    snapshot(device, status)
+    device._status_generation += 1
+
+
+def test_skips_moves_within_settle_tol():
+    stage = FakeStage(name="fake", settle_tol=0.1)
+    stage.move_absolute(5)
+    # skipped, the position the stage is at is returned
+    assert stage.move_absolute(5.05) == 5
+    assert stage.moves == [5]
+    stage.move_absolute(5.05, force=True)
+    assert stage.moves == [5, 5.05]
+
+
+def test_dead_band_uses_fresh_snapshot():
+    stage = FakeStage(name="fake")
+    stage._get_position = lambda: pytest.fail("read the stage despite a fresh snapshot")
+    snapshot(stage, (5.0, "fake: 5.0 mm"))
+    assert stage.move_absolute(5) == 5.0
+    # the position returned by the move is reused, and `force` skips the dead-band
+    assert stage.move_absolute(6) == 6
+    assert stage.move_absolute(6, force=True) == 6
+    assert stage.moves == [6, 6]
+
+
+def test_dead_band_reads_the_stage():
+    stage = FakeStage(name="fake")
+    stale_snapshot(stage, (5.0, "fake: 5.0 mm"))
+    # the snapshot claims the stage is already there
+    assert stage.move_absolute(5) == 5
+    assert stage.moves == [5]
+
+
+def test_multi_device_dead_band_reads_the_stages():
+    devices = {"x": FakeStage(name="x"), "y": FakeStage(name="y")}
+    multi = FakeMulti(
+        devices,
+        name="multi",
+        configurations=[{"idx": 0, "name": "A", "value": {"x": 1.0, "y": 0.0}}],
+    )
+    stale_snapshot(multi, ((1.0, 0.0), "multi: A {1.0, 0.0}"))
+    multi.move_configuration("A")
+    # y is already in place, x is moved even though the snapshot says otherwise
+    assert devices["x"].moves == [1.0]
+    assert devices["y"].moves == []
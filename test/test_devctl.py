@@ -0,0 +1,96 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from device_control import cli
+from device_control.scripts import devctl
+
+
+class FakeEntryPoint:
+    def __init__(self, main):
+        self.main = main
+
+    def load(self):
+        return self.main
+
+
+def echo():
+    print(" ".join(sys.argv[1:]), os.getenv("WHICHCOMP"))
+
+
+def usage():
+    sys.exit("Usage: fail <name>")
+
+
+def broken():
+    msg = "daemon went away"
+    raise ConnectionError(msg)
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    release = threading.Event()
+    commands = {
+        "echo": FakeEntryPoint(echo),
+        "fail": FakeEntryPoint(usage),
+        "broken": FakeEntryPoint(broken),
+        "wait": FakeEntryPoint(lambda: release.wait(5)),
+    }
+    monkeypatch.setattr(devctl, "COMMANDS", commands)
+    monkeypatch.setattr(cli, "_proxies", None)
+    monkeypatch.setattr(cli, "_configurations", None)
+    monkeypatch.delenv("WHICHCOMP", raising=False)
+    return release
+
+
+def test_run_command(commands):
+    argv = sys.argv
+    assert devctl.run_command(["echo", "Open"], env={"WHICHCOMP": "5"}) == (0, "Open 5\n", "")
+    # the process state is restored
+    assert sys.argv is argv
+    assert "WHICHCOMP" not in os.environ
+    assert devctl.run_command(["fail"]) == (1, "", "Usage: fail <name>\n")
+    assert devctl.run_command(["nope"])[0] == 1
+
+
+def test_failed_command_drops_proxies(commands):
+    cli.keep_warm()
+    cli._proxies["VAMPIRES_FILT"] = object()
+    code, _, stderr = devctl.run_command(["broken"])
+    assert code == 1
+    assert stderr == "broken: ConnectionError: daemon went away\n"
+    assert cli.warm_proxies() == []
+
+
+def test_agent(commands, tmp_path):
+    path = tmp_path / "devctl.sock"
+    assert devctl.send_request({"status": True}, path=path) is None
+    with devctl.DevctlAgent(path) as agent:
+        thread = threading.Thread(target=agent.serve_forever, daemon=True)
+        thread.start()
+        response = devctl.send_request({"argv": ["echo", "Open"], "env": {}}, path=path)
+        assert response == {"code": 0, "stdout": "Open None\n", "stderr": ""}
+
+        # status is answered while a command is running
+        waiting = threading.Thread(
+            target=devctl.send_request, args=({"argv": ["wait"]},), kwargs={"path": path}
+        )
+        waiting.start()
+        deadline = time.monotonic() + 5
+        while not agent.command_lock.locked() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert agent.command_lock.locked()
+        status = devctl.send_request({"status": True}, path=path)
+        assert "1 commands served" in status["stdout"]
+        commands.set()
+        waiting.join(5)
+
+        devctl.send_request({"stop": True}, path=path)
+        thread.join(5)
+        assert not thread.is_alive()
+        assert agent.n_commands == 2
+    # the socket is removed on exit
+    assert not path.exists()
@@ -0,0 +1,68 @@
+import sys
+import time
+import types
+
+import pytest
+
+from device_control.keywords import KeywordPublisher
+
+
+@pytest.fixture
+def published(monkeypatch):
+    calls = []
+    redis = types.SimpleNamespace(update_keys=lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setitem(sys.modules, "swmain", types.SimpleNamespace(redis=redis))
+    return calls
+
+
+def test_unchanged_values_are_dropped(published):
+    publisher = KeywordPublisher()
+    publisher.update(X_POS=1.0, X_NAME="A")
+    publisher.flush()
+    publisher.update(X_POS=1.0, X_NAME="B")
+    publisher.flush()
+    assert published == [{"X_POS": 1.0, "X_NAME": "A"}, {"X_NAME": "B"}]
+
+
+def test_values_are_republished_periodically(published):
+    publisher = KeywordPublisher(republish_interval=0)
+    publisher.update(X_POS=1.0)
+    publisher.flush()
+    publisher.update(X_POS=1.0)
+    publisher.flush()
+    assert published == [{"X_POS": 1.0}, {"X_POS": 1.0}]
+
+
+def test_values_are_republished_after_errors(published, monkeypatch):
+    publisher = KeywordPublisher()
+    publisher.update(X_POS=1.0)
+    publisher.flush()
+    redis = sys.modules["swmain"].redis
+    update_keys = redis.update_keys
+    monkeypatch.setattr(redis, "update_keys", lambda **kwargs: 1 / 0)
+    publisher.update(Y_POS=2.0)
+    publisher.flush()
+    monkeypatch.setattr(redis, "update_keys", update_keys)
+    publisher.update(X_POS=1.0)
+    publisher.flush()
+    # the failed update is retried, and the unchanged value sent again
+    assert published == [{"X_POS": 1.0}, {"Y_POS": 2.0, "X_POS": 1.0}]
+
+
+def test_updates_are_coalesced(published):
+    publisher = KeywordPublisher()
+    for position in range(100):
+        publisher.update(X_POS=float(position), X_NAME="A")
+    publisher.update(Y_POS=2.0)
+    publisher.flush()
+    # one redis call with the latest value of each keyword
+    assert published == [{"X_POS": 99.0, "X_NAME": "A", "Y_POS": 2.0}]
+
+
+def test_background_flush(published):
+    publisher = KeywordPublisher(interval=0.01)
+    publisher.update(X_POS=1.0)
+    deadline = time.monotonic() + 5
+    while not published and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert published == [{"X_POS": 1.0}]
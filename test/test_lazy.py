@@ -0,0 +1,41 @@
+import sys
+import threading
+
+import pytest
+
+from device_control.lazy import lazy_import
+
+
+@pytest.fixture
+def slow_module(tmp_path, monkeypatch):
+    (tmp_path / "slow_module.py").write_text("import time\ntime.sleep(0.1)\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "slow_module"
+    sys.modules.pop("slow_module", None)
+
+
+def test_first_access_from_threads(slow_module):
+    module = lazy_import(slow_module)
+    assert slow_module not in sys.modules
+    results = []
+    errors = []
+
+    def use():
+        try:
+            results.append(module.VALUE)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # no thread saw a partially executed module
+    assert errors == []
+    assert results == [42] * 8
+
+
+def test_missing_module():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("device_control_no_such_module")
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from conftest import FakeMulti, FakeStage
+
+from device_control import multi_device
+from device_control.base import trapezoid_time
+
+
+def test_trapezoid_time():
+    assert trapezoid_time(10, 5) == 2
+    # reaches full speed: cruise time plus one acceleration time
+    assert trapezoid_time(10, 5, 10) == pytest.approx(2.5)
+    # triangular profile for short moves
+    assert trapezoid_time(1, 5, 4) == pytest.approx(1)
+
+
+def test_moves_are_recorded():
+    stage = FakeStage(name="fake", configurations=[])
+    assert stage.estimate_move_time(5) is None
+    stage.move_absolute(5)
+    stage.move_relative(-2)
+    assert stage.position == 3
+    # relative moves are not recorded
+    assert [dist for dist, _ in stage._move_samples] == [5]
+    # already there, skipped and not recorded
+    assert stage.move_absolute(3) == 3
+    assert len(stage._move_samples) == 1
+    assert stage.estimate_move_time(3) == 0
+
+
+def test_failed_moves_are_not_recorded():
+    stage = FakeStage(name="fake", configurations=[])
+    # e.g. a CONEX which needs homing refuses the move and returns nothing
+    stage._move_absolute = lambda value: None
+    stage.move_absolute(5)
+    # stopped short of the target
+    stage._move_absolute = lambda value: setattr(stage, "position", value / 2)
+    stage.move_absolute(5)
+    assert stage.position == 2.5
+    assert stage._move_samples is None
+
+
+def test_estimate_from_moves():
+    stage = FakeStage(speed=100, overhead=0.01, name="fake", configurations=[])
+    for target in (2, 6, 1):
+        stage.move_absolute(target)
+    # fit of overhead + distance / speed
+    assert stage.estimate_move_time(4) == pytest.approx(0.01 + 3 / 100, abs=0.01)
+
+
+def test_estimate_from_kinematics():
+    stage = FakeStage(
+        speed=100,
+        overhead=0.01,
+        kinematics=(100, None),
+        name="fake",
+        configurations=[{"idx": 1, "name": "far", "value": 50.0}],
+    )
+    # no moves yet, so no overhead
+    assert stage.estimate_configuration_time("far") == pytest.approx(0.5)
+    stage.move_absolute(10)
+    assert stage.estimate_configuration_time(1) == pytest.approx(0.4 + 0.01, abs=0.01)
+
+
+def test_multi_device_starts_slowest_axis_first(monkeypatch):
+    # in submission order, so the start order is deterministic
+    monkeypatch.setattr(
+        multi_device,
+        "run_parallel",
+        lambda func, items, *args, **kwargs: [func(item, *args, **kwargs) for item in items],
+    )
+    devices = {
+        "x": FakeStage(speed=100, overhead=0, kinematics=(100, None), name="x"),
+        "y": FakeStage(speed=10, overhead=0, kinematics=(10, None), name="y"),
+    }
+    started = []
+    for key, device in devices.items():
+        move = device._move_absolute
+        device._move_absolute = lambda value, key=key, move=move: started.append(key) or move(value)
+    multi = FakeMulti(
+        devices,
+        name="multi",
+        configurations=[{"idx": 0, "name": "A", "value": {"x": 1.0, "y": 1.0}}],
+    )
+    assert multi.estimate_configuration_time("A") == pytest.approx(0.1)
+    multi.move_configuration("A")
+    assert started == ["y", "x"]
+    assert multi.get_configuration() == (0, "A")
+    # already in place
+    assert multi.estimate_configuration_time(0) == 0
+
+
+def test_nested_fan_outs_run_in_parallel():
+    def read(item):
+        time.sleep(0.1)
+        return item
+
+    def read_axes(device):
+        # e.g. a MultiDevice reading its axes inside `DaemonStatus.get_status_all`
+        return multi_device.run_parallel(read, [f"{device}x", f"{device}y"])
+
+    start = time.monotonic()
+    results = multi_device.run_parallel(read_axes, ["a", "b", "c"])
+    assert results == [["ax", "ay"], ["bx", "by"], ["cx", "cy"]]
+    # inline inner reads would take 0.2 s
+    assert time.monotonic() - start < 0.18
@@ -0,0 +1,38 @@
+import pytest
+from conftest import FakeStage
+
+from device_control import cli
+
+
+def test_run_move_round_trip():
+    stage = FakeStage(speed=100, overhead=0.05, name="fake", configurations=[])
+    # a local device stands in for the Pyro proxy: start the move, then wait on its ID
+    assert cli.run_move(stage, "move_absolute", 5, wait=True) is None
+    assert stage.position == 5
+    move_id = stage.move_relative_async(-1)
+    assert not stage.poll(move_id)["done"]
+    result = stage.wait(move_id, timeout=5)
+    assert result["ok"]
+    assert result["description"] == "fake move_relative -1"
+    assert stage.position == 4
+
+
+def test_run_move_reports_failures():
+    stage = FakeStage(name="fake", configurations=[])
+    with pytest.raises(RuntimeError, match="No configuration saved"):
+        cli.run_move(stage, "move_configuration", "missing", wait=True)
+    # without waiting the failure is only seen by polling
+    move_id = stage.move_configuration_async("missing")
+    result = stage.wait(move_id, timeout=5)
+    assert not result["ok"]
+    assert result["error"].startswith("ValueError")
+
+
+def test_run_move_blocks_by_default():
+    stage = FakeStage(speed=100, overhead=0.05, name="fake", configurations=[])
+    cli.run_move(stage, "move_absolute", 5)
+    # returned after the move, as before move IDs
+    assert stage.position == 5
+    # `--no-wait` returns while the stage is still moving
+    cli.run_move(stage, "move_absolute", 1, wait=False)
+    assert stage.position == 5
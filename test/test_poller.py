@@ -0,0 +1,115 @@
+import logging
+import threading
+
+from device_control.base import ConfigurableDevice
+from device_control.multi_device import run_parallel
+from device_control.poller import PollFilter, StatusPoller, fresh_snapshot, snapshot_status
+
+
+class FakeDevice(ConfigurableDevice):
+    def __init__(self):
+        super().__init__(name="fake")
+        self.position = 0
+        self.polled = threading.Event()
+        self.release = threading.Event()
+
+    def move(self, value):
+        self.position = value
+        self.invalidate_status()
+
+    @snapshot_status
+    def get_status(self):
+        position = self.position
+        self.polled.set()
+        self.release.wait(5)
+        logging.getLogger("fake").info("position %s", position)
+        return position, f"at {position}"
+
+
+def test_snapshot_served_while_fresh():
+    device = FakeDevice()
+    device.release.set()
+    poller = StatusPoller()
+    poller.add("fake", device, interval=10)
+    poller.poll("fake")
+    device.position = 1
+    # served from the snapshot, not the device
+    assert device.get_status() == (0, "at 0")
+    device.invalidate_status()
+    assert fresh_snapshot(device) is None
+    assert device.get_status() == (1, "at 1")
+
+
+def test_poll_in_flight_during_move_is_discarded():
+    device = FakeDevice()
+    poller = StatusPoller()
+    poller.add("fake", device, interval=10)
+    thread = threading.Thread(target=poller.poll, args=("fake",))
+    thread.start()
+    assert device.polled.wait(5)
+    # the move finishes while the poll still holds the old position
+    device.move(5)
+    device.release.set()
+    thread.join()
+    assert device._status_snapshot.status == (0, "at 0")
+    assert fresh_snapshot(device) is None
+    assert device.get_status() == (5, "at 5")
+
+
+def test_polls_are_not_logged(caplog):
+    device = FakeDevice()
+    device.release.set()
+    poller = StatusPoller()
+    poller.add("fake", device, interval=10)
+    handler = logging.Handler()
+    records = []
+    handler.emit = records.append
+    handler.addFilter(PollFilter())
+    logger = logging.getLogger("fake")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        poller.poll("fake")
+        device.invalidate_status()
+        device.get_status()
+    finally:
+        logger.removeHandler(handler)
+    # only the client's live query
+    assert [record.getMessage() for record in records] == ["position 0"]
+
+
+class FanOutDevice(ConfigurableDevice):
+    """Device reading its axes in parallel, each read logging like `update_keys`"""
+
+    def __init__(self):
+        super().__init__(name="fanout")
+
+    @snapshot_status
+    def get_status(self):
+        def read(axis):
+            logging.getLogger("fanout").info("axis %s", axis)
+            return axis
+
+        return run_parallel(read, ["x", "y"]), "fanout"
+
+
+def test_fan_out_polls_are_not_logged():
+    device = FanOutDevice()
+    poller = StatusPoller()
+    poller.add("fanout", device, interval=10)
+    handler = logging.Handler()
+    records = []
+    handler.emit = records.append
+    handler.addFilter(PollFilter())
+    logger = logging.getLogger("fanout")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        poller.poll("fanout")
+        assert records == []
+        device.invalidate_status()
+        device.get_status()
+    finally:
+        logger.removeHandler(handler)
+    # the worker threads of the client's live query still log
+    assert sorted(record.getMessage() for record in records) == ["axis x", "axis y"]
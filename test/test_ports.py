@@ -0,0 +1,77 @@
+import os
+import pty
+import tty
+
+import pytest
+import serial
+
+from device_control import ports
+
+
+@pytest.fixture
+def pty_port(monkeypatch):
+    controller, device = pty.openpty()
+    tty.setraw(device)
+    monkeypatch.setattr(ports, "_SERIAL_POOL", {})
+    yield controller, os.ttyname(device)
+    os.close(controller)
+    os.close(device)
+
+
+def test_pool_shares_one_open_port(pty_port):
+    controller, name = pty_port
+    port = ports.get_serial(port=name, timeout=1)
+    assert ports.get_serial(port=name, timeout=5) is port
+    # the first caller's settings are kept
+    assert port.timeout == 1
+
+    with port:
+        os.write(controller, b"1TP12.5\r\n")
+        assert port.readline() == b"1TP12.5\r\n"
+    # still open after the command
+    assert port.is_open
+    fd = port.fileno()
+    with port:
+        port.write(b"1TS\r\n")
+    assert port.fileno() == fd
+    assert os.read(controller, 64) == b"1TS\r\n"
+
+
+def test_error_closes_the_port(pty_port):
+    _, name = pty_port
+    port = ports.get_serial(port=name, timeout=1)
+    with pytest.raises(serial.SerialException), port:
+        msg = "device reports readiness to read but returned no data"
+        raise serial.SerialException(msg)
+    assert not port.is_open
+    # reopened by the next command
+    with port:
+        assert port.is_open
+
+
+def test_transaction_retries_once(pty_port, monkeypatch):
+    controller, name = pty_port
+    port = ports.get_serial(port=name, timeout=1)
+    opened = []
+    monkeypatch.setattr(port, "open", lambda: opened.append(ports.Serial.open(port)))
+    calls = []
+
+    def query(port):
+        calls.append(port.is_open)
+        if len(calls) == 1:
+            msg = "write failed: [Errno 5] Input/output error"
+            raise serial.SerialException(msg)
+        port.write(b"1TP\r\n")
+        return os.read(controller, 64)
+
+    assert port.transaction(query, retry=True) == b"1TP\r\n"
+    assert calls == [True, True]
+    # reopened between the attempts
+    assert len(opened) == 1
+
+    calls.clear()
+    with pytest.raises(serial.SerialException):
+        port.transaction(query)
+    assert calls == [True]
+    assert not port.is_open
+    assert len(opened) == 1
@@ -0,0 +1,30 @@
+from device_control import presets
+from device_control.presets import ModePresets
+
+
+class FakeDevice:
+    connections = 0
+
+    def __init__(self):
+        self.configuration = None
+
+    @classmethod
+    def connect(cls):
+        cls.connections += 1
+        return cls()
+
+    def estimate_configuration_time(self, configuration):
+        return 1.0
+
+    def move_configuration_name(self, configuration):
+        self.configuration = configuration
+
+
+def test_estimate_and_apply_connect_once(monkeypatch):
+    monkeypatch.setattr(presets, "_device_class", lambda key: FakeDevice)
+    modes = ModePresets({"imaging": {"vampires_bs": "Open", "vampires_diff": "Open"}})
+    estimates = modes.estimate("imaging")
+    assert estimates == {"vampires_bs": 1.0, "vampires_diff": 1.0}
+    results = modes.apply("imaging", estimates=estimates)
+    assert all(result["ok"] for result in results.values())
+    assert FakeDevice.connections == 2
@@ -0,0 +1,47 @@
+import threading
+
+from device_control.scheduler import PortScheduler
+
+
+def test_priority_then_arrival_order():
+    scheduler = PortScheduler("priority-test")
+    started = threading.Event()
+    release = threading.Event()
+
+    def busy():
+        started.set()
+        release.wait(5)
+
+    order = []
+    first = scheduler.submit(busy)
+    started.wait(5)
+    # queued while the port is busy
+    futures = [
+        scheduler.submit(order.append, "poll", priority=PortScheduler.LOW),
+        scheduler.submit(order.append, "query 1"),
+        scheduler.submit(order.append, "stop", priority=PortScheduler.HIGH),
+        scheduler.submit(order.append, "query 2"),
+    ]
+    release.set()
+    first.result(5)
+    for future in futures:
+        future.result(5)
+    assert order == ["stop", "query 1", "query 2", "poll"]
+
+
+def test_nested_call_runs_inline():
+    scheduler = PortScheduler("nested-test")
+
+    def outer():
+        # would deadlock if queued behind the running transaction
+        return scheduler.call(threading.current_thread)
+
+    assert scheduler.call(outer, timeout=5) is scheduler._thread
+
+
+def test_errors_reach_the_caller():
+    scheduler = PortScheduler("error-test")
+    future = scheduler.submit(int, "not a number")
+    assert isinstance(future.exception(5), ValueError)
+    # the owner thread keeps serving the port
+    assert scheduler.call(int, "42", timeout=5) == 42
@@ -0,0 +1,50 @@
+import logging
+import time
+
+import pytest
+from conftest import FakeSSHClient
+
+from device_control.base import SSHShell
+
+
+@pytest.fixture
+def client():
+    client = FakeSSHClient()
+    yield client
+    client.close()
+
+
+def test_replies_in_order(client):
+    shell = SSHShell(client)
+    commands = ["echo one", "printf 'two\\nlines'", "true", "echo four"]
+    assert shell.ask(commands) == ["one\n", "two\nlines", "", "four\n"]
+    # the same channel serves every query
+    assert shell.ask(["echo five"]) == ["five\n"]
+    assert len(client.channels) == 1
+
+
+def test_stderr_is_logged_not_returned(client, caplog):
+    shell = SSHShell(client)
+    with caplog.at_level(logging.WARNING, logger="device_control.base"):
+        replies = shell.ask(["echo out; echo oops >&2", "echo fine"])
+    assert replies == ["out\n", "fine\n"]
+    assert len(caplog.records) == 1
+    assert "oops" in caplog.records[0].getMessage()
+
+
+def test_concurrent(client):
+    shell = SSHShell(client)
+    # the slowest command comes first but its output still does
+    commands = ["sleep 0.3; echo slow", "echo fast >&2; echo fast", "sleep 0.3; echo slow too"]
+    start = time.perf_counter()
+    assert shell.ask(commands, concurrent=True) == ["slow\n", "fast\n", "slow too\n"]
+    # the two sleeps overlap
+    assert time.perf_counter() - start < 0.55
+
+
+def test_reopens_closed_shell(client):
+    shell = SSHShell(client)
+    assert shell.ask(["echo one"]) == ["one\n"]
+    shell.channel.close()
+    assert shell.ask(["echo two"]) == ["two\n"]
+    assert len(client.channels) == 2
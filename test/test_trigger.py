@@ -0,0 +1,32 @@
+import subprocess
+
+import pytest
+
+pytest.importorskip("scxconf")
+pytest.importorskip("usb")
+
+from device_control.vampires import vampires_trigger  # noqa: E402
+
+
+@pytest.fixture
+def ykushcmd(monkeypatch):
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args[0].split()[-1])
+        return subprocess.CompletedProcess(args, 0, stdout=b"Downstream port 1 is ON")
+
+    monkeypatch.setattr(vampires_trigger.subprocess, "run", run)
+    return calls
+
+
+def test_switch_status_is_cached(ykushcmd):
+    switch = vampires_trigger.VAMPIRESInlineUSBReset(serial="YKD6404")
+    assert switch.status() == "ON"
+    # polled again within the TTL
+    assert switch.status() == "ON"
+    assert ykushcmd == ["-g"]
+    switch.disable()
+    assert switch.status() == "OFF"
+    assert switch.status(refresh=True) == "ON"
+    assert ykushcmd == ["-g", "-d", "-g"]
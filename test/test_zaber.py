@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("zaber_motion")
+
+from zaber_motion.binary import Connection  # noqa: E402
+
+from device_control.drivers import zaber  # noqa: E402
+
+
+class FakeDevice:
+    def __init__(self, number, failures=0):
+        self.number = number
+        self.identified = 0
+        self.failures = failures
+
+    def identify(self):
+        self.identified += 1
+
+    def get_position(self, unit):
+        if self.failures:
+            self.failures -= 1
+            msg = "connection closed"
+            raise ConnectionError(msg)
+        return 12.5
+
+
+class FakeConnection:
+    def __init__(self):
+        self.devices = []
+        self.closed = False
+
+    def get_device(self, number):
+        device = FakeDevice(number)
+        self.devices.append(device)
+        return device
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    connections = []
+
+    def open_serial_port(port):
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(zaber, "_ZABER_PORTS", {})
+    monkeypatch.setattr(Connection, "open_serial_port", open_serial_port)
+    # stand-in for the zaber_motion connection errors
+    monkeypatch.setattr(zaber, "_reconnect_errors", lambda: (ConnectionError,))
+    return connections
+
+
+def make_device(number):
+    return zaber.ZaberDevice(
+        name=f"axis{number}",
+        unit="mm",
+        serial_kwargs={"port": "/dev/zaber-test", "device_number": number},
+    )
+
+
+def test_connection_is_shared(connections):
+    first = make_device(1)
+    second = make_device(2)
+    assert first.zaber_port is second.zaber_port
+    for _ in range(3):
+        assert first._get_position() == 12.5
+        assert second._get_position() == 12.5
+    # one connection for the chain, each device identified once
+    assert len(connections) == 1
+    assert [device.identified for device in connections[0].devices] == [1, 1]
+
+
+def test_reconnects_once_after_a_connection_error(connections):
+    device = make_device(1)
+    assert device._get_position() == 12.5
+    connections[0].devices[0].failures = 1
+    assert device._get_position() == 12.5
+    assert connections[0].closed
+    assert len(connections) == 2
+    assert connections[1].devices[0].identified == 1